@@ -2,20 +2,25 @@
 ### MIT LICENSE 2025 Marcio Gameiro
 
 import DSGRN
+import functools
+import numpy as np
 
-def active_input(partial_order, input_index):
+def active_input(partial_order, input_index, positions=None):
     """Check if input with index input_index is active in partial order"""
+    # Position of each entry in partial order
+    if positions == None:
+        positions = {p: k for k, p in enumerate(partial_order)}
     # Get number of outputs from partial order
     n_outputs = len([p for p in partial_order if p < 0])
     # Get threshold indices in partial order
-    thres_indices = [partial_order.index(-(k + 1)) for k in range(n_outputs)]
+    thres_indices = [positions[-(k + 1)] for k in range(n_outputs)]
     # Get input polynomials with lower value at input_index
     polys_lower = [p for p in partial_order if p >= 0 and (p & (1 << input_index)) == 0]
     for p_lower in polys_lower:
         # Get corresponding p upper
         p_upper = p_lower ^ (1 << input_index)
         # Get sorted indices of p_lower and p_upper in partial order
-        i1, i2 = sorted([partial_order.index(p_lower), partial_order.index(p_upper)])
+        i1, i2 = sorted([positions[p_lower], positions[p_upper]])
         # Check if there is a threshold in between them
         if any(i1 < t_index < i2 for t_index in thres_indices):
             return True
@@ -23,56 +28,118 @@ def active_input(partial_order, input_index):
 
 def active_input_indices(partial_order, n_inputs):
     """Get indices of active inputs in partial order"""
-    active_indices = [index for index in range(n_inputs) if active_input(partial_order, index)]
+    positions = {p: k for k, p in enumerate(partial_order)}
+    active_indices = [index for index in range(n_inputs) if active_input(partial_order, index, positions)]
     return active_indices
 
+@functools.lru_cache(maxsize=None)
+def number_active_inputs(hex_code, n_inputs, n_outputs):
+    """Get number of active inputs of a factor graph hex code (memoized, since
+    the parameters of a parameter graph share a few hex codes per node)"""
+    # Compute partial order corresponding to hex code
+    partial_order = DSGRN.hex2partial(hex_code, n_inputs, n_outputs)
+    return len(active_input_indices(partial_order, n_inputs))
+
+def node_arities(network, node):
+    """Get number of inputs and outputs of a node, treating the no out edge
+    case as one out edge"""
+    n_inputs = len(network.inputs(node))
+    n_outputs = len(network.outputs(node))
+    n_outputs += 1 if n_outputs == 0 else 0
+    return n_inputs, n_outputs
+
 def number_active_edges(par_index, parameter_graph):
     """Get number of active edges for parameter index"""
     parameter = parameter_graph.parameter(par_index)
     network = parameter_graph.network()
     num_active_edges = 0
     for node in range(network.size()):
-        # Get number of inputs and outputs
-        n_inputs = len(network.inputs(node))
-        n_outputs = len(network.outputs(node))
-        # Treat the no out edge case as one out edge
-        n_outputs += 1 if n_outputs == 0 else 0
         # Get factor graph hex code
         hex_code = parameter.logic()[node].hex()
-        # Compute partial order corresponding to hex code
-        partial_order = DSGRN.hex2partial(hex_code, n_inputs, n_outputs)
-        num_active_edges += len(active_input_indices(partial_order, n_inputs))
+        num_active_edges += number_active_inputs(hex_code, *node_arities(network, node))
     return num_active_edges
 
-def paths_from_node(start_node, parameter_graph, max_weight=None):
+class ActiveEdgeWeights:
+    """Number of active edges of every parameter of a parameter graph.
+
+    The number of active edges depends only on the logic parameter of each
+    node, so it is computed once per entry of each node's factor graph. The
+    logic part of a parameter index is index % fixedordersize, in mixed radix
+    with digit k the position in the factor graph of node k (node 0 first).
+    """
+
+    def __init__(self, parameter_graph):
+        network = parameter_graph.network()
+        self.node_weights = [
+            np.array([number_active_inputs(hex_code, *node_arities(network, node))
+                      for hex_code in parameter_graph.factorgraph(node)], dtype=np.int64)
+            for node in range(network.size())]
+        self.logic_sizes = [len(weights) for weights in self.node_weights]
+        self.num_logics = parameter_graph.fixedordersize()
+        self.size = parameter_graph.size()
+
+    def __call__(self, par_index):
+        """Get number of active edges for parameter index"""
+        logic_index = par_index % self.num_logics
+        num_active_edges = 0
+        for weights, logic_size in zip(self.node_weights, self.logic_sizes):
+            logic_index, digit = divmod(logic_index, logic_size)
+            num_active_edges += int(weights[digit])
+        return num_active_edges
+
+    def array(self, param_indices=None):
+        """Get an array with the number of active edges of each parameter
+        index (of all parameters if param_indices is None)"""
+        if param_indices is None:
+            param_indices = np.arange(self.size)
+        logic_index = np.asarray(param_indices, dtype=np.int64) % self.num_logics
+        num_active_edges = np.zeros(logic_index.shape, dtype=np.int64)
+        for weights, logic_size in zip(self.node_weights, self.logic_sizes):
+            logic_index, digit = np.divmod(logic_index, logic_size)
+            num_active_edges += weights[digit]
+        return num_active_edges
+
+def max_active_edges(network):
+    """Get the default max weight of a path (all inputs active)"""
+    return sum(max(len(network.inputs(k)), 1) for k in range(network.size()))
+
+def paths_from_node(start_node, parameter_graph, max_weight=None, weights=None, successors=None):
     """Get all paths with increasing node weights starting at start_node,
-       where the weight of a node is the number of active edges.
+       where the weight of a node is the number of active edges. An
+       ActiveEdgeWeights table and a dict of the allowed successors of each
+       node can be passed in to share them between start nodes.
     """
-    dim = parameter_graph.network().size()
     # Set max weight if not given
     if max_weight == None:
-        max_weight = sum(max(len(parameter_graph.network().inputs(k)), 1) for k in range(dim))
-    # Check if target node, i. e., if weight >= max weight
-    target = lambda node: number_active_edges(node, parameter_graph) >= max_weight
-    # target = lambda node: number_active_edges(node, parameter_graph) == max_weight
-    # Check if allowed next node, i. e., if weight > current weight
-    allowed = lambda node, current_weight: number_active_edges(node, parameter_graph) > current_weight
+        max_weight = max_active_edges(parameter_graph.network())
+    if weights == None:
+        weights = ActiveEdgeWeights(parameter_graph)
+    if successors == None:
+        successors = {}
     # Stack with tuples (current_node, current_path)
     paths_stack = [(start_node, [start_node])]
     paths = []
     while paths_stack:
         current_node, current_path = paths_stack.pop()
-        if target(current_node):
+        current_weight = weights(current_node)
+        # Check if target node, i. e., if weight >= max weight
+        if current_weight >= max_weight:
             paths.append(current_path)
-        current_weight = number_active_edges(current_node, parameter_graph)
-        adjacencies = parameter_graph.adjacencies(current_node)
-        for node in [node for node in adjacencies if allowed(node, current_weight)]:
+        # Allowed next nodes, i. e., with weight > current weight
+        if current_node not in successors:
+            successors[current_node] = [node for node in parameter_graph.adjacencies(current_node)
+                                        if weights(node) > current_weight]
+        for node in successors[current_node]:
             paths_stack.append((node, current_path + [node]))
     return paths
 
 def get_all_paths(starting_nodes, parameter_graph, max_weight=None):
     """Get all paths starting at a node in starting_nodes"""
+    # Weights and allowed successors are shared by all start nodes
+    weights = ActiveEdgeWeights(parameter_graph)
+    successors = {}
     paths = {}
     for start_node in starting_nodes:
-        paths[start_node] = paths_from_node(start_node, parameter_graph, max_weight=max_weight)
+        paths[start_node] = paths_from_node(start_node, parameter_graph, max_weight=max_weight,
+                                            weights=weights, successors=successors)
     return paths
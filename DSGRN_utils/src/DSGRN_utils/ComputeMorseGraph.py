@@ -6,7 +6,7 @@ import pychomp
 import DSGRN_utils
 
 def ConleyMorseGraph(parameter=None, labelling=None, num_thresholds=None, prune_grad=True,
-                     level=4, legacy=False):
+                     level=4, legacy=False, tables=False):
     # Check if input arguments are valid
     if parameter is None and (labelling is None or num_thresholds is None):
         raise ValueError('Either parameter or labelling and num_thresholds must be provided.')
@@ -14,7 +14,8 @@ def ConleyMorseGraph(parameter=None, labelling=None, num_thresholds=None, prune_
         raise ValueError('Only parameter or labelling and num_thresholds should be provided.')
     # Compute the multivalued map (state transition graph)
     stg = DSGRN_utils.CubicalBlowupGraph(parameter=parameter, labelling=labelling,
-                                        num_thresholds=num_thresholds, level=level, legacy=legacy)
+                                        num_thresholds=num_thresholds, level=level, legacy=legacy,
+                                        tables=tables)
     # Compute the flow graded complex
     (scc_dag, graded_complex) = pychomp.FlowGradedComplex(stg.complex(), stg.adjacencies())
     # Compute the connection matrix of the graded complex
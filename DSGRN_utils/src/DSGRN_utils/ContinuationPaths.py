@@ -2,45 +2,62 @@
 ### MIT LICENSE 2025 Marcio Gameiro
 
 import DSGRN_utils
+from DSGRN_utils.GradingIndex import GradingIndex
+
+def stable_morse_sets(parameter, level):
+    """Return the number of Morse nodes and the frozenset of the stable Morse
+    sets (each a frozenset of blowup top cells) of the Morse graph at parameter"""
+    morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=level)
+    # Get the cells of each Morse set in one pass
+    grading_index = GradingIndex(stg, graded_complex)
+    stable_sets = frozenset(frozenset(grading_index.cells(v).tolist())
+                            for v in morse_graph.vertices() if not morse_graph.adjacencies(v))
+    return len(morse_graph.vertices()), stable_sets
 
 def is_morse_set(par_node, morse_set, parameter_graph, level):
     """Check if morse_set is a Morse set for the Morse graph at parameter par_node"""
-    # Compute Morse graph
     parameter = parameter_graph.parameter(par_node)
-    morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=level)
-    # Get list of stable Morse nodes
-    stable_nodes = [v for v in morse_graph.vertices() if not morse_graph.adjacencies(v)]
-    for vert in stable_nodes:
-        # Get Morse node (vertex index)
-        morse_node = morse_graph.vertex_label(vert)[0]
-        # Get set of cells in the Morse set corresponding to the Morse node morse_node
-        vertices, edges = DSGRN_utils.MorseComponent(morse_graph, stg, graded_complex, morse_node=morse_node)
-        # Check if Morse sets are equal
-        if {v for v in vertices} == morse_set:
-            return True
-    return False
+    num_nodes, stable_sets = stable_morse_sets(parameter, level)
+    return frozenset(morse_set) in stable_sets
 
 def continuation_path(path, parameter_graph, level=3):
     """Check if a path is a valid continuation path, i. e., check
        if the Morse set in the initial node of the path is a Morse
        set for all nodes in the path.
     """
-    # Compute Morse graph for initial parameter in the path
-    parameter = parameter_graph.parameter(path[0])
-    morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=level)
-    # Check if Morse graph contains a single node
-    if len(morse_graph.vertices()) != 1:
-        return False
-    # Get set of cells in the Morse set corresponding to the Morse node
-    vertices, edges = DSGRN_utils.MorseComponent(morse_graph, stg, graded_complex, morse_node=0)
-    # # Check if the Morse set consists of a single cell
-    # if len(vertices) != 1:
-    #     return False
-    # Get set of cells in Morse set at initial parameter
-    initial_morse_set = {v for v in vertices}
-    for par_node in path[1:]:
-        # Check if initial_morse_set is a Morse set at par_node
-        if not is_morse_set(par_node, initial_morse_set, parameter_graph, level):
-            return False
-    return True
+    return continuation_paths([path], parameter_graph, level=level)[0]
+
+def continuation_paths(paths, parameter_graph, level=3, workers=1, chunk_size=16, morse_sets=None):
+    """Check a batch of paths with continuation_path, computing the Morse
+    graph of each distinct parameter node once, in a pool of worker
+    processes if workers > 1.
+
+    The start nodes are computed first, and the other nodes only for paths
+    whose start node has a single Morse node. The stable Morse sets are
+    kept as frozensets of cells, so checking a node is a hash lookup.
+    morse_sets (a dict from parameter node to stable_morse_sets) can be
+    passed in to share the computed nodes between batches.
+    """
+    if morse_sets == None:
+        morse_sets = {}
+    network = parameter_graph.network()
+
+    def compute(par_nodes):
+        """Add the parameter nodes in par_nodes to morse_sets"""
+        list(DSGRN_utils.parameter_values(network, par_nodes, level, stable_morse_sets, morse_sets,
+                                          workers=workers, chunk_size=chunk_size))
 
+    # Compute the start nodes, then the rest of the paths that can continue
+    compute([path[0] for path in paths])
+    candidates = [path for path in paths if morse_sets[path[0]][0] == 1]
+    compute([par_node for path in candidates for par_node in path[1:]])
+    valid = []
+    for path in paths:
+        num_nodes, stable_sets = morse_sets[path[0]]
+        if num_nodes != 1:
+            valid.append(False)
+            continue
+        # Set of cells in the single Morse set at the initial parameter
+        initial_morse_set, = stable_sets
+        valid.append(all(initial_morse_set in morse_sets[par_node][1] for par_node in path[1:]))
+    return valid
@@ -7,8 +7,33 @@
 #       4) Add 3D Morse sets plotting cpabilities
 
 import DSGRN
+import numpy as np
 import pychomp
 
+from DSGRN_utils.CubicalTables import blowup_tables, cubical_tables
+from DSGRN_utils.RookFieldTables import RookFieldTables
+
+def parameter_labelling(parameter):
+    """Wall labelling and number of thresholds of a DSGRN parameter.
+
+    The parameter is first mapped to the network without self edges blowup,
+    which is the network the blowup graph is built on.
+    """
+    # Get the parameter index in the original parameter graph
+    original_par_graph = DSGRN.ParameterGraph(parameter.network())
+    par_index = original_par_graph.index(parameter)
+    # Redefine network without self edges blowup
+    net_spec = parameter.network().specification()
+    network = DSGRN.Network(net_spec, edge_blowup='none')
+    # Get the parameter in the new parameter graph
+    parameter_graph = DSGRN.ParameterGraph(network)
+    parameter = parameter_graph.parameter(par_index)
+    # Get parameter labelling
+    labelling = parameter.labelling()
+    # Number of thresholds (same as number of out edges)
+    num_thresholds = [len(network.outputs(n)) for n in range(network.size())]
+    return labelling, num_thresholds
+
 class CubicalBlowupGraph:
     """State transition graph on the top cells of the blowup complex.
 
@@ -17,10 +42,18 @@ class CubicalBlowupGraph:
     needed to reproduce figures published before the definitions were aligned;
     the differences are documented at each use of `self.legacy` below and
     measured in `code/rookfields/reports/FINDINGS.md`.
+
+    Passing `tables=True` reads the cell coordinates, shapes, fringe flags,
+    stars and top stars of the cubical complex from dense NumPy tables built
+    once per grid size (see `CubicalTables.py`) instead of querying pychomp
+    and memoising the answers cell by cell. The wall labels, the rook field
+    and the gradient, opaque, equilibrium and active regulation data are then
+    also evaluated in batch for all cells (see `RookFieldTables.py`). The
+    resulting graph is the same.
     """
 
     def __init__(self, parameter=None, labelling=None, num_thresholds=None, self_edges=True,
-                 level=4, legacy=False, strict_intersection=False):
+                 level=4, legacy=False, strict_intersection=False, tables=False):
         # Reproduce the superseded semantics of this file when requested
         self.legacy = legacy
         # Evaluate every condition of the intersection even where one provably
@@ -33,28 +66,7 @@ class CubicalBlowupGraph:
             raise ValueError('Only parameter or labelling and num_thresholds should be provided.')
         # Extract info from parameter
         if parameter:
-            # Get the parameter index in the original parameter graph
-            original_par_graph = DSGRN.ParameterGraph(parameter.network())
-            par_index = original_par_graph.index(parameter)
-            # Redefine network without self edges blowup
-            net_spec = parameter.network().specification()
-            network = DSGRN.Network(net_spec, edge_blowup='none')
-            # Get the parameter in the new parameter graph
-            parameter_graph = DSGRN.ParameterGraph(network)
-            parameter = parameter_graph.parameter(par_index)
-            # # Set network and parameter
-            # self.parameter = parameter
-            # self.network = network
-            # # Parameter labelling
-            # self.labelling = self.parameter.labelling()
-            # # Space dimension
-            # self.dim = self.network.size()
-            # # Number of thresholds (same as number of out edges)
-            # self.num_thresholds = [len(self.network.outputs(n)) for n in range(self.dim)]
-            # Get parameter labelling
-            labelling = parameter.labelling()
-            # Number of thresholds (same as number of out edges)
-            num_thresholds = [len(network.outputs(n)) for n in range(network.size())]
+            labelling, num_thresholds = parameter_labelling(parameter)
         # Parameter labelling
         self.labelling = labelling
         # Number of thresholds
@@ -81,6 +93,10 @@ class CubicalBlowupGraph:
         self.cubical_complex = pychomp.CubicalComplex([k + 1 for k in self.num_boxes])
         # Blowup cubical complex Xb (double size plus one and add 1 for fringe cells)
         self.blowup_complex = pychomp.CubicalComplex([2 * (k + 1) for k in self.num_boxes])
+        # Translation between the cells of X and the top cells of Xb (shared by all parameters)
+        self.blowup_tables = blowup_tables(tuple(self.cubical_complex.boxes()))
+        # Dense cell tables of the cubical complex X (shared by all parameters)
+        self.tables = cubical_tables(tuple(self.cubical_complex.boxes())) if tables else None
         # Shape of top dimensional cells
         self.top_shape = 2**self.dim - 1
         # Grid size of the cubical complex X
@@ -100,6 +116,23 @@ class CubicalBlowupGraph:
         self.blowup_jump = [1]
         for k in self.blowup_grid_size:
             self.blowup_jump.append(self.blowup_jump[-1] * k)
+        # Batched rook field and memo tables of the labelling
+        self._init_cell_data()
+        # State Transition Graph (STG) on top cells (including fringe) of Xb
+        self.digraph = pychomp.DiGraph()
+        # # Add top cells of Xb (including fringe) as vertices
+        # # Not necessary (verts are automatically added with edges)
+        # for cell in self.blowup_complex(self.dim):
+        #     self.digraph.add_vertex(cell)
+        # Compute multivalued map (digraph)
+        self.compute_multivalued_map()
+
+    def _init_cell_data(self):
+        """Set up the rook field tables and the memo tables of the labelling"""
+        # Batched rook field of the labelling (requires the cell tables)
+        self.rook_tables = None
+        if self.tables is not None:
+            self.rook_tables = RookFieldTables(self.tables, self.labelling, self.num_thresholds)
         # Memo tables for the cell-indexed quantities.  Every one of these is a
         # pure function of the cell and the (fixed) labelling, and each is
         # recomputed many times while the multivalued map is assembled -- see
@@ -112,14 +145,6 @@ class CubicalBlowupGraph:
         self._equilibrium_cache = {}
         self._reg_map_cache = {}
         self._semi_opaque_cache = {}
-        # State Transition Graph (STG) on top cells (including fringe) of Xb
-        self.digraph = pychomp.DiGraph()
-        # # Add top cells of Xb (including fringe) as vertices
-        # # Not necessary (verts are automatically added with edges)
-        # for cell in self.blowup_complex(self.dim):
-        #     self.digraph.add_vertex(cell)
-        # Compute multivalued map (digraph)
-        self.compute_multivalued_map()
 
     def complex(self):
         """Return the cell complex"""
@@ -141,42 +166,75 @@ class CubicalBlowupGraph:
         """Return the digraph edges"""
         return self.digraph.edges()
 
+    def coordinates(self, cc_cell):
+        """Return the coordinates of a cubical complex cell"""
+        if self.tables is None:
+            return self.cubical_complex.coordinates(cc_cell)
+        return self.tables.coords[cc_cell].tolist()
+
+    def cell_shape(self, cc_cell):
+        """Return the shape (bitmask of essential directions) of a cubical complex cell"""
+        if self.tables is None:
+            return self.cubical_complex.cell_shape(cc_cell)
+        return int(self.tables.shape[cc_cell])
+
+    def cell_dim(self, cc_cell):
+        """Return the dimension of a cubical complex cell"""
+        if self.tables is None:
+            return self.cubical_complex.cell_dim(cc_cell)
+        return int(self.tables.cell_dim[cc_cell])
+
+    def rightfringe(self, cc_cell):
+        """Return True if a cubical complex cell is a fringe cell"""
+        if self.tables is None:
+            return self.cubical_complex.rightfringe(cc_cell)
+        return bool(self.tables.fringe[cc_cell])
+
+    def _blowup_top_cells(self):
+        """Return the top cells of the blowup complex whose pairs with their right
+        neighbors are decided by compute_multivalued_map (all of them; a parallel
+        build restricts this to one slab of cells)
+        """
+        return self.blowup_complex(self.dim)
+
+    def _cubical_cells(self):
+        """Return the cubical complex cells whose unstable cells are added (all of them)"""
+        return self.cubical_complex
+
     def blowup2cubical(self, cell):
         """Return the cubical complex cell corresponding to a blowup complex cell"""
-        # Get cell coordinates in the blowup complex
-        cell_coords = self.blowup_complex.coordinates(cell)
-        # Get cubical complex cell coordinates in the cubical complex
-        cc_cell_coords = [k // 2 for k in cell_coords]
-        # Get shape bit vector of the cubical complex cell
-        cc_cell_shape_vec = [k % 2 for k in cell_coords]
-        # Get the integer shape value corresponding to the bit vector
-        bit_str = ''.join(str(b) for b in reversed(cc_cell_shape_vec))
-        cc_cell_shape = int(bit_str, 2)
-        # Get the cubical complex cell index in the cubical complex
-        cc_cell = self.cubical_complex.cell_index(cc_cell_coords, cc_cell_shape)
-        return cc_cell
+        # A blowup cell with coordinates u corresponds to the cubical cell with
+        # coordinates u // 2 and shape bits u % 2 (see BlowupTables). The
+        # coordinates only depend on the position of cell within its shape block.
+        return int(self.blowup_tables.blowup2cubical[cell % self.blowup_tables.num_positions])
 
     def cubical2blowup(self, cc_cell):
         """Return the blowup complex cell corresponding to a cubical complex cell"""
-        # Get cubical complex cell coordinates in the cubical complex
-        cc_cell_coords = self.cubical_complex.coordinates(cc_cell)
-        # Get the shape of the cubical complex cell
-        cc_cell_shape = self.cubical_complex.cell_shape(cc_cell)
-        # Get shape bit vector of the cubical complex cell
-        cc_cell_shape_vec = [1 if cc_cell_shape & (1 << n) else 0 for n in range(self.dim)]
-        # Get the cell coordinates in the blowup complex
-        cell_coords = [2 * cc_cell_coords[n] + cc_cell_shape_vec[n] for n in range(self.dim)]
-        # Get the cell index in the blowup complex
-        cell = self.blowup_complex.cell_index(cell_coords, self.top_shape)
-        return cell
+        # The cubical cell with coordinates v and shape bits w corresponds to
+        # the blowup top cell with coordinates 2 * v + w
+        return int(self.blowup_tables.cubical2blowup[cc_cell])
+
+    def blowup2cubical_array(self, cells):
+        """Return the array of cubical complex cells corresponding to an array of blowup complex cells"""
+        cells = np.fromiter(cells, dtype=np.int64) if not isinstance(cells, np.ndarray) else cells
+        return self.blowup_tables.blowup2cubical[cells % self.blowup_tables.num_positions]
+
+    def cubical2blowup_array(self, cc_cells):
+        """Return the array of blowup complex top cells corresponding to an array of cubical complex cells"""
+        cc_cells = np.fromiter(cc_cells, dtype=np.int64) if not isinstance(cc_cells, np.ndarray) else cc_cells
+        return self.blowup_tables.cubical2blowup[cc_cells]
 
     def essential_directions(self, cc_cell):
         """Return the essential (tangent) directions of a cubical cell"""
+        if self.tables is not None:
+            return self.tables.essential[self.tables.shape[cc_cell]]
         shape = self.cubical_complex.cell_shape(cc_cell)
         return [n for n in range(self.dim) if (shape & (1 << n)) != 0]
 
     def inessential_directions(self, cc_cell):
         """Return the inessential (normal) directions of a cubical cell"""
+        if self.tables is not None:
+            return self.tables.inessential[self.tables.shape[cc_cell]]
         shape = self.cubical_complex.cell_shape(cc_cell)
         return [n for n in range(self.dim) if (shape & (1 << n)) == 0]
 
@@ -186,8 +244,8 @@ class CubicalBlowupGraph:
         # coface_essential = self.essential_directions(cc_coface)
         # # Directions essential for cc_coface and inessential for cc_face
         # ext_directions = set(coface_essential).intersection(face_inessential)
-        face_shape = self.cubical_complex.cell_shape(cc_face)
-        coface_shape = self.cubical_complex.cell_shape(cc_coface)
+        face_shape = self.cell_shape(cc_face)
+        coface_shape = self.cell_shape(cc_coface)
         # XOR shape (1 where cc_coface is 1 and cc_face is 0)
         xor_shape = coface_shape ^ face_shape
         # Directions essential for cc_coface and inessential for cc_face
@@ -196,6 +254,8 @@ class CubicalBlowupGraph:
 
     def star(self, cc_cell):
         """Return the list of cells in the star of cc_cell"""
+        if self.tables is not None:
+            return self.tables.star(cc_cell)
         cached = self._star_cache.get(cc_cell)
         if cached is None:
             # Get the star of cc_cell (discard fringe cells)
@@ -206,6 +266,8 @@ class CubicalBlowupGraph:
 
     def top_star(self, cc_cell):
         """Return the list of cells in the top star of cc_cell"""
+        if self.tables is not None:
+            return self.tables.top_star(cc_cell)
         cached = self._top_star_cache.get(cc_cell)
         if cached is None:
             # Get the top star of cc_cell (discard fringe cells)
@@ -230,8 +292,10 @@ class CubicalBlowupGraph:
         containing the wall, where -1 means left n-wall and 1 means
         right n-wall.
         """
+        if self.rook_tables is not None:
+            return self.rook_tables.wall_label(cc_top_cell, n, side)
         # Get the coordinates of the top cell in the cubical complex
-        cc_cell_coords = self.cubical_complex.coordinates(cc_top_cell)
+        cc_cell_coords = self.coordinates(cc_top_cell)
         # Consider all walls of fringe layer cells absorbing
         if any(cc_cell_coords[k] == self.limits[k] for k in range(self.dim)):
             return side
@@ -248,6 +312,8 @@ class CubicalBlowupGraph:
 
     def rook_field_component(self, cc_cell, cc_top_cell, n):
         """Return the n-th component of the rook field of cc_cell with respect to cc_top_cell"""
+        if self.rook_tables is not None:
+            return self.rook_tables.rook_field_component(cc_cell, cc_top_cell, n)
         key = (cc_cell, cc_top_cell, n)
         cached = self._rook_component_cache.get(key)
         if cached is not None:
@@ -259,8 +325,8 @@ class CubicalBlowupGraph:
     def _rook_field_component(self, cc_cell, cc_top_cell, n):
         cell_inessential = self.inessential_directions(cc_cell)
         if n in cell_inessential:
-            cell_coords = self.cubical_complex.coordinates(cc_cell)
-            top_cell_coords = self.cubical_complex.coordinates(cc_top_cell)
+            cell_coords = self.coordinates(cc_cell)
+            top_cell_coords = self.coordinates(cc_top_cell)
             side = -1 if cell_coords[n] == top_cell_coords[n] else 1
             return self.wall_label(cc_top_cell, n, side)
         left_wall_label = self.wall_label(cc_top_cell, n, -1)
@@ -273,6 +339,8 @@ class CubicalBlowupGraph:
 
     def gradient_directions(self, cc_cell):
         """Return the list of gradient directions of cc_cell"""
+        if self.rook_tables is not None:
+            return self.rook_tables.gradient_directions(cc_cell)
         cached = self._gradient_cache.get(cc_cell)
         if cached is not None:
             return cached
@@ -289,6 +357,8 @@ class CubicalBlowupGraph:
 
     def opaque_directions(self, cc_cell):
         """Return the list of opaque directions of cc_cell"""
+        if self.rook_tables is not None:
+            return self.rook_tables.opaque_directions(cc_cell)
         cached = self._opaque_cache.get(cc_cell)
         if cached is not None:
             return cached
@@ -305,6 +375,8 @@ class CubicalBlowupGraph:
 
     def equilibrium_cell(self, cc_cell):
         """Return True if cc_cell is equilibrium cell and False otherwise"""
+        if self.rook_tables is not None:
+            return bool(self.rook_tables.equilibrium[cc_cell])
         cached = self._equilibrium_cache.get(cc_cell)
         if cached is not None:
             return cached
@@ -314,7 +386,7 @@ class CubicalBlowupGraph:
 
     def _equilibrium_cell(self, cc_cell):
         # Fringe cells are not equilibrium cells
-        if self.cubical_complex.rightfringe(cc_cell):
+        if self.rightfringe(cc_cell):
             return False
         # Get the top star of cc_cell
         cell_top_star = self.top_star(cc_cell)
@@ -328,10 +400,14 @@ class CubicalBlowupGraph:
 
     def equilibrium_cells(self):
         """Return the list of equilibrium cells"""
+        if self.rook_tables is not None:
+            return self.rook_tables.equilibrium.nonzero()[0].tolist()
         return [cc_cell for cc_cell in self.cubical_complex if self.equilibrium_cell(cc_cell)]
 
     def active_regulation(self, cc_cell, n, k):
         """Return True if the inessential direction n actively regulates the direction k"""
+        if self.rook_tables is not None:
+            return self.rook_tables.active_regulation(cc_cell, n, k)
         # Get list of pairs of n-adjacent top cells
         adjacent_top_pairs = self.adjacent_top_cells(cc_cell, n)
         for top_cell_left, top_cell_right in adjacent_top_pairs:
@@ -377,7 +453,7 @@ class CubicalBlowupGraph:
         typed map o_xi : Act(xi) -> J_i(xi).  The superseded definition let the
         target range over all N directions; `legacy=True` restores that.
         """
-        coords = self.cubical_complex.coordinates(cc_cell)
+        coords = self.coordinates(cc_cell)
         # Get the interior (non-boundary) inessential directions
         inessential = self.inessential_directions(cc_cell)
         iness_inter = [n for n in inessential if coords[n] > 0 and coords[n] < self.limits[n]]
@@ -397,14 +473,14 @@ class CubicalBlowupGraph:
         entrance face of cc_coface with respect to cc_top_cell); 0 if there
         is not a transverse flow direction with respect to cc_top_cell.
         """
-        face_coords = self.cubical_complex.coordinates(cc_face)
-        top_cell_coords = self.cubical_complex.coordinates(cc_top_cell)
+        face_coords = self.coordinates(cc_face)
+        top_cell_coords = self.coordinates(cc_top_cell)
         # face_inessential = self.inessential_directions(cc_face)
         # coface_essential = self.essential_directions(cc_coface)
         # # Directions essential for cc_coface and inessential for cc_face
         # ext_directions = set(coface_essential).intersection(face_inessential)
-        face_shape = self.cubical_complex.cell_shape(cc_face)
-        coface_shape = self.cubical_complex.cell_shape(cc_coface)
+        face_shape = self.cell_shape(cc_face)
+        coface_shape = self.cell_shape(cc_coface)
         # XOR shape (1 where cc_coface is 1 and cc_face is 0)
         xor_shape = coface_shape ^ face_shape
         # Directions essential for cc_coface and inessential for cc_face
@@ -441,8 +517,13 @@ class CubicalBlowupGraph:
             cc_face, cc_coface = cc_cell2, cc_cell1
             face_sign = -1
         # Get flow directions with respect to cells in the top star
-        flow_data = [self.flow_direction_top_cell(cc_face, cc_coface, cc_top_cell) for cc_top_cell in
-                     self.cubical_complex.topstar(cc_coface) if not self.cubical_complex.rightfringe(cc_top_cell)]
+        if self.tables is not None:
+            coface_top_star = self.tables.top_star(cc_coface)
+        else:
+            coface_top_star = [cc_top_cell for cc_top_cell in self.cubical_complex.topstar(cc_coface)
+                               if not self.cubical_complex.rightfringe(cc_top_cell)]
+        flow_data = [self.flow_direction_top_cell(cc_face, cc_coface, cc_top_cell)
+                     for cc_top_cell in coface_top_star]
         # cc_face is an exit face of cc_coface
         if all(k == -1 for k in flow_data):
             return -face_sign
@@ -498,8 +579,8 @@ class CubicalBlowupGraph:
             # No indecisive drift
             return tuple()
         # Get one decision wall for cc_face, cc_coface
-        face_coords = self.cubical_complex.coordinates(cc_face)
-        coface_coords = self.cubical_complex.coordinates(cc_coface)
+        face_coords = self.coordinates(cc_face)
+        coface_coords = self.coordinates(cc_coface)
         # The back walls of `defn:back-walls` shift the coface base by 0 or 1 in
         # every inessential direction of cc_coface. They are cells of X only
         # when 1 <= v'_j <= K(j) for each such j; outside that range the shifted
@@ -557,7 +638,7 @@ class CubicalBlowupGraph:
 
     def in_boundary(self, cc_cell):
         """Return True if cc_cell lies in bdy(X)"""
-        coords = self.cubical_complex.coordinates(cc_cell)
+        coords = self.coordinates(cc_cell)
         return any(coords[n] == 0 or coords[n] == self.limits[n]
                    for n in self.inessential_directions(cc_cell))
 
@@ -578,7 +659,7 @@ class CubicalBlowupGraph:
         does not exclude the boundary; `legacy=True` restores that.
         """
         if not self.legacy:
-            if self.cubical_complex.cell_dim(cc_cell) == self.dim:
+            if self.cell_dim(cc_cell) == self.dim:
                 return False
             if self.in_boundary(cc_cell):
                 return False
@@ -614,8 +695,8 @@ class CubicalBlowupGraph:
         # Transform cycle into a dictionary
         cycle_dict = {cycle[k]: cycle[(k + 1) % cycle_len] for k in range(cycle_len)}
         # Get cell coords and top cell to evaluate rook field
-        cell_coords = self.cubical_complex.coordinates(cc_cell)
-        top_cell_coords = self.cubical_complex.coordinates(cc_top_cell)
+        cell_coords = self.coordinates(cc_cell)
+        top_cell_coords = self.coordinates(cc_top_cell)
         top_cell_rook = self.cubical_complex.cell_index(cell_coords, self.top_shape)
         lap_num = 0
         for n in cycle_dict:
@@ -632,9 +713,9 @@ class CubicalBlowupGraph:
     def unstable_cells(self, cc_cell, non_trivial_cycles):
         """Compute unstable cells of cc_cell with respect to non-trivial cycles"""
         cell_star = self.star(cc_cell)
-        cell_dim = self.cubical_complex.cell_dim(cc_cell)
+        cell_dim = self.cell_dim(cc_cell)
         # Get cofaces of co-dimension 2 or more of cc_cell
-        star_codim2 = [cell for cell in cell_star if self.cubical_complex.cell_dim(cell) > cell_dim + 1]
+        star_codim2 = [cell for cell in cell_star if self.cell_dim(cell) > cell_dim + 1]
         unst_cells = []
         for cc_coface in star_codim2:
             # Get list of unstable cells
@@ -719,7 +800,7 @@ class CubicalBlowupGraph:
     def trivial_multivalued_map(self):
         """Compute the trivial multivalued map (F_0)"""
         # Just need to add edges (vertices are automatically added)
-        for cell1 in self.blowup_complex(self.dim):
+        for cell1 in self._blowup_top_cells():
             # Add self edge if not fringe cell
             if not self.blowup_complex.rightfringe(cell1):
                 self.digraph.add_edge(cell1, cell1)
@@ -761,8 +842,8 @@ class CubicalBlowupGraph:
         `defn:Rule3` is F_3(xi) = ( F_2(xi) cap F_{3.1}(xi) ) u U(xi): the union
         is unconditional, so U(xi) is not reached through the pairwise cascade.
         """
-        for cc_cell in self.cubical_complex:
-            if self.cubical_complex.rightfringe(cc_cell):
+        for cc_cell in self._cubical_cells():
+            if self.rightfringe(cc_cell):
                 continue
             if not self.semi_opaque_cell(cc_cell):
                 continue
@@ -788,7 +869,7 @@ class CubicalBlowupGraph:
         """
         use_decision_wall = self.level > 1
         use_cycles = self.level > 2
-        for cell1 in self.blowup_complex(self.dim):
+        for cell1 in self._blowup_top_cells():
             cc_cell1 = self.blowup2cubical(cell1)
             # Condition 1.1: the self edge survives only at equilibrium cells
             if self.self_edges and self.equilibrium_cell(cc_cell1):
@@ -845,7 +926,7 @@ class CubicalBlowupGraph:
             return
         # Add edges corresponding to level 1 (multivalued map F_1)
         # Just need to add edges (vertices are automatically added)
-        for cell1 in self.blowup_complex(self.dim):
+        for cell1 in self._blowup_top_cells():
             # Get corresponding cubical complex cell
             cc_cell1 = self.blowup2cubical(cell1)
             # Add self edge if equilibrium cell and flag is set
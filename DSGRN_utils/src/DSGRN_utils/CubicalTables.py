@@ -0,0 +1,263 @@
+### CubicalTables.py
+### MIT LICENSE 2024 Marcio Gameiro
+
+import functools
+
+import numpy as np
+
+class CubicalTables:
+    """Dense NumPy tables for the cells of a pychomp CubicalComplex.
+
+    The tables are computed arithmetically from the pychomp cell indexing
+    (cells grouped in blocks of equal shape, blocks ordered by dimension and
+    then by shape value, positions with twisted periodic wrap) instead of by
+    querying the complex cell by cell. They depend only on the grid size, so
+    one instance is shared by every parameter of a network (see the function
+    `cubical_tables` below).
+
+    Attributes:
+        coords     : (ncells, dim) array of cell coordinates
+        shape      : (ncells,) array of shape bitmasks
+        cell_dim   : (ncells,) array of cell dimensions
+        fringe     : (ncells,) bool array of right fringe flags
+        top_star_ptr, top_star_idx : CSR arrays of the non-fringe top star of
+                     each cell, in the same order as `CubicalComplex.topstar`
+        star_ptr, star_idx : CSR arrays of the non-fringe star of each cell
+                     (computed on first use)
+    """
+
+    def __init__(self, boxes):
+        # Grid size (number of boxes per dimension, fringe layer included)
+        self.boxes = tuple(boxes)
+        # Space dimension
+        self.dim = len(self.boxes)
+        # Number of cells of each shape
+        self.num_positions = int(np.prod(self.boxes))
+        # Number of shapes and shape of top dimensional cells
+        self.num_shapes = 2**self.dim
+        self.top_shape = self.num_shapes - 1
+        # Index offset of each coordinate within a block of cells of one shape
+        self.jump = [1]
+        for k in self.boxes:
+            self.jump.append(self.jump[-1] * k)
+        # Shapes in the order pychomp stores them: by dimension, then by value
+        self.shapes = sorted(range(self.num_shapes), key=lambda s: (bin(s).count('1'), s))
+        # Index of the first cell of each shape
+        self.shape_offset = [0] * self.num_shapes
+        for k, s in enumerate(self.shapes):
+            self.shape_offset[s] = k * self.num_positions
+        # Essential and inessential directions of each shape
+        self.essential = [[n for n in range(self.dim) if s & (1 << n)] for s in range(self.num_shapes)]
+        self.inessential = [[n for n in range(self.dim) if not s & (1 << n)] for s in range(self.num_shapes)]
+        # Per cell tables
+        self.num_cells = self.num_shapes * self.num_positions
+        positions = np.arange(self.num_positions, dtype=np.int64)
+        block_coords = np.stack([(positions // self.jump[n]) % self.boxes[n]
+                                 for n in range(self.dim)], axis=1).astype(np.int32)
+        self.position = np.tile(positions, self.num_shapes)
+        self.coords = np.tile(block_coords, (self.num_shapes, 1))
+        self.shape = np.repeat(np.array(self.shapes, dtype=np.int64), self.num_positions)
+        self.cell_dim = np.repeat(np.array([len(self.essential[s]) for s in self.shapes],
+                                           dtype=np.int32), self.num_positions)
+        self.fringe = np.zeros(self.num_cells, dtype=bool)
+        for n in range(self.dim):
+            self.fringe |= ((self.shape >> n) & 1).astype(bool) & (self.coords[:, n] == self.boxes[n] - 1)
+        # Top star of every cell (fringe top cells discarded)
+        self.top_star_ptr, self.top_star_idx = self._top_star_tables()
+
+    def _shifted_cells(self, shape, shifts):
+        """Return a (num_positions, len(shifts)) array whose row p lists the
+        cells of the given shape at position p minus each shift (mod the
+        number of positions, as in the twisted periodic pychomp indexing).
+        """
+        positions = np.arange(self.num_positions, dtype=np.int64)
+        shifted = (positions[:, None] - np.array(shifts, dtype=np.int64)[None, :]) % self.num_positions
+        return shifted + self.shape_offset[shape]
+
+    def _csr(self, blocks):
+        """Assemble CSR arrays from per block (num_positions, k) cell arrays,
+        discarding fringe cells and keeping the column order within a row.
+        """
+        counts, indices = [], []
+        for block in blocks:
+            keep = ~self.fringe[block]
+            counts.append(keep.sum(axis=1))
+            indices.append(block[keep])
+        ptr = np.zeros(self.num_cells + 1, dtype=np.int64)
+        np.cumsum(np.concatenate(counts), out=ptr[1:])
+        idx = np.concatenate(indices).astype(np.int32)
+        return ptr, idx
+
+    def _top_star_tables(self):
+        blocks = []
+        for s in self.shapes:
+            inessential = self.inessential[s]
+            # Subsets of the inessential directions in decreasing bitmask order
+            subsets = sorted(range(2**len(inessential)), reverse=True)
+            shifts = [sum(self.jump[n] for k, n in enumerate(inessential) if b & (1 << k))
+                      for b in subsets]
+            blocks.append(self._shifted_cells(self.top_shape, shifts))
+        return self._csr(blocks)
+
+    @functools.cached_property
+    def _star_tables(self):
+        blocks = []
+        for s in self.shapes:
+            inessential = self.inessential[s]
+            columns = []
+            for b in range(2**len(inessential)):
+                # Coface shape adds the directions in the subset b
+                ext = [n for k, n in enumerate(inessential) if b & (1 << k)]
+                coface_shape = s | sum(1 << n for n in ext)
+                # Each extension direction may go left or right
+                for t in range(2**len(ext)):
+                    shift = sum(self.jump[n] for k, n in enumerate(ext) if t & (1 << k))
+                    columns.append(self._shifted_cells(coface_shape, [shift]))
+            blocks.append(np.concatenate(columns, axis=1))
+        return self._csr(blocks)
+
+    @property
+    def star_ptr(self):
+        return self._star_tables[0]
+
+    @property
+    def star_idx(self):
+        return self._star_tables[1]
+
+    def top_star(self, cell):
+        """Return the list of non-fringe top cells in the star of cell"""
+        return self.top_star_idx[self.top_star_ptr[cell]:self.top_star_ptr[cell + 1]].tolist()
+
+    def star(self, cell):
+        """Return the list of non-fringe cells in the star of cell"""
+        return self.star_idx[self.star_ptr[cell]:self.star_ptr[cell + 1]].tolist()
+
+@functools.lru_cache(maxsize=8)
+def cubical_tables(boxes):
+    """Return the (shared) tables of the cubical complex with the given grid size"""
+    return CubicalTables(tuple(boxes))
+
+class FringeTables:
+    """Right fringe masks over all cells of a pychomp CubicalComplex.
+
+    Computed block by block from the pychomp cell indexing (see CubicalTables)
+    without per cell tables, so they are cheap for the large blowup complexes.
+    They depend only on the grid size and are shared through `fringe_tables`.
+
+    Attributes:
+        fringe         : (ncells,) bool array of right fringe flags
+        fringe_closure : (ncells,) bool array, true if the star of the cell
+                         contains a fringe cell (the cell is a face of one)
+        near_fringe    : (ncells,) bool array, true if the cell or one of its
+                         boundary cells has a fringe cell in its star. This is
+                         the fringe test of the JSON export; the boundary
+                         cells of PlotMorseSets are the near fringe cells that
+                         are not fringe
+    """
+
+    def __init__(self, boxes):
+        self.boxes = tuple(boxes)
+        dim = len(self.boxes)
+        num_shapes = 2**dim
+        self.num_positions = int(np.prod(self.boxes))
+        self.num_cells = num_shapes * self.num_positions
+        jump = [1]
+        for k in self.boxes:
+            jump.append(jump[-1] * k)
+        # Shapes in the order pychomp stores them and first cell of each shape
+        shapes = sorted(range(num_shapes), key=lambda s: (bin(s).count('1'), s))
+        offset = [0] * num_shapes
+        for k, s in enumerate(shapes):
+            offset[s] = k * self.num_positions
+        positions = np.arange(self.num_positions, dtype=np.int64)
+        # Positions on the right most layer in each direction
+        last = [(positions // jump[n]) % self.boxes[n] == self.boxes[n] - 1 for n in range(dim)]
+
+        def block(s):
+            return slice(offset[s], offset[s] + self.num_positions)
+
+        def shifted(s, shift):
+            # Cells of shape s at each position minus shift (twisted periodic)
+            return (positions - shift) % self.num_positions + offset[s]
+
+        self.fringe = np.zeros(self.num_cells, dtype=bool)
+        for s in shapes:
+            for n in range(dim):
+                if s & (1 << n):
+                    self.fringe[block(s)] |= last[n]
+        # A cell is a face of a fringe cell if it is fringe or one of its
+        # codimension one cofaces is; go down from the top cells
+        self.fringe_closure = self.fringe.copy()
+        for s in reversed(shapes):
+            for n in range(dim):
+                if not s & (1 << n):
+                    coface = s | (1 << n)
+                    self.fringe_closure[block(s)] |= (self.fringe_closure[shifted(coface, 0)] |
+                                                      self.fringe_closure[shifted(coface, jump[n])])
+        # Add the cells with a boundary cell that is a face of a fringe cell
+        self.near_fringe = self.fringe_closure.copy()
+        for s in shapes:
+            for n in range(dim):
+                if s & (1 << n):
+                    face = s & ~(1 << n)
+                    self.near_fringe[block(s)] |= (self.fringe_closure[shifted(face, 0)] |
+                                                   self.fringe_closure[shifted(face, -jump[n])])
+
+@functools.lru_cache(maxsize=8)
+def fringe_tables(boxes):
+    """Return the (shared) fringe masks of the cubical complex with the given grid size"""
+    return FringeTables(tuple(boxes))
+
+class BlowupTables:
+    """Index arrays translating between the cells of a cubical complex X and
+    the top cells of its blowup complex Xb.
+
+    A cell of X with coordinates v and shape bits w corresponds to the top
+    cell of Xb with coordinates 2v + w, so the translation is a bijection
+    between the cells of X and the top cells of Xb. The coordinates of a cell
+    of Xb only depend on its position within its block of cells of one shape,
+    which is what `blowup2cubical` is indexed by.
+
+    Attributes:
+        num_positions  : number of cells of each shape in Xb
+        top_offset     : index of the first top cell of Xb
+        blowup2cubical : (num_positions,) array mapping the position of a cell
+                         of Xb to the corresponding cell of X
+        cubical2blowup : (ncells,) array mapping a cell of X to the
+                         corresponding top cell of Xb
+    """
+
+    def __init__(self, boxes):
+        # Grid size of X (fringe layer included) and of Xb
+        self.boxes = tuple(boxes)
+        self.blowup_boxes = tuple(2 * k for k in self.boxes)
+        dim = len(self.boxes)
+        num_shapes = 2**dim
+        cc_positions = int(np.prod(self.boxes))
+        self.num_positions = int(np.prod(self.blowup_boxes))
+        # The top cells are the last block of cells in pychomp
+        self.top_offset = (num_shapes - 1) * self.num_positions
+        # Offset of the first cell of each shape in X (see CubicalTables)
+        shapes = sorted(range(num_shapes), key=lambda s: (bin(s).count('1'), s))
+        shape_offset = np.zeros(num_shapes, dtype=np.int64)
+        for k, s in enumerate(shapes):
+            shape_offset[s] = k * cc_positions
+        positions = np.arange(self.num_positions, dtype=np.int64)
+        cc_cells = np.zeros(self.num_positions, dtype=np.int64)
+        cc_shapes = np.zeros(self.num_positions, dtype=np.int64)
+        blowup_jump, cc_jump = 1, 1
+        for n in range(dim):
+            coords = (positions // blowup_jump) % self.blowup_boxes[n]
+            cc_cells += (coords // 2) * cc_jump
+            cc_shapes |= (coords % 2) << n
+            blowup_jump *= self.blowup_boxes[n]
+            cc_jump *= self.boxes[n]
+        cc_cells += shape_offset[cc_shapes]
+        self.blowup2cubical = cc_cells
+        self.cubical2blowup = np.empty(self.num_positions, dtype=np.int64)
+        self.cubical2blowup[cc_cells] = positions + self.top_offset
+
+@functools.lru_cache(maxsize=8)
+def blowup_tables(boxes):
+    """Return the (shared) blowup translation tables for the grid size of X"""
+    return BlowupTables(tuple(boxes))
@@ -0,0 +1,74 @@
+### GradingIndex.py
+### MIT LICENSE 2024 Marcio Gameiro
+
+import numpy as np
+
+class GradingIndex:
+    """Grading of the top cells of the blowup complex, read once.
+
+    The grading of a top cell is the SCC (vertex of the SCC DAG) the cell
+    belongs to. Reading it with `graded_complex.value` cell by cell is the
+    expensive part of grouping cells by SCC, so this is done in a single pass
+    and the cells are then grouped with CSR arrays.
+
+    Attributes:
+        top_offset   : index of the first top cell of the blowup complex
+        grades       : (num_positions,) array with the grading of each top
+                       cell, indexed by cell - top_offset
+        fringe_grade : grading value of the fringe cells
+        grade_ptr, grade_cells : CSR arrays of the top cells of each grading
+                       value (cells in increasing order)
+        node_grades  : grading value of each Morse node (set by MorseGraph)
+    """
+
+    def __init__(self, stg, graded_complex):
+        self.top_offset = stg.blowup_tables.top_offset
+        num_positions = stg.blowup_tables.num_positions
+        self.grades = np.fromiter((graded_complex.value(cell) for cell in
+                                   range(self.top_offset, self.top_offset + num_positions)),
+                                  dtype=np.int64, count=num_positions)
+        self.fringe_grade = graded_complex.value(stg.complex().size() - 1)
+        self._group_cells()
+
+    @classmethod
+    def from_arrays(cls, grades, top_offset, fringe_grade):
+        """Rebuild an index from the arrays of a stored one (no complex needed)"""
+        index = cls.__new__(cls)
+        index.top_offset = int(top_offset)
+        index.grades = np.asarray(grades, dtype=np.int64)
+        index.fringe_grade = int(fringe_grade)
+        index._group_cells()
+        return index
+
+    def _group_cells(self):
+        """Group the top cells by grading value in CSR arrays"""
+        # Stable sort keeps the cells of each grading value in increasing order
+        counts = np.bincount(self.grades)
+        self.grade_ptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.grade_ptr[1:])
+        self.grade_cells = np.argsort(self.grades, kind='stable') + self.top_offset
+        self.node_grades = None
+
+    def grade(self, cell):
+        """Return the grading value of a top cell"""
+        return int(self.grades[cell - self.top_offset])
+
+    def num_cells(self, grade):
+        """Return the number of top cells with a grading value"""
+        if grade + 1 >= len(self.grade_ptr):
+            return 0
+        return int(self.grade_ptr[grade + 1] - self.grade_ptr[grade])
+
+    def cells(self, grade):
+        """Return the array of top cells with a grading value"""
+        if grade + 1 >= len(self.grade_ptr):
+            return self.grade_cells[:0]
+        return self.grade_cells[self.grade_ptr[grade]:self.grade_ptr[grade + 1]]
+
+    def set_morse_nodes(self, node_grades):
+        """Record the grading value of each Morse node (in node order)"""
+        self.node_grades = list(node_grades)
+
+    def node_cells(self, morse_node):
+        """Return the array of top cells of the Morse set of a Morse node"""
+        return self.cells(self.node_grades[morse_node])
@@ -2,10 +2,35 @@
 ### MIT LICENSE 2024 Marcio Gameiro
 
 import pychomp
-from collections import defaultdict
+from DSGRN_utils.GradingIndex import GradingIndex
 
-def MorseGraph(stg, scc_dag, graded_complex, connection_matrix, prune_grad=True):
-    """Construct the Morse graph"""
+def nontrivial_scc_cells(stg, scc_cells, prune_grad=True):
+    """Check if the SCC made of the top cells scc_cells is nontrivial (not
+    counting its Conley index, which MorseGraph also checks)"""
+    # If prune_gradient is False check for multiple cells or self edge in SCC
+    if not prune_grad:
+        return len(scc_cells) > 1 or any(c in stg.digraph.adjacencies(c) for c in scc_cells)
+    # Check if there are common gradient directions
+    common_grad_dirs = set()
+    # Get the corresponding cubical cells all at once
+    for cc_cell in stg.blowup2cubical_array(scc_cells).tolist():
+        # Get gradient directions for cell
+        grad_dirs = stg.gradient_directions(cc_cell)
+        # Initialize common_grad_dirs
+        if not common_grad_dirs:
+            common_grad_dirs.update(grad_dirs)
+        # Intersect with previous gradient directions
+        common_grad_dirs.intersection_update(grad_dirs)
+        # Nontrivial if no common gradient directions
+        if not common_grad_dirs:
+            return True
+    return False
+
+def MorseGraph(stg, scc_dag, graded_complex, connection_matrix, prune_grad=True, grading_index=None):
+    """Construct the Morse graph. If a GradingIndex is given it is used to
+    get the cells of each SCC and the grading of each Morse node is recorded
+    in it.
+    """
 
     def nontrivial_scc(v):
         """Check if the SCC with grading v is nontrivial"""
@@ -13,50 +38,19 @@ def MorseGraph(stg, scc_dag, graded_complex, connection_matrix, prune_grad=True)
             return False
         if v in conley_indices:
             return True
-        # Get set of cells in the SCC with grading v
-        scc_v = grading_cells[v]
-        # If prune_gradient is False check for multiple cells or self edge in SCC
-        if not prune_grad:
-            return len(scc_v) > 1 or any(c in stg.digraph.adjacencies(c) for c in scc_v)
-        # Check if there are common gradient directions
-        common_grad_dirs = set()
-        for cell in scc_v:
-            # Get gradient directions for cell
-            cc_cell = stg.blowup2cubical(cell)
-            grad_dirs = stg.gradient_directions(cc_cell)
-            # Initialize common_grad_dirs
-            if not common_grad_dirs:
-                common_grad_dirs.update(grad_dirs)
-            # Intersect with previous gradient directions
-            common_grad_dirs.intersection_update(grad_dirs)
-            # Nontrivial if no common gradient directions
-            if not common_grad_dirs:
-                return True
-        return False
-
-    def vertex_rank(v):
-        """Return how many levels down of descendents of v there are"""
-        # Use the dictionary if available
-        if v in morse_graph_vert_ranks:
-            return morse_graph_vert_ranks[v]
-        if not descendant_lists[v]:
-            return 0
-        return max([vertex_rank(u) for u in descendant_lists[v]]) + 1
+        # Otherwise check the cells of the SCC with grading v
+        return nontrivial_scc_cells(stg, grading_index.cells(v).tolist(), prune_grad)
 
     def vertex_label(v):
         """Vertex label for Morse graph"""
         # return str(vertex_indices[v]) + " : " + str(tuple(conley_indices[v]))
         return [vertex_indices[v], num_cells[v], tuple(conley_indices[v])]
 
+    # Get the top cells with the same grading (same SCC) in one pass
+    if grading_index is None:
+        grading_index = GradingIndex(stg, graded_complex)
     # Get the grading value for fringe cells
-    fringe_node_grade = graded_complex.value(stg.complex().size() - 1)
-    # Get sets of cells with the same grading (same SCC)
-    grading_cells = defaultdict(set)
-    for cell in stg.digraph.vertices():
-        val = graded_complex.value(cell)
-        if val == fringe_node_grade:
-            continue
-        grading_cells[val].add(cell)
+    fringe_node_grade = grading_index.fringe_grade
     # Get the cell complex dimension
     dim = graded_complex.complex().dimension()
     # Get the nontrivial Conley indices
@@ -67,25 +61,42 @@ def MorseGraph(stg, scc_dag, graded_complex, connection_matrix, prune_grad=True)
     for v in morse_graph_verts:
         if v not in conley_indices:
             conley_indices[v] = [0] * (dim + 1)
+    # Get a sorted list Morse graph vertices
+    sorted_vertices = sorted(morse_graph_verts)
+    # Bit of each Morse graph vertex in the reachability bitmasks below
+    vertex_bits = {v: 1 << k for k, v in enumerate(sorted_vertices)}
+    # Get the Morse graph vertices reachable from each SCC in one sweep over
+    # the SCC DAG in reverse topological order (descendants come first)
+    reverse_topsort = pychomp.TopologicalSort(scc_dag.vertices(), scc_dag.adjacencies)
+    reachable = {}
+    for v in reverse_topsort:
+        mask = 0
+        for u in scc_dag.adjacencies(v):
+            mask |= reachable[u] | vertex_bits.get(u, 0)
+        reachable[v] = mask
     # Get strict descendants of Morse graph vertices
     descendant_lists = {}
     for v in morse_graph_verts:
-        descendant_lists[v] = {u for u in scc_dag.descendants(v) if u in morse_graph_verts and u != v}
-    # Get a sorted list Morse graph vertices
-    sorted_vertices = sorted(morse_graph_verts)
+        mask = reachable[v]
+        descendant_lists[v] = {u for u in sorted_vertices if mask & vertex_bits[u]}
     # # Further sort Morse graph vertices by number of descendants
     # sorted_vertices.sort(key=lambda v: len(descendant_lists[v]))
-    # Create a dictionary of vertices ranks
+    # Rank of a vertex: how many levels down of descendants of v there are.
+    # Descendants come first in reverse_topsort, so their ranks are known.
     morse_graph_vert_ranks = {}
-    # Add the ranks to the dictionary
-    for v in sorted_vertices:
-        morse_graph_vert_ranks[v] = vertex_rank(v)
+    for v in reverse_topsort:
+        if v not in morse_graph_verts:
+            continue
+        ranks = [morse_graph_vert_ranks[u] for u in descendant_lists[v]]
+        morse_graph_vert_ranks[v] = max(ranks) + 1 if ranks else 0
     # Finally sort Morse graph vertices by rank
     sorted_vertices.sort(key=lambda v: morse_graph_vert_ranks[v])
     # Make an indexing of the Morse graph vertices
     vertex_indices = {v: k for k, v in enumerate(sorted_vertices)}
+    # Record the grading of each Morse node
+    grading_index.set_morse_nodes(sorted_vertices)
     # Get the number of top dimensinal cells for each Morse graph vertex
-    num_cells = {v: graded_complex.count()[v][-1] for v in sorted_vertices}
+    num_cells = {v: grading_index.num_cells(v) for v in sorted_vertices}
     # Define the Morse graph
     morse_graph = pychomp.DirectedAcyclicGraph()
     # Add vertices and edges
@@ -96,3 +107,37 @@ def MorseGraph(stg, scc_dag, graded_complex, connection_matrix, prune_grad=True)
             morse_graph.add_edge(v, u)
     # Morse graph is the transitive reduction of morse_graph
     return morse_graph.transitive_reduction()
+
+def NumberOfAttractors(stg, prune_grad=True):
+    """Return the number of attractors (Morse nodes without out edges) of the
+    Morse graph of stg, without computing it.
+
+    Only the SCCs of stg are computed: no graded complex, connection matrix
+    or Conley index. The SCCs come out of pychomp.StronglyConnectedComponents
+    in reverse topological order, so whether an SCC reaches a Morse node is
+    known from its out edges when it is reached, and only SCCs that reach no
+    Morse node are tested with nontrivial_scc_cells. The count equals that of
+    MorseGraph unless an SCC that fails this test has a nontrivial Conley
+    index, which MorseGraph makes a Morse node as well.
+    """
+    adjacencies = stg.adjacencies()
+    complex = stg.complex()
+    top_offset = stg.blowup_tables.top_offset
+    components = pychomp.StronglyConnectedComponents(complex(complex.dimension()), adjacencies)
+    # SCC of each top cell, indexed by cell - top_offset
+    scc_of = [0] * stg.blowup_tables.num_positions
+    for k, component in enumerate(components):
+        for cell in component:
+            scc_of[cell - top_offset] = k
+    # The fringe cells are never a Morse node
+    fringe_scc = scc_of[complex.size() - 1 - top_offset]
+    # Whether each SCC is a Morse node or reaches one
+    reaches_morse = [False] * len(components)
+    num_attractors = 0
+    for k, component in enumerate(components):
+        if any(reaches_morse[scc_of[v - top_offset]] for u in component for v in adjacencies(u)):
+            reaches_morse[k] = True
+        elif k != fringe_scc and nontrivial_scc_cells(stg, component, prune_grad):
+            reaches_morse[k] = True
+            num_attractors += 1
+    return num_attractors
@@ -0,0 +1,249 @@
+### MorseGraphQuery.py
+### MIT LICENSE 2024 Marcio Gameiro
+
+import DSGRN
+import DSGRN_utils
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import json
+import os
+
+def morse_graph_signature(morse_graph):
+    """Return a hashable invariant of a Morse graph.
+
+    DSGRN.isomorphic_morse_graphs expects the string vertex labels this package
+    used before the labels became lists, so it cannot be applied directly.  The
+    signature below compares the same data it did: the multiset of Conley
+    indices together with the reachability order on the labelled nodes.
+    """
+    index_of = {v: morse_graph.vertex_label(v)[0] for v in morse_graph.vertices()}
+    conley = {index_of[v]: tuple(morse_graph.vertex_label(v)[2]) for v in morse_graph.vertices()}
+    edges = frozenset((index_of[v], index_of[u])
+                      for v in morse_graph.vertices()
+                      for u in morse_graph.adjacencies(v))
+    return (tuple(sorted(conley.items())), edges)
+
+def signature_num_stable(signature):
+    """Return the number of attractors (nodes without out edges) of a signature"""
+    conley, edges = signature
+    return len({node for node, _ in conley} - {source for source, _ in edges})
+
+def signature_json(signature):
+    conley, edges = signature
+    return {"conley": [[node, list(index)] for node, index in conley],
+            "edges": sorted([list(edge) for edge in edges])}
+
+def signature_from_json(data):
+    return (tuple((node, tuple(index)) for node, index in data["conley"]),
+            frozenset(tuple(edge) for edge in data["edges"]))
+
+def network_edge_blowup(network):
+    """Return the edge_blowup flag that rebuilds network from its specification"""
+    flags = {(False, False): 'none', (True, True): 'all', (True, False): 'pos', (False, True): 'neg'}
+    return flags[(network.pos_edge_blowup(), network.neg_edge_blowup())]
+
+class QueryCache:
+    """Morse graph signatures of the parameters of one network at one level.
+
+    StabilityQuery and IsomorphismQuery both reduce a parameter to the
+    signature of its Morse graph, so passing the same cache to both computes
+    each Morse graph once. With a file name the signatures are also kept in a
+    JSON Lines file: the first line names the network and level, each other
+    line holds one parameter and is flushed when written. A last line cut
+    short by an interrupted run is dropped when the file is read, so the file
+    doubles as a checkpoint of a long query.
+    """
+
+    def __init__(self, fname=None):
+        self.fname = fname
+        self.header = None
+        self.signatures = {}
+        if fname is not None and os.path.exists(fname):
+            self._read()
+
+    def _read(self):
+        with open(self.fname, 'rb+') as infile:
+            # Length of the complete lines read so far
+            end = 0
+            for line in infile:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if self.header is None:
+                    self.header = record
+                else:
+                    self.signatures[record["parameter"]] = signature_from_json(record["signature"])
+                end += len(line)
+            infile.truncate(end)
+
+    def bind(self, network, level):
+        """Check that the cache belongs to this network and level (the first
+        query to use a cache binds it). Raise ValueError otherwise."""
+        header = {"network": network.specification(),
+                  "edge_blowup": network_edge_blowup(network),
+                  "level": level}
+        if self.header is None:
+            self.header = header
+            if self.fname is not None:
+                with open(self.fname, 'w') as outfile:
+                    outfile.write(json.dumps(header) + '\n')
+        elif self.header != header:
+            raise ValueError('Query cache ' + str(self.fname) + ' belongs to a different network or level.')
+
+    def __contains__(self, par_index):
+        return par_index in self.signatures
+
+    def __getitem__(self, par_index):
+        return self.signatures[par_index]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def update(self, records):
+        """Add (par_index, signature) pairs, appending them to the file"""
+        records = [(par_index, signature) for par_index, signature in records
+                   if par_index not in self.signatures]
+        self.signatures.update(records)
+        if self.fname is not None and records:
+            with open(self.fname, 'a') as outfile:
+                for par_index, signature in records:
+                    outfile.write(json.dumps({"parameter": par_index,
+                                              "signature": signature_json(signature)}) + '\n')
+                outfile.flush()
+
+# Parameter graphs built in this process, keyed by network
+_parameter_graphs = {}
+
+def _parameter_chunk(net_spec, edge_blowup, level, value, param_indices):
+    """Return value(parameter, level) for a chunk of parameters"""
+    key = (net_spec, edge_blowup)
+    if key not in _parameter_graphs:
+        network = DSGRN.Network(net_spec, edge_blowup=edge_blowup)
+        _parameter_graphs[key] = DSGRN.ParameterGraph(network)
+    parameter_graph = _parameter_graphs[key]
+    return [value(parameter_graph.parameter(par_index), level) for par_index in param_indices]
+
+def _signature(parameter, level):
+    morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=level)
+    return morse_graph_signature(morse_graph)
+
+def _num_stable(parameter, level):
+    stg = DSGRN_utils.CubicalBlowupGraph(parameter, level=level)
+    return DSGRN_utils.NumberOfAttractors(stg)
+
+def parameter_values(network, param_indices, level, value, values, workers=1, chunk_size=64,
+                     max_pending=None):
+    """Yield (par_index, value(parameter, level)) for each parameter, in the
+    order given, reading the parameters found in values (a dict or QueryCache)
+    from it and adding the computed ones to it a chunk at a time.
+
+    The values are computed in chunks of chunk_size parameters, in a pool of
+    worker processes if workers > 1. value must be a module level function,
+    so that it can be sent to the workers. param_indices is read once and
+    lazily: at most max_pending chunks (default twice the workers) are in
+    flight, so a range over a large parameter graph is never materialised.
+    """
+    compute = functools.partial(_parameter_chunk, network.specification(),
+                                network_edge_blowup(network), level, value)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    if max_pending == None:
+        max_pending = 2 * workers
+    # Parameters read but not yielded yet, in order
+    waiting = deque()
+    # Parameters of the chunk being filled, and of the chunks in flight
+    chunk, scheduled, pending = [], set(), deque()
+
+    def submit():
+        nonlocal chunk
+        if chunk:
+            future = pool.submit(compute, chunk) if pool is not None else None
+            pending.append((chunk, future))
+            chunk = []
+
+    def resolve():
+        """Add the values of the oldest chunk in flight"""
+        done, future = pending.popleft()
+        values.update(zip(done, compute(done) if future is None else future.result()))
+        scheduled.difference_update(done)
+
+    # Past this many waiting parameters, wait for the chunks they need
+    max_waiting = (max(1, max_pending) + 1) * chunk_size
+    try:
+        for par_index in param_indices:
+            waiting.append(par_index)
+            if par_index not in values and par_index not in scheduled:
+                scheduled.add(par_index)
+                chunk.append(par_index)
+                if len(chunk) == chunk_size:
+                    submit()
+                    if pool is None or len(pending) > max_pending:
+                        resolve()
+            if len(waiting) > max_waiting:
+                submit()
+                while waiting[0] not in values:
+                    resolve()
+            while waiting and waiting[0] in values:
+                par_index = waiting.popleft()
+                yield par_index, values[par_index]
+        submit()
+        while waiting:
+            while waiting[0] not in values:
+                resolve()
+            par_index = waiting.popleft()
+            yield par_index, values[par_index]
+    finally:
+        if pool is not None:
+            for _, future in pending:
+                future.cancel()
+            pool.shutdown(cancel_futures=True)
+
+def MorseGraphSignatures(network, param_indices=None, level=4, workers=1, chunk_size=64, cache=None):
+    """Yield (par_index, signature) for each parameter, in the order given.
+
+    The Morse graphs are computed in chunks of chunk_size parameters, in a
+    pool of worker processes if workers > 1. Parameters found in cache (a
+    QueryCache) are not recomputed, and the computed ones are added to it a
+    chunk at a time.
+    """
+    if param_indices == None:
+        param_indices = range(DSGRN.ParameterGraph(network).size())
+    if cache is None:
+        cache = QueryCache()
+    cache.bind(network, level)
+    return parameter_values(network, param_indices, level, _signature, cache,
+                            workers=workers, chunk_size=chunk_size)
+
+class _CachedCounts(dict):
+    """Attractor counts computed here, falling back on the signatures of a
+    QueryCache, so the parameters do not have to be read in advance"""
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+
+    def __contains__(self, par_index):
+        return dict.__contains__(self, par_index) or (self.cache is not None and par_index in self.cache)
+
+    def __getitem__(self, par_index):
+        if dict.__contains__(self, par_index):
+            return dict.__getitem__(self, par_index)
+        return signature_num_stable(self.cache[par_index])
+
+def AttractorCounts(network, param_indices=None, level=4, workers=1, chunk_size=64, cache=None):
+    """Yield (par_index, number of attractors) for each parameter, in the
+    order given, computed with NumberOfAttractors instead of the full Morse
+    graph. Parameters found in cache (a QueryCache) are read from their
+    signatures; the counts computed here are not signatures, so they are
+    not added to it.
+    """
+    if param_indices == None:
+        param_indices = range(DSGRN.ParameterGraph(network).size())
+    if cache is not None:
+        cache.bind(network, level)
+    counts = _CachedCounts(cache)
+    return parameter_values(network, param_indices, level, _num_stable, counts,
+                            workers=workers, chunk_size=chunk_size)
@@ -3,10 +3,11 @@
 
 import graphviz
 
-def MorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=True):
+def MorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=True, grading_index=None):
     """Return the subgraph of the STG corresponding to the SCC of morse_node.
     If blowup is True return cells in the blowup complex, otherwise return
-    cells in the original cubical complex.
+    cells in the original cubical complex. If the GradingIndex used to build
+    morse_graph is given the Morse set cells are read from it.
     """
     # Number of Morse sets
     num_morse_sets = len(morse_graph.vertices())
@@ -25,13 +26,13 @@ def MorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=True):
         """Return cell index"""
         if blowup:
             return cell
-        return stg.blowup2cubical(cell)
+        return cubical_cells[cell]
 
     def cell_coordinates(cell):
         """Return cell coordinates"""
         if blowup:
             return graded_complex.complex().coordinates(cell)
-        return stg.cubical_complex.coordinates(stg.blowup2cubical(cell))
+        return stg.cubical_complex.coordinates(cubical_cells[cell])
 
     def cell_shape_vector(cell):
         """Return cell shape vector"""
@@ -39,18 +40,24 @@ def MorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=True):
             # Only top cells for the blowup
             cell_shape_vec = [1]*dim
             return cell_shape_vec
-        cubic_cell = stg.blowup2cubical(cell)
+        cubic_cell = cubical_cells[cell]
         shape = stg.cubical_complex.cell_shape(cubic_cell)
         shape_vec = [1 if (shape & (1 << d)) else 0 for d in range(dim)]
         return shape_vec
 
     # Get cells in the Morse set
-    morse_node_cells = set()
-    for cell in graded_complex.complex()(dim):
-        # Skip cells with a different grading (includes fringe cells)
-        if graded_complex.value(cell) != node_grading:
-            continue
-        morse_node_cells.add(cell)
+    if grading_index is not None:
+        morse_node_cells = set(grading_index.cells(node_grading).tolist())
+    else:
+        morse_node_cells = set()
+        for cell in graded_complex.complex()(dim):
+            # Skip cells with a different grading (includes fringe cells)
+            if graded_complex.value(cell) != node_grading:
+                continue
+            morse_node_cells.add(cell)
+    # Translate the Morse set cells to the cubical complex all at once
+    cells = list(morse_node_cells)
+    cubical_cells = dict(zip(cells, stg.blowup2cubical_array(cells).tolist()))
     # Get the vertices and list of edges in the SCC, where the vertices
     # are represented by a dictionary of the form index: [coords, shape]
     morse_node_vertices = {}
@@ -68,13 +75,15 @@ def MorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=True):
             morse_node_edges.add((cell1_index, cell2_index))
     return morse_node_vertices, morse_node_edges
 
-def PlotMorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=True, label_type='cell', rankdir='TB'):
+def PlotMorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=True, label_type='cell', rankdir='TB',
+                       grading_index=None):
     """Plot the subgraph of the STG corresponding to the SCC of morse_node."""
     # Check that label_type is valid
     if label_type not in ['cell', 'index']:
         raise ValueError('Invalid label_type value')
     # Get Morse node component graph
-    vertices, edges = MorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=blowup)
+    vertices, edges = MorseComponent(morse_graph, stg, graded_complex, morse_node, blowup=blowup,
+                                     grading_index=grading_index)
     # Graphviz node shape and margin
     shape = 'ellipse'
     margin = '0.0, 0.04'
@@ -8,13 +8,17 @@ from matplotlib.collections import PatchCollection
 from collections import defaultdict
 import numpy as np
 
+from DSGRN_utils.CubicalTables import fringe_tables
+
 def PlotMorseSets(morse_graph, stg, graded_complex, morse_nodes=None, proj_dims=None, proj_slice=None,
                   cmap=None, clist=None, alpha=0.7, plot_bdry_cells=True, plot_arrows=True,
                   plot_self_arrows=True, plot_verts=True, plot_edges=True, arrow_clr='blue',
                   double_arrow_clr='red', self_arrow_clr='red', fig_w=7, fig_h=7, plot_axis=False,
                   axis_labels=True, xlabel='$x$', ylabel='$y$', fontsize=15, ax=None, fig_fname=None,
-                  dpi=300):
-    """Plot Morse sets and the state transition graph"""
+                  dpi=300, grading_index=None):
+    """Plot Morse sets and the state transition graph. If the GradingIndex used
+    to build morse_graph is given the cell gradings are read from it.
+    """
     # Cells line width
     line_width = 2
     # Cells edge color
@@ -49,22 +53,20 @@ def PlotMorseSets(morse_graph, stg, graded_complex, morse_nodes=None, proj_dims=
 
     def fringe_cell(cell):
         """Check if a cell is a fringe cell"""
-        return cell_complex.rightfringe(cell)
+        return fringe.fringe[cell]
+
+    def cell_grading(cell):
+        """Return the grading value of a top cell"""
+        if grading_index is not None:
+            return grading_index.grade(cell)
+        return graded_complex.value(cell)
 
     def boundary_cell(cell):
         """Check if a cell is a boundary cell"""
-        # Fringe cells are not boundary cells
-        if fringe_cell(cell):
-            return False
-        # A vertex is boundary if any of its star is a fringe cell
-        if cell_complex.cell_dim(cell) == 0:
-            return any(cell_complex.rightfringe(c) for c in cell_complex.star({cell}))
-        # Other cells are boundary if any of their boundaries is a face of a fringe cell
-        for cell_bdry in cell_complex.boundary({cell}):
-            # It is a boundary cell if any of its boundaries is a face of a fringe cell
-            if any(cell_complex.rightfringe(c) for c in cell_complex.star({cell_bdry})):
-                return True
-        return False
+        # Fringe cells are not boundary cells. A vertex is boundary if any
+        # of its star is a fringe cell and other cells are boundary if any of
+        # their boundaries is a face of a fringe cell (see FringeTables)
+        return fringe.near_fringe[cell] and not fringe.fringe[cell]
 
     def allowed_cell(cell):
         """Check if a top cell is allowed (to be plotted)"""
@@ -93,8 +95,8 @@ def PlotMorseSets(morse_graph, stg, graded_complex, morse_nodes=None, proj_dims=
            the set of cells with the same projection and this representative cell is
            then used to determine the face color of the projected cell."""
         # Get the gradings for both cells
-        cell1_grading = graded_complex.value(cell1)
-        cell2_grading = graded_complex.value(cell2)
+        cell1_grading = cell_grading(cell1)
+        cell2_grading = cell_grading(cell2)
         # Return the other cell if not a Morse graph vertex
         if cell2_grading not in vertex_indices:
             return cell1
@@ -209,6 +211,8 @@ def PlotMorseSets(morse_graph, stg, graded_complex, morse_nodes=None, proj_dims=
         proj_slice[d2] = -1
     # Get the cubical cell complex
     cell_complex = graded_complex.complex()
+    # Fringe and boundary masks of the complex (shared by every parameter)
+    fringe = fringe_tables(tuple(cell_complex.boxes()))
     # Get indexing of the Morse graph vertices from the labels
     # vertex_index = lambda v: int(morse_graph.vertex_label(v).split(':')[0].strip())
     # vertex_indices = {v: vertex_index(v) for v in morse_graph.vertices()}
@@ -264,11 +268,11 @@ def PlotMorseSets(morse_graph, stg, graded_complex, morse_nodes=None, proj_dims=
         # Get cell vertices
         cell_verts = cell_vertices(cell)
         # Get the cell grading
-        cell_grading = graded_complex.value(cell)
+        grading = cell_grading(cell)
         # Get face as a tuple of vertices
         cell_face = tuple(cell_verts)
         # Get the face color
-        face_clr = face_color(cell_grading)
+        face_clr = face_color(grading)
         # Add vertices to the set of cell complex vertices
         cell_complex_vertices.update(cell_verts)
         # Plot face as a polygon and add to polygon patches
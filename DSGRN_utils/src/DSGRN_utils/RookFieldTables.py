@@ -0,0 +1,154 @@
+### RookFieldTables.py
+### MIT LICENSE 2024 Marcio Gameiro
+
+import numpy as np
+
+class RookFieldTables:
+    """Batched evaluation of the wall labels and of the rook field.
+
+    Given the cell tables of the cubical complex X (see `CubicalTables.py`)
+    and a wall labelling, compute at once:
+
+        wall_labels : (num_positions, dim, 2) int8 array with the label of the
+                      left (index 0) and right (index 1) n-wall of every top
+                      cell of X, indexed by the position of the top cell
+        rook        : (nnz, dim) int8 array with the rook field Phi(xi, mu) for
+                      every cell xi and every top cell mu in its (non-fringe)
+                      top star, aligned with the top star CSR arrays
+        gradient    : (ncells,) bitmask of the gradient directions of each cell
+        opaque      : (ncells,) bitmask of the opaque directions of each cell
+        equilibrium : (ncells,) bool array of the equilibrium cells
+        active      : (ncells, dim) array whose entry [xi, n] is the bitmask of
+                      the directions k actively regulated by n at xi
+
+    The gradient, opaque, equilibrium and active regulation data are
+    reductions over the rook tensor.
+    """
+
+    def __init__(self, tables, labelling, num_thresholds):
+        self.tables = tables
+        self.dim = tables.dim
+        # Bit lists of the direction bitmasks (same as the essential
+        # directions of a shape)
+        self.directions = tables.essential
+        # Index of the first top cell of the cubical complex
+        self.top_offset = tables.shape_offset[tables.top_shape]
+        # Wall labels of the top cells
+        self.wall_labels = self._wall_label_table(np.asarray(labelling, dtype=np.uint64), num_thresholds)
+        # Rook field of every cell with respect to its top star
+        self.rook = self._rook_field_table()
+        self.gradient, self.opaque = self._direction_masks()
+        self.equilibrium = ~tables.fringe & (self.gradient == 0)
+        self.active = self._active_regulation_table()
+
+    def _wall_label_table(self, labelling, num_thresholds):
+        dim = self.dim
+        top_cells = slice(self.top_offset, self.top_offset + self.tables.num_positions)
+        coords = self.tables.coords[top_cells].astype(np.int64)
+        limits = np.array([k + 1 for k in num_thresholds], dtype=np.int64)
+        # Place values of the labelling (which indexes only the top cells of X)
+        pv = np.cumprod(np.concatenate(([1], limits[:-1])))
+        # Consider all walls of fringe layer cells absorbing
+        fringe_layer = np.any(coords == limits, axis=1)
+        label_index = np.where(fringe_layer, 0, coords @ pv)
+        labels = labelling[label_index]
+        wall_labels = np.empty((len(coords), dim, 2), dtype=np.int8)
+        for n in range(dim):
+            left_absorbing = ((labels >> np.uint64(n)) & np.uint64(1)).astype(bool) | fringe_layer
+            right_absorbing = ((labels >> np.uint64(n + dim)) & np.uint64(1)).astype(bool) | fringe_layer
+            wall_labels[:, n, 0] = np.where(left_absorbing, -1, 1)
+            wall_labels[:, n, 1] = np.where(right_absorbing, 1, -1)
+        return wall_labels
+
+    def _rook_field_table(self):
+        tables = self.tables
+        counts = np.diff(tables.top_star_ptr)
+        # Cell and top cell of every entry of the top star
+        self.rows = np.repeat(np.arange(tables.num_cells, dtype=np.int64), counts)
+        top_cells = tables.top_star_idx.astype(np.int64)
+        top_positions = top_cells - self.top_offset
+        cell_coords = tables.coords[self.rows]
+        top_coords = tables.coords[top_cells]
+        cell_shape = tables.shape[self.rows]
+        rook = np.empty((len(top_cells), self.dim), dtype=np.int8)
+        for n in range(self.dim):
+            left = self.wall_labels[top_positions, n, 0]
+            right = self.wall_labels[top_positions, n, 1]
+            # Inessential directions: the label of the wall containing the cell
+            on_right = cell_coords[:, n] != top_coords[:, n]
+            inessential_value = np.where(on_right, right, left)
+            # Essential directions: the common label of both walls, if any
+            essential_value = np.where(left == right, left, 0)
+            essential = ((cell_shape >> n) & 1).astype(bool)
+            rook[:, n] = np.where(essential, essential_value, inessential_value)
+        return rook
+
+    def _direction_masks(self):
+        tables = self.tables
+        gradient = np.zeros(tables.num_cells, dtype=np.int64)
+        opaque = np.zeros(tables.num_cells, dtype=np.int64)
+        nonempty = np.flatnonzero(np.diff(tables.top_star_ptr))
+        if len(nonempty) == 0:
+            return gradient, opaque
+        starts = tables.top_star_ptr[nonempty]
+        rook_min = np.minimum.reduceat(self.rook, starts, axis=0)
+        rook_max = np.maximum.reduceat(self.rook, starts, axis=0)
+        rook_zeros = np.add.reduceat((self.rook == 0).astype(np.int32), starts, axis=0)
+        # Gradient: every value is -1 or every value is 1
+        is_gradient = (rook_min == rook_max) & (rook_min != 0)
+        # Opaque: the set of values is exactly {-1, 1}
+        is_opaque = (rook_min == -1) & (rook_max == 1) & (rook_zeros == 0)
+        bits = np.left_shift(1, np.arange(self.dim, dtype=np.int64))
+        gradient[nonempty] = is_gradient.astype(np.int64) @ bits
+        opaque[nonempty] = is_opaque.astype(np.int64) @ bits
+        return gradient, opaque
+
+    def _active_regulation_table(self):
+        tables = self.tables
+        active = np.zeros((tables.num_cells, self.dim), dtype=np.int64)
+        # Key of every (cell, top cell) entry of the top star
+        keys = self.rows * tables.num_positions + (tables.top_star_idx - self.top_offset)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        bits = np.left_shift(1, np.arange(self.dim, dtype=np.int64))
+        for n in range(self.dim):
+            # The n-adjacent top cell to the right of each entry (non-fringe
+            # top cells never sit on the last layer, so there is no wrap)
+            partner_keys = keys + tables.jump[n]
+            pos = np.minimum(np.searchsorted(sorted_keys, partner_keys), len(keys) - 1)
+            found = np.flatnonzero(sorted_keys[pos] == partner_keys)
+            if len(found) == 0:
+                continue
+            partners = order[pos[found]]
+            disagree = (self.rook[found] != self.rook[partners]).astype(np.int64) @ bits
+            np.bitwise_or.at(active[:, n], self.rows[found], disagree)
+        return active
+
+    def wall_label(self, cc_top_cell, n, side):
+        """Return the label of the left (side -1) or right (side 1) n-wall of a top cell"""
+        return int(self.wall_labels[cc_top_cell - self.top_offset, n, 0 if side == -1 else 1])
+
+    def rook_field_component(self, cc_cell, cc_top_cell, n):
+        """Return the n-th component of the rook field of cc_cell with respect to cc_top_cell"""
+        labels = self.wall_labels[cc_top_cell - self.top_offset, n]
+        if self.tables.shape[cc_cell] & (1 << n):
+            return int(labels[0]) if labels[0] == labels[1] else 0
+        if self.tables.coords[cc_cell, n] == self.tables.coords[cc_top_cell, n]:
+            return int(labels[0])
+        return int(labels[1])
+
+    def rook_field(self, cc_cell):
+        """Return the (len(top_star), dim) block of the rook tensor for cc_cell"""
+        return self.rook[self.tables.top_star_ptr[cc_cell]:self.tables.top_star_ptr[cc_cell + 1]]
+
+    def gradient_directions(self, cc_cell):
+        """Return the list of gradient directions of cc_cell"""
+        return self.directions[self.gradient[cc_cell]]
+
+    def opaque_directions(self, cc_cell):
+        """Return the list of opaque directions of cc_cell"""
+        return self.directions[self.opaque[cc_cell]]
+
+    def active_regulation(self, cc_cell, n, k):
+        """Return True if the direction n actively regulates the direction k at cc_cell"""
+        return bool(self.active[cc_cell, n] & (1 << k))
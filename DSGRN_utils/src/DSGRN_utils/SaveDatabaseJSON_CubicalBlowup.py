@@ -10,11 +10,14 @@
 import DSGRN
 from pychomp import *
 import DSGRN_utils
+from DSGRN_utils.CubicalTables import fringe_tables
 # from CubicalBlowupGraph import *
 # from Poset_E import *
+import hashlib
 import itertools
 import numpy as np
 import json
+import os
 
 def network_json(network):
     # Return json data for network
@@ -68,16 +71,21 @@ def parameter_graph_json(parameter_graph, vertices=None, verts_colors=None, thre
     return parameter_graph_json_data
 
 
+def blowup_fringe_mask(fc_stg):
+    # Return the (shared) mask of the cells of the blowup complex that are
+    # left out of the json data: the cells with a fringe cell in their star or
+    # in the star of one of their boundary cells. It depends only on the grid
+    # size, so it is computed once for all parameters of a network
+    return fringe_tables(tuple(fc_stg.blowup_complex.boxes())).near_fringe
+
+
 def blowup_cc_complex_json(fc_stg):
     """Return json data for the blowup cubical complex."""
 
+    near_fringe = blowup_fringe_mask(fc_stg)
+
     def fringe_cell_fc(c):
-        if any(fc_stg.blowup_complex.rightfringe(s) for s in fc_stg.blowup_complex.star({c})):
-            return True
-        for b in fc_stg.blowup_complex.boundary({c}):
-            if any(fc_stg.blowup_complex.rightfringe(s) for s in fc_stg.blowup_complex.star({b})):
-                return True
-        return False
+        return near_fringe[c]
 
     # Get complex dimension
     dimension = fc_stg.dim
@@ -217,18 +225,17 @@ def morse_graph_json(CMG, connection_matrix):
     return morse_graph_json_data
 
 
-def morse_sets_json(fc_stg, CMG, fibration):
+def morse_sets_json(fc_stg, CMG, fibration, grading_index=None):
     # Return json data for Morse sets
     # CMG: Conley Morse graph
+    # grading_index: GradingIndex of the fibration (read the top cells of
+    # each Morse set from it instead of scanning the complex)
     vert_index = {v: k for k, v in enumerate(CMG.vertices())}
 
+    near_fringe = blowup_fringe_mask(fc_stg)
+
     def fringe_cell_fc(c):
-        if any(fc_stg.blowup_complex.rightfringe(s) for s in fc_stg.blowup_complex.star({c})):
-            return True
-        for b in fc_stg.blowup_complex.boundary({c}):
-            if any(fc_stg.blowup_complex.rightfringe(s) for s in fc_stg.blowup_complex.star({b})):
-                return True
-        return False
+        return near_fringe[c]
 
     def non_fringe_top_cell(c):
         if fringe_cell_fc(c):
@@ -244,7 +251,10 @@ def morse_sets_json(fc_stg, CMG, fibration):
 
     morse_sets_data = []  # Morse sets data
     for u in CMG.vertices():
-        fiber = [c for c in fibration.complex() if fibration.value(c) == u]
+        if grading_index is not None:
+            fiber = grading_index.cells(u).tolist()
+        else:
+            fiber = [c for c in fibration.complex() if fibration.value(c) == u]
         morse_cells = [c for c in fiber if non_fringe_top_cell(c)]
         morse_node = vert_index[u]
         morse_set = {"index": morse_node, "cells": morse_cells}
@@ -256,15 +266,10 @@ def morse_sets_json(fc_stg, CMG, fibration):
 def state_transition_graph_json(fc_stg):
     # Return json data for state transiton graph
 
+    near_fringe = blowup_fringe_mask(fc_stg)
+
     def fringe_cell_fc(c):
-        # if fc_stg.blowup_complex.rightfringe(c):
-        #     return True
-        if any(fc_stg.blowup_complex.rightfringe(s) for s in fc_stg.blowup_complex.star({c})):
-            return True
-        for b in fc_stg.blowup_complex.boundary({c}):
-            if any(fc_stg.blowup_complex.rightfringe(s) for s in fc_stg.blowup_complex.star({b})):
-                return True
-        return False
+        return near_fringe[c]
 
     stg = []  # State transition graph
     for S in fc_stg.blowup_complex(fc_stg.dim):
@@ -278,8 +283,53 @@ def state_transition_graph_json(fc_stg):
     return stg_json_data
 
 
+def database_header_json(network, parameter_graph, param_indices, verts_colors=None,
+                         thres_type=None, legacy=False):
+    # Return json data shared by all parameters: network, blowup complex
+    # and parameter graph
+    parameter = parameter_graph.parameter(param_indices[0])
+    morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=0, legacy=legacy)
+    # fc_stg = CubicalBlowupGraph(parameter, level=0)  # level = 0 for construction
+    fc_stg = stg
+    network_json_data = network_json(network)
+    cell_complex_json_data = blowup_cc_complex_json(fc_stg)
+    param_graph_json_data = parameter_graph_json(parameter_graph, param_indices, verts_colors, thres_type)
+    return {"network": network_json_data["network"],
+            "complex": cell_complex_json_data["complex"],
+            "parameter_graph": param_graph_json_data["parameter_graph"]}
+
+
+def parameter_dynamics_json(parameter_graph, par_index, level=4, legacy=False):
+    # Return json data for the dynamics of one parameter
+    # Compute DSGRN Plus dynamics. The steps of ConleyMorseGraph are run here
+    # so that the graded complex and connection matrix are computed once
+    parameter = parameter_graph.parameter(par_index)
+    fc_stg = DSGRN_utils.CubicalBlowupGraph(parameter, level=level, legacy=legacy)
+    (dag, fibration) = FlowGradedComplex(fc_stg.complex(), fc_stg.adjacencies())
+    connection_matrix = ConnectionMatrix(fibration)
+    grading_index = DSGRN_utils.GradingIndex(fc_stg, fibration)
+    CMG = DSGRN_utils.MorseGraph(fc_stg, dag, fibration, connection_matrix,
+                                 grading_index=grading_index)
+    return dynamics_json(par_index, fc_stg, CMG, connection_matrix, fibration, grading_index)
+
+
+def dynamics_json(par_index, fc_stg, CMG, connection_matrix, fibration, grading_index=None):
+    # Return json data for the dynamics of one parameter from its computed
+    # state transition graph, Morse graph, connection matrix and fibration
+    morse_graph_json_data = morse_graph_json(CMG, connection_matrix)
+    morse_sets_json_data = morse_sets_json(fc_stg, CMG, fibration, grading_index)
+    stg_json_data = state_transition_graph_json(fc_stg)
+    # Dynamics data for this parameter
+    return {"parameter": par_index,
+            "morse_graph": morse_graph_json_data["morse_graph"],
+            "morse_sets": morse_sets_json_data["morse_sets"],
+            "stg": stg_json_data["stg"]}
+
+
 def save_morse_graph_database_json(network, database_fname, param_indices=None,
                                    verts_colors=None, thres_type=None, level=4, legacy=False):
+    # Save the database as a single json object. Every parameter is held in
+    # memory until the end; see save_morse_graph_database_jsonl for large sweeps
     net_spec = network.specification()
     network = DSGRN.Network(net_spec, edge_blowup='none')
     parameter_graph = DSGRN.ParameterGraph(network)
@@ -287,55 +337,121 @@ def save_morse_graph_database_json(network, database_fname, param_indices=None,
     if param_indices == None:
         param_indices = range(parameter_graph.size())
 
-    par_index = param_indices[0]
-    parameter = parameter_graph.parameter(par_index)
-    morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=0, legacy=legacy)
-    # fc_stg = CubicalBlowupGraph(parameter, level=0)  # level = 0 for construction
-    fc_stg = stg
-    network_json_data = network_json(network)
-    cell_complex_json_data = blowup_cc_complex_json(fc_stg)
-    param_graph_json_data = parameter_graph_json(parameter_graph, param_indices, verts_colors, thres_type)
-
-    dynamics_database = []  # Dynamics database
-    for par_index in param_indices:
-        # Compute DSGRN Plus dynamics
-        parameter = parameter_graph.parameter(par_index)
-        if fc_stg.dim == 2:
-            morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=level, legacy=legacy)
-            fc_stg = stg
-            # fc_stg = CubicalBlowupGraph(parameter, level=level)
-        else:
-            morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=level, legacy=legacy)
-            fc_stg = stg
-            # fc_stg = CubicalBlowupGraph(parameter, level=level)
-        (dag, fibration) = FlowGradedComplex(fc_stg.complex(), fc_stg.adjacencies())
-        connection_matrix = ConnectionMatrix(fibration)
-        # conley_indices = connection_matrix.count()
-        fringenode = fibration.value(fc_stg.complex().size() - 1)
-        # A Morse set is trivial if it is a single cell with no self edge
-        # Get all non-trivial Morse sets (including the ones with trivial CI)
-
-        def non_trivial_scc(v):
-            scc_v = [c for c in fc_stg.digraph.vertices()
-                     if fibration.value(c) == v]
-            return len(scc_v) > 1 or any(c in fc_stg.digraph.adjacencies(c) for c in scc_v)
-        # CMG = InducedPoset_E(dag, lambda v: non_trivial_scc(v) and v != fringenode)
-        CMG = morse_graph
-        morse_graph_json_data = morse_graph_json(CMG, connection_matrix)
-        morse_sets_json_data = morse_sets_json(fc_stg, CMG, fibration)
-        stg_json_data = state_transition_graph_json(fc_stg)
-        # Dynamics data for this parameter
-        dynamics_json_data = {"parameter": par_index,
-                              "morse_graph": morse_graph_json_data["morse_graph"],
-                              "morse_sets": morse_sets_json_data["morse_sets"],
-                              "stg": stg_json_data["stg"]}
-        dynamics_database.append(dynamics_json_data)
-
-    morse_graph_database = {"network": network_json_data["network"],
-                            "complex": cell_complex_json_data["complex"],
-                            "parameter_graph": param_graph_json_data["parameter_graph"],
-                            "dynamics_database": dynamics_database}
+    morse_graph_database = database_header_json(network, parameter_graph, param_indices,
+                                                verts_colors, thres_type, legacy)
+    morse_graph_database["dynamics_database"] = [
+        parameter_dynamics_json(parameter_graph, par_index, level, legacy)
+        for par_index in param_indices]
 
     # Save database to a file
     with open(database_fname, 'w') as outfile:
         json.dump(morse_graph_database, outfile)
+
+
+def save_morse_graph_database_jsonl(network, database_fname, param_indices=None,
+                                    verts_colors=None, thres_type=None, level=4, legacy=False,
+                                    resume=True):
+    """Save the database as JSON Lines, one parameter at a time.
+
+    The first line holds the network, blowup complex and parameter graph and
+    each following line the dynamics of one parameter (the entries of
+    "dynamics_database" in save_morse_graph_database_json), written as soon
+    as the parameter is done. Nothing but the current parameter is held in
+    memory. With resume=True the parameters already in the file are skipped,
+    so an interrupted export is finished by rerunning the same call; a call
+    with another level, legacy flag or set of parameters raises ValueError.
+    """
+    net_spec = network.specification()
+    network = DSGRN.Network(net_spec, edge_blowup='none')
+    parameter_graph = DSGRN.ParameterGraph(network)
+
+    if param_indices == None:
+        param_indices = range(parameter_graph.size())
+
+    write_database_jsonl(
+        database_fname, network, param_indices,
+        lambda: database_header_json(network, parameter_graph, param_indices,
+                                     verts_colors, thres_type, legacy),
+        lambda par_index: parameter_dynamics_json(parameter_graph, par_index, level, legacy),
+        resume=resume, settings={"level": level, "legacy": legacy})
+
+
+def parameter_set_json(param_indices):
+    """Return json data identifying a set of parameter indices: the range
+    itself for a range, otherwise its size and a digest of the sorted set"""
+    if isinstance(param_indices, range):
+        return {"range": [param_indices.start, param_indices.stop, param_indices.step]}
+    indices = sorted(set(param_indices))
+    digest = hashlib.blake2b(json.dumps(indices).encode(), digest_size=16).hexdigest()
+    return {"count": len(indices), "digest": digest}
+
+
+def write_database_jsonl(database_fname, network, param_indices, header, dynamics, resume=True,
+                         settings=None):
+    """Write a JSON Lines database (see save_morse_graph_database_jsonl).
+
+    `header()` returns the json data of the first line and `dynamics(par_index)`
+    the json data of a parameter. Each line is flushed when written, so the
+    file is the checkpoint: on resume the complete lines are kept, a line cut
+    short by an interrupted run is dropped and the remaining parameters are
+    appended.
+
+    The first line also records `settings` (the options the dynamics are
+    computed with, such as the level) and the set of parameters, under
+    "settings". Resuming a database written for another network, other
+    settings or other parameters raises ValueError.
+    """
+    settings = dict(settings or {}, parameters=parameter_set_json(param_indices))
+    stored_header, done = database_jsonl_progress(database_fname) if resume else (None, set())
+    if stored_header is not None:
+        if stored_header["network"] != network_json(network)["network"]:
+            raise ValueError('Database ' + str(database_fname) + ' belongs to a different network.')
+        if stored_header.get("settings") != settings:
+            raise ValueError('Database ' + str(database_fname) + ' was written with other settings '
+                             'or parameters.')
+    with open(database_fname, 'w' if stored_header is None else 'a') as outfile:
+        if stored_header is None:
+            outfile.write(json.dumps(dict(header(), settings=settings)) + '\n')
+            outfile.flush()
+        for par_index in param_indices:
+            if par_index in done:
+                continue
+            outfile.write(json.dumps(dynamics(par_index)) + '\n')
+            outfile.flush()
+
+
+def database_jsonl_progress(database_fname):
+    """Return the header of a JSON Lines database (None if there is none yet)
+    and the set of parameters already written. A last line left incomplete
+    by an interrupted run is removed from the file."""
+    header, done = None, set()
+    if not os.path.exists(database_fname):
+        return header, done
+    with open(database_fname, 'rb+') as infile:
+        # Length of the complete lines read so far
+        end = 0
+        for line in infile:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if header is None:
+                header = record
+            else:
+                done.add(record["parameter"])
+            end += len(line)
+        infile.truncate(end)
+    return header, done
+
+
+def load_morse_graph_database_jsonl(database_fname):
+    """Read a JSON Lines database back into the layout of the single json
+    object written by save_morse_graph_database_json"""
+    with open(database_fname) as infile:
+        morse_graph_database = json.loads(next(infile))
+        morse_graph_database.pop("settings", None)
+        morse_graph_database["dynamics_database"] = [
+            json.loads(line) for line in infile if line.endswith('\n')]
+    return morse_graph_database
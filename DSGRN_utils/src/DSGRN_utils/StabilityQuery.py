@@ -1,19 +1,31 @@
 ### StabilityQuery.py
 ### MIT LICENSE 2024 Marcio Gameiro
 
-import DSGRN
 import DSGRN_utils
 from collections import defaultdict
 
-def StabilityQuery(network, param_indices=None, level=4):
-    parameter_graph = DSGRN.ParameterGraph(network)
-    if param_indices == None:
-        param_indices = range(parameter_graph.size())
+def StabilityQuery(network, param_indices=None, level=4, workers=1, chunk_size=64, cache=None,
+                   fast=False):
+    """Return a dict mapping a number of attractors to the set of parameters
+    with that many attractors. The Morse graphs are computed in a pool of
+    worker processes, chunk_size parameters at a time, and read from and
+    added to cache, a DSGRN_utils.QueryCache, when one is given.
+
+    With fast=True the attractors are counted by NumberOfAttractors, from the
+    SCCs of the state transition graph alone, and the counts are not added
+    to cache. They differ from those of the Morse graph only if an SCC that
+    is trivial by the rule of MorseGraph (prune_grad=True) carries a
+    nontrivial Conley index.
+    """
+    if fast:
+        counts = DSGRN_utils.AttractorCounts(network, param_indices, level=level, workers=workers,
+                                             chunk_size=chunk_size, cache=cache)
+    else:
+        counts = ((par_index, DSGRN_utils.signature_num_stable(signature))
+                  for par_index, signature in DSGRN_utils.MorseGraphSignatures(
+                      network, param_indices, level=level, workers=workers,
+                      chunk_size=chunk_size, cache=cache))
     param_stability = defaultdict(set)
-    for par_index in param_indices:
-        parameter = parameter_graph.parameter(par_index)
-        morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(parameter, level=level)
-        attractors = [v for v in morse_graph.vertices() if not morse_graph.adjacencies(v)]
-        n_stable = len(attractors)
+    for par_index, n_stable in counts:
         param_stability[n_stable].add(par_index)
     return param_stability
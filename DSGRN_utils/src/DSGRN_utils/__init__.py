@@ -4,12 +4,16 @@
 import DSGRN
 import pychomp
 
+from DSGRN_utils.CubicalTables import *
+from DSGRN_utils.RookFieldTables import *
 from DSGRN_utils.CubicalBlowupGraph import *
+from DSGRN_utils.GradingIndex import *
 from DSGRN_utils.MorseGraph import *
 from DSGRN_utils.PlotMorseGraph import *
 from DSGRN_utils.PlotMorseSets import *
 from DSGRN_utils.ComputeMorseGraph import *
 from DSGRN_utils.PlotMorseComponent import *
+from DSGRN_utils.MorseGraphQuery import *
 from DSGRN_utils.StabilityQuery import *
 from DSGRN_utils.IsomorphismQuery import *
 from DSGRN_utils.WallLabelling import *
@@ -14,8 +14,10 @@ Companion code for ``paper/Rook_Field_Paper_v2``.  Three jobs:
 """
 
 from .blowup import SpecCubicalBlowupGraph
-from .pipeline import MorseResult, conley_morse_graph
+from .cache import ResultCache
+from .pipeline import MorseResult, conley_morse_graph, conley_morse_graphs
 from .spec import ALL_SPECS, ISOLATED, LEGACY, PAPER, Spec, by_name
+from .sweeps import Summary, SweepCursor, sweep
 
 __all__ = [
     "ALL_SPECS",
@@ -23,10 +25,15 @@ __all__ = [
     "LEGACY",
     "PAPER",
     "MorseResult",
+    "ResultCache",
     "Spec",
     "SpecCubicalBlowupGraph",
+    "Summary",
+    "SweepCursor",
     "by_name",
     "conley_morse_graph",
+    "conley_morse_graphs",
+    "sweep",
 ]
 
 __version__ = "0.1.0"
@@ -27,7 +27,7 @@ import itertools
 
 import numpy as np
 
-from .blowup import SpecCubicalBlowupGraph
+from .blowup import SharedCellData, SpecCubicalBlowupGraph
 from .geometrization import RectangularGeometrization
 from .ramp import RampSystem
 from .spec import PAPER, Spec
@@ -105,12 +105,21 @@ def check_alignment(
     level: int = 1,
     samples_per_axis: int = 3,
     outer: str = "global_bound",
+    shared: SharedCellData | None = None,
 ) -> AlignmentReport:
-    """Test ``recG`` against the ramp field over every element of ``N(F_level)``."""
+    """Test ``recG`` against the ramp field over every element of ``N(F_level)``.
+
+    ``shared`` carries the pair verdicts over from other levels and specs of
+    the same system (see ``blowup.SharedCellData``).
+    """
     geo = RectangularGeometrization(system)
     labelling, num_thresholds = system.wall_labelling(outer=outer)
     stg = SpecCubicalBlowupGraph(
-        labelling=labelling, num_thresholds=num_thresholds, spec=spec, level=level
+        labelling=labelling,
+        num_thresholds=num_thresholds,
+        spec=spec,
+        level=level,
+        shared=shared,
     )
 
     bc = stg.blowup_complex
@@ -143,15 +152,15 @@ def check_alignment(
             intervals = geo.rectangle(list(coords), [1] * dim)
             face_value = geo.embed_coordinate(n, coords[n] + 1)
             points = _sample_face(intervals, n, face_value, samples_per_axis)
-            signed = [required_sign * float(system.vector_field(p)[n]) for p in points]
+            signed = required_sign * system.vector_field(np.array(points))[:, n]
             walls.append(
                 WallCheck(
                     source=cell,
                     target=neighbour,
                     direction=n,
                     required_sign=required_sign,
-                    min_signed=min(signed),
-                    max_signed=max(signed),
+                    min_signed=float(signed.min()),
+                    max_signed=float(signed.max()),
                     samples=len(points),
                     location=tuple(float(v) for v in points[0]),
                 )
@@ -205,10 +214,15 @@ def main(argv=None) -> int:
         for h in widths:
             sp = spec if h is None else spec.with_uniform_width(h)
             system = RampSystem(sp)
+            shared = SharedCellData()
             for level in (1, 2, 3):
                 for algo in (LEGACY, PAPER):
                     report = check_alignment(
-                        system, spec=algo, level=level, samples_per_axis=args.samples
+                        system,
+                        spec=algo,
+                        level=level,
+                        samples_per_axis=args.samples,
+                        shared=shared,
                     )
                     tag = "published" if h is None else f"{h:g}"
                     out.append(
@@ -6,21 +6,31 @@ Each toggle in :mod:`rookfields.spec` is measured on its own, so a difference
 can be attributed to a single divergence rather than to the bundle.  For every
 (network, level, spec) we record how many parameters change their state
 transition graph, their Morse-graph node count, or their Conley indices.
+
+``--jobs N`` spreads the sweep over ``N`` processes.  The unit of work is a
+chunk of parameter indices at every level: the worker runs the ``legacy``
+baseline and every spec for each index and level and sends back only
+signatures and diagnostics, which the parent folds into the same
+:class:`Divergence` rows a serial run produces.
 """
 
 from __future__ import annotations
 
 import argparse
 import dataclasses
+import hashlib
 import json
 import random
 import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
 from . import networks
-from .blowup import SpecCubicalBlowupGraph
-from .pipeline import conley_morse_graph
+from .blowup import SharedCellData, SpecCubicalBlowupGraph
+from .pipeline import conley_morse_graph, conley_morse_graphs
 from .spec import ISOLATED, LEGACY, PAPER, Spec
 
 REPORTS = Path(__file__).resolve().parents[2] / "reports"
@@ -38,6 +48,10 @@ DEFAULT_FAMILIES: list[tuple[str, int | None]] = [
 
 DEFAULT_LEVELS = (1, 2, 3, 4)
 
+#: Chunks per worker process and (network, level): small enough to balance
+#: parameters of very different cost, large enough to amortise the pickling.
+CHUNKS_PER_WORKER = 4
+
 
 @dataclasses.dataclass
 class Divergence:
@@ -64,32 +78,61 @@ def sample_indices(name: str, size: int | None, seed: int) -> list[int]:
     return sorted(random.Random(seed).sample(range(total), size))
 
 
+@dataclasses.dataclass(frozen=True)
+class EdgeDigest:
+    """An STG edge set reduced to its size and a 128-bit BLAKE2b digest.
+
+    Equal digests mean equal edge sets up to a hash collision; a baseline of a
+    few thousand parameters is then kilobytes instead of millions of tuples.
+    The audit only counts mismatches; rebuilding the two graphs of a
+    parameter recovers the edges that differ.
+    """
+
+    count: int
+    digest: bytes
+
+
+def edge_array(stg) -> np.ndarray:
+    """STG edges ``(u, v)`` encoded as ``u * ncells + v``, sorted, int64."""
+    ncells = stg.complex().size()
+    adjacencies = stg.digraph.adjacencies
+    codes = np.fromiter(
+        (u * ncells + v for u in stg.digraph.vertices() for v in adjacencies(u)),
+        dtype=np.int64,
+    )
+    codes.sort()
+    return codes
+
+
+def edge_digest(stg) -> EdgeDigest:
+    codes = edge_array(stg)
+    return EdgeDigest(len(codes), hashlib.blake2b(codes.tobytes(), digest_size=16).digest())
+
+
 def _signature(result) -> tuple:
-    """What we compare: STG edges, Morse nodes, Conley indices."""
+    """What we compare: STG edges (as an :class:`EdgeDigest`), Morse nodes, Conley indices."""
     return (
-        frozenset(result.stg.digraph.edges()),
+        edge_digest(result.stg),
         tuple(result.nodes),
         tuple(sorted(result.conley_indices.items())),
     )
 
 
-def compare(
+def _tally(
     name: str,
     indices: list[int],
     level: int,
     spec: Spec,
     baseline: dict[int, tuple],
+    outcomes: dict[int, tuple[tuple, Counter]],
 ) -> Divergence:
-    net = networks.network(name)
+    """Fold per-parameter ``(signature, diagnostics)`` into one row."""
     diagnostics: Counter = Counter()
     stg_changed = nodes_changed = conley_changed = 0
 
     for i in indices:
-        result = conley_morse_graph(
-            networks.parameter(name, i), spec=spec, level=level
-        )
-        diagnostics.update(result.diagnostics)
-        edges, nodes, conley = _signature(result)
+        (edges, nodes, conley), counts = outcomes[i]
+        diagnostics.update(counts)
         b_edges, b_nodes, b_conley = baseline[i]
         if edges != b_edges:
             stg_changed += 1
@@ -100,7 +143,7 @@ def compare(
 
     return Divergence(
         network=name,
-        dim=net.size(),
+        dim=networks.network(name).size(),
         level=level,
         spec=spec.name,
         sampled=len(indices),
@@ -111,6 +154,78 @@ def compare(
     )
 
 
+def compare(
+    name: str,
+    indices: list[int],
+    level: int,
+    spec: Spec,
+    baseline: dict[int, tuple],
+) -> Divergence:
+    outcomes = {}
+    for i in indices:
+        result = conley_morse_graph(
+            networks.parameter(name, i), spec=spec, level=level
+        )
+        outcomes[i] = (_signature(result), result.diagnostics)
+    return _tally(name, indices, level, spec, baseline, outcomes)
+
+
+def _is_legacy(spec: Spec) -> bool:
+    """Same toggles as ``LEGACY``, whatever the name."""
+    return spec.replace(name=LEGACY.name) == LEGACY
+
+
+def _audit_chunk(name: str, levels, indices: list[int], specs: list[Spec]) -> list[tuple]:
+    """Baseline and every spec at every level for a chunk of parameters.
+
+    Returns ``(index, {level: (baseline signature, [(signature, diagnostics)
+    per spec])})`` for each index.  The STGs of one parameter are built
+    together (``pipeline.conley_morse_graphs``) and share their pair verdicts
+    across levels (``blowup.SharedCellData``); a spec with the legacy toggles
+    reuses the baseline run.
+    """
+    distinct = [spec for spec in specs if not _is_legacy(spec)]
+    out = []
+    for i in indices:
+        source = {"parameter": networks.parameter(name, i)}
+        shared = SharedCellData()
+        by_level = {}
+        for level in levels:
+            results = conley_morse_graphs(
+                **source, specs=[LEGACY, *distinct], level=level, shared=shared
+            )
+            stg = results[0].stg
+            source = {"labelling": stg.labelling, "num_thresholds": stg.num_thresholds}
+            base, *rest = [(_signature(r), Counter(r.diagnostics)) for r in results]
+            rest = iter(rest)
+            by_level[level] = (
+                base[0],
+                [base if _is_legacy(spec) else next(rest) for spec in specs],
+            )
+        out.append((i, by_level))
+    return out
+
+
+def _chunks(indices: list[int], jobs: int) -> list[list[int]]:
+    """Split ``indices`` into contiguous chunks, ``CHUNKS_PER_WORKER`` per job."""
+    if jobs <= 1:
+        return [indices] if indices else []
+    size = max(1, -(-len(indices) // (jobs * CHUNKS_PER_WORKER)))
+    return [indices[k : k + size] for k in range(0, len(indices), size)]
+
+
+def _merge_suppression(name: str, level: int, parts: list[dict]) -> dict:
+    """Sum the per-chunk counts of :func:`unstable_edge_suppression`.
+
+    No parts (an empty sample) gives the zero row.
+    """
+    merged = unstable_edge_suppression(name, [], level)
+    for part in parts:
+        for key in ("sampled", "cells_with_nonempty_U", "missing_U_edges", "parameters_affected"):
+            merged[key] += part[key]
+    return merged
+
+
 def unstable_edge_suppression(name: str, indices: list[int], level: int) -> dict:
     """D3: does the cascade ever drop a ``U(xi)`` edge the definition demands?
 
@@ -156,31 +271,55 @@ def run(
     levels=DEFAULT_LEVELS,
     specs=None,
     seed: int = 20260728,
+    jobs: int = 1,
 ) -> dict:
     specs = specs or {**ISOLATED, "paper": PAPER}
+    spec_list = list(specs.values())
     rows: list[Divergence] = []
     suppression: list[dict] = []
     started = time.time()
 
-    for name, size in families:
-        indices = sample_indices(name, size, seed)
-        print(f"[audit] {name}: {len(indices)} parameters, dim {networks.network(name).size()}")
-        for level in levels:
-            baseline = {}
-            for i in indices:
-                baseline[i] = _signature(
-                    conley_morse_graph(networks.parameter(name, i), spec=LEGACY, level=level)
-                )
-            for spec in specs.values():
-                row = compare(name, indices, level, spec, baseline)
-                rows.append(row)
-                print(
-                    f"    level={level} {spec.name:24s} "
-                    f"stg={row.stg_changed:4d} nodes={row.morse_nodes_changed:4d} "
-                    f"conley={row.conley_changed:4d}"
-                )
-            if level >= 3:
-                suppression.append(unstable_edge_suppression(name, indices, level))
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    submit = pool.submit if pool else _Deferred
+    try:
+        for name, size in families:
+            indices = sample_indices(name, size, seed)
+            print(f"[audit] {name}: {len(indices)} parameters, dim {networks.network(name).size()}")
+            chunks = _chunks(indices, jobs)
+            # Queue the whole network at once so no worker idles while the
+            # parent prints a level.
+            sweeps = [submit(_audit_chunk, name, levels, chunk, spec_list) for chunk in chunks]
+            checks = {
+                level: [submit(unstable_edge_suppression, name, chunk, level) for chunk in chunks]
+                for level in levels
+                if level >= 3
+            }
+            swept = [row for future in sweeps for row in future.result()]
+            for level in levels:
+                baseline = {}
+                outcomes: list[dict] = [{} for _ in spec_list]
+                for i, by_level in swept:
+                    base, per_spec = by_level[level]
+                    baseline[i] = base
+                    for k, outcome in enumerate(per_spec):
+                        outcomes[k][i] = outcome
+                for spec, spec_outcomes in zip(spec_list, outcomes):
+                    row = _tally(name, indices, level, spec, baseline, spec_outcomes)
+                    rows.append(row)
+                    print(
+                        f"    level={level} {spec.name:24s} "
+                        f"stg={row.stg_changed:4d} nodes={row.morse_nodes_changed:4d} "
+                        f"conley={row.conley_changed:4d}"
+                    )
+                if level in checks:
+                    suppression.append(
+                        _merge_suppression(
+                            name, level, [future.result() for future in checks[level]]
+                        )
+                    )
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
 
     return {
         "generated_seconds": time.time() - started,
@@ -190,6 +329,19 @@ def run(
     }
 
 
+class _Deferred:
+    """Stand-in for a future that runs when asked, so a serial run shares the
+    parallel code path.  Every level of a network is swept before any of its
+    rows is printed."""
+
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+
+    def result(self):
+        return self._fn(*self._args)
+
+
 # ---------------------------------------------------------------------------
 # reporting
 # ---------------------------------------------------------------------------
@@ -329,6 +481,12 @@ def main(argv=None) -> int:
     parser.add_argument("--sample", type=int, default=None, help="override sample size")
     parser.add_argument("--level", action="append", type=int, help="restrict to these levels")
     parser.add_argument("--seed", type=int, default=20260728)
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for the parameter sweep (default: 1, serial)",
+    )
     parser.add_argument("--out", type=Path, default=REPORTS / "divergence.md")
     parser.add_argument("--json", type=Path, default=REPORTS / "divergence.json")
     args = parser.parse_args(argv)
@@ -340,7 +498,7 @@ def main(argv=None) -> int:
         families = [(n, args.sample) for n, _ in DEFAULT_FAMILIES]
     levels = tuple(args.level) if args.level else DEFAULT_LEVELS
 
-    data = run(families=families, levels=levels, seed=args.seed)
+    data = run(families=families, levels=levels, seed=args.seed, jobs=args.jobs)
 
     args.out.parent.mkdir(parents=True, exist_ok=True)
     args.out.write_text(render(data))
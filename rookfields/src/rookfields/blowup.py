@@ -30,9 +30,14 @@ Manuscript sources (``paper/Rook_Field_Paper_v2``):
 
 from __future__ import annotations
 
+import dataclasses
+import functools
 import itertools
-from collections import Counter
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 from DSGRN_utils.CubicalBlowupGraph import CubicalBlowupGraph
 
 from .spec import PAPER, Spec
@@ -47,9 +52,25 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
 
     Diagnostics are accumulated in ``self.diagnostics`` (a ``Counter``) during
     construction so the audit can attribute differences without re-running the
-    computation.
+    computation.  ``tables=True`` is passed through to the base class: cell
+    geometry is then read from shared NumPy tables rather than pychomp.
+
+    ``workers > 1`` builds the map in a process pool, one slab of blowup top
+    cells at a time (see :meth:`_compute_in_slabs`).  The graph, diagnostics
+    and pair lists are the same as for the serial build.  The edges are
+    replayed into the parent's graph, so a parallel build costs more CPU in
+    total than a serial one and only pays off with idle cores.
+
+    ``shared`` is a :class:`SharedCellData` for graphs of the same wall
+    labelling under several specs; see :func:`build_spec_graphs`.
+    ``geometry`` is a :class:`GridGeometry` for graphs of many wall labellings
+    on the same grid; see :func:`iter_labelling_graphs`.
     """
 
+    #: Slabs per worker process in a parallel build; more, smaller slabs even
+    #: out the cost of slabs that are mostly fringe.
+    SLABS_PER_WORKER = 4
+
     def __init__(
         self,
         parameter=None,
@@ -59,8 +80,20 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         num_thresholds=None,
         level: int = 4,
         strict_intersection: bool = False,
+        tables: bool = False,
+        workers: int = 1,
+        shared: SharedCellData | None = None,
+        geometry: GridGeometry | None = None,
     ):
         self.spec = spec
+        self.workers = workers
+        self.shared = shared
+        self.geometry = geometry
+        # flow_direction of every pair, from geometry; see GridGeometry.pair_flows
+        self._pair_flows: dict | None = None
+        # Per-graph memo lookups made by a verdict being recorded into
+        # ``shared`` (see _shared_verdict); None when not recording.
+        self._touched: list | None = None
         self.diagnostics: Counter = Counter()
         #: (face, coface) pairs where two conditions demanded opposite
         #: orientations, so the definition leaves no edge between them.
@@ -69,6 +102,9 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         self.out_of_range_pairs: list = []
         #: cells where prop:back_wall_well_defined fails empirically.
         self.back_wall_disagreements: list = []
+        # Cells behind diagnostics["regulation_map_multivalued"]; the regulation
+        # map is memoised per cell, so parallel slabs may both compute it.
+        self._multivalued_cells: set = set()
         super().__init__(
             parameter=parameter,
             labelling=labelling,
@@ -79,8 +115,170 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
             # class flag only matters for code paths we do not override.
             legacy=(spec.regulation_codomain == "all"),
             strict_intersection=strict_intersection,
+            tables=tables,
+        )
+
+    # ------------------------------------------------------------------
+    # spec-independent data shared between specs
+    # ------------------------------------------------------------------
+
+    def _init_cell_data(self):
+        if self.geometry is not None and tuple(self.num_thresholds) != self.geometry.num_thresholds:
+            raise ValueError("GridGeometry belongs to a different grid")
+        if self.shared is None or not self.shared.attach(self):
+            super()._init_cell_data()
+            if self.shared is not None:
+                self.shared.capture(self)
+        if self.shared is not None:
+            self._regulation = self.shared.regulation_for(self.spec)
+            self._verdicts = self.shared.verdicts_for(self.spec) if self.shared.record_verdicts else None
+
+    def active_regulation_map(self, cc_cell):
+        if self._touched is not None:
+            self._touched.append((SpecCubicalBlowupGraph.active_regulation_map, cc_cell))
+        if self.shared is None:
+            return super().active_regulation_map(cc_cell)
+        # Regulation maps are shared by the graphs of specs reading o_xi the
+        # same way.  The multivalued count is per graph: it is bumped the
+        # first time this graph asks for such a cell, as when computing it.
+        reg_maps, multivalued = self._regulation
+        cached = reg_maps.get(cc_cell)
+        if cached is None:
+            cached = self.compute_active_regulation_map(cc_cell)
+            reg_maps[cc_cell] = cached
+            if cc_cell in self._multivalued_cells:
+                multivalued.add(cc_cell)
+        elif cc_cell in multivalued and cc_cell not in self._multivalued_cells:
+            self.diagnostics["regulation_map_multivalued"] += 1
+            self._multivalued_cells.add(cc_cell)
+        return cached
+
+    def semi_opaque_cell(self, cc_cell):
+        if self._touched is not None:
+            self._touched.append((SpecCubicalBlowupGraph.semi_opaque_cell, cc_cell))
+        return super().semi_opaque_cell(cc_cell)
+
+    def _shared_verdict(self, table, key, compute, *args):
+        """``compute(*args)``, memoised in ``shared`` for every graph of this
+        spec (any level), with its side effects replayed on a hit.
+
+        The side effects are the diagnostics, the pair lists and the
+        per-graph memo lookups (regulation map, semi-opaque), so a graph built
+        from memoised verdicts reports exactly what a fresh build does.
+        """
+        if self._verdicts is None:
+            return compute(*args)
+        cache = self._verdicts[table]
+        hit = cache.get(key)
+        if hit is not None:
+            verdict, counts, out_of_range, disagreements, touched = hit
+            self.diagnostics.update(counts)
+            self.out_of_range_pairs.extend(out_of_range)
+            self.back_wall_disagreements.extend(disagreements)
+            for method, cell in touched:
+                method(self, cell)
+            return verdict
+        before = Counter(self.diagnostics)
+        num_out_of_range = len(self.out_of_range_pairs)
+        num_disagreements = len(self.back_wall_disagreements)
+        self._touched = touched = []
+        try:
+            verdict = compute(*args)
+        finally:
+            self._touched = None
+        counts = self.diagnostics - before
+        # Replayed through the regulation map lookups instead
+        counts.pop("regulation_map_multivalued", None)
+        cache[key] = (
+            verdict,
+            counts,
+            self.out_of_range_pairs[num_out_of_range:],
+            self.back_wall_disagreements[num_disagreements:],
+            touched,
+        )
+        return verdict
+
+    def unstable_cells(self, cc_cell, non_trivial_cycles):
+        if self.shared is None:
+            return super().unstable_cells(cc_cell, non_trivial_cycles)
+        # A function of the cell, the cycles and the rook field only
+        key = (cc_cell, tuple(tuple(cycle) for cycle in non_trivial_cycles))
+        cached = self.shared.unstable.get(key)
+        if cached is None:
+            cached = super().unstable_cells(cc_cell, non_trivial_cycles)
+            self.shared.unstable[key] = cached
+        return cached
+
+    def cyclic_extension_direction(self, cc_cell1, cc_cell2):
+        if self.shared is None:
+            return super().cyclic_extension_direction(cc_cell1, cc_cell2)
+        return self._shared_verdict(
+            "cyclic_extension",
+            (cc_cell1, cc_cell2),
+            super().cyclic_extension_direction,
+            cc_cell1,
+            cc_cell2,
         )
 
+    def flow_direction(self, cc_cell1, cc_cell2):
+        key = (cc_cell1, cc_cell2)
+        if self.geometry is not None and self.rook_tables is not None:
+            if self._pair_flows is None:
+                self._pair_flows = self.geometry.pair_flows(self)
+            cached = self._pair_flows.get(key)
+            if cached is not None:
+                return cached
+        if self.shared is None:
+            return super().flow_direction(cc_cell1, cc_cell2)
+        cached = self.shared.flow.get(key)
+        if cached is None:
+            cached = super().flow_direction(cc_cell1, cc_cell2)
+            self.shared.flow[key] = cached
+        return cached
+
+    def gradient_opaque_pair(self, cc_face, cc_coface):
+        if self.shared is None:
+            return super().gradient_opaque_pair(cc_face, cc_coface)
+        key = (cc_face, cc_coface)
+        cached = self.shared.go_pairs.get(key)
+        if cached is None:
+            cached = super().gradient_opaque_pair(cc_face, cc_coface)
+            self.shared.go_pairs[key] = cached
+        return cached
+
+    def parallel_neighbors(self, cell):
+        if self.geometry is not None:
+            table = self.geometry.neighbors
+        elif self.shared is not None:
+            table = self.shared.neighbors
+        else:
+            return super().parallel_neighbors(cell)
+        cached = table.get(cell)
+        if cached is None:
+            cached = super().parallel_neighbors(cell)
+            table[cell] = cached
+        return cached
+
+    def cell_pairs(self, cell):
+        """``(cc_cell, pairs)`` for a blowup top cell: its cubical cell, and
+        ``(cell2, fringe, fringe2, cc_cell2)`` for each right neighbour
+        ``cell2``, with the fringe flags of both cells.
+
+        Geometry only, so kept in ``geometry`` when there is one.
+        """
+        table = self.geometry.pairs if self.geometry is not None else None
+        cached = table.get(cell) if table is not None else None
+        if cached is None:
+            fringe = self.blowup_complex.rightfringe(cell)
+            pairs = tuple(
+                (cell2, fringe, self.blowup_complex.rightfringe(cell2), self.blowup2cubical(cell2))
+                for cell2 in self.parallel_neighbors(cell)
+            )
+            cached = (self.blowup2cubical(cell), pairs)
+            if table is not None:
+                table[cell] = cached
+        return cached
+
     # ------------------------------------------------------------------
     # D1 -- the regulation map o_xi
     # ------------------------------------------------------------------
@@ -94,7 +292,7 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         ``DSGRN_utils`` lets the target range over all N directions, which is
         the retired ``def:active_regulation-old``.
         """
-        coords = self.cubical_complex.coordinates(cc_cell)
+        coords = self.coordinates(cc_cell)
         inessential = self.inessential_directions(cc_cell)
 
         if self.spec.regulation_domain == "interior":
@@ -118,6 +316,7 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
                 # take the last, which is what the DSGRN_utils dict
                 # comprehension (CubicalBlowupGraph.py:308) does.
                 self.diagnostics["regulation_map_multivalued"] += 1
+                self._multivalued_cells.add(cc_cell)
             reg_map[n] = hits[-1]
         return reg_map
 
@@ -127,7 +326,7 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
 
     def in_boundary(self, cc_cell) -> bool:
         """``xi in bdy(X)``: some inessential direction sits at an outer end."""
-        coords = self.cubical_complex.coordinates(cc_cell)
+        coords = self.coordinates(cc_cell)
         return any(
             coords[n] == 0 or coords[n] == self.limits[n]
             for n in self.inessential_directions(cc_cell)
@@ -142,7 +341,7 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         enforced as well.
         """
         if self.spec.semi_opaque_guard == "explicit":
-            if self.cubical_complex.cell_dim(cc_cell) == self.dim:
+            if self.cell_dim(cc_cell) == self.dim:
                 return False
             if self.in_boundary(cc_cell):
                 return False
@@ -180,7 +379,7 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         The condition under which every member of ``Back(xi, xi')`` is a cell of
         ``X`` (``issues/source-defects.md``, critical path B3).
         """
-        coords = self.cubical_complex.coordinates(cc_coface)
+        coords = self.coordinates(cc_coface)
         return all(
             1 <= coords[j] <= self.num_thresholds[j]
             for j in self.inessential_directions(cc_coface)
@@ -193,8 +392,8 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         ``r_n in R_n(xi)`` for ``n in J_i(xi')``; ``DSGRN_utils`` uses the single
         coherent choice realised by ``top_star(xi)[0]``.
         """
-        face_coords = self.cubical_complex.coordinates(cc_face)
-        coface_coords = self.cubical_complex.coordinates(cc_coface)
+        face_coords = self.coordinates(cc_face)
+        coface_coords = self.coordinates(cc_coface)
         side = -1 if face_coords[n_opaque] == coface_coords[n_opaque] else 1
         directions = self.inessential_directions(cc_coface)
 
@@ -290,6 +489,19 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         Returns ``-1`` to remove ``face -> coface``, ``+1`` to remove
         ``coface -> face``, ``0`` for no constraint.
         """
+        if self.shared is None:
+            return self._decision_wall_direction(cc_cell1, cc_cell2)
+        # Conditions 2.1 and 4.1 differ, so levels 2-3 and level 4 do not
+        # share verdicts.
+        return self._shared_verdict(
+            "decision_wall",
+            (cc_cell1, cc_cell2, self.level >= 4),
+            self._decision_wall_direction,
+            cc_cell1,
+            cc_cell2,
+        )
+
+    def _decision_wall_direction(self, cc_cell1, cc_cell2):
         if cc_cell1 < cc_cell2:
             cc_face, cc_coface, face_sign = cc_cell1, cc_cell2, 1
         else:
@@ -330,6 +542,17 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
 
     def condition_3_1_direction(self, cc_cell1, cc_cell2):
         """``defn:Rule3.1``: remove ``xi -> xi'`` when ``Ex(xi, xi') subset S_sigma``."""
+        if self.shared is None:
+            return self._condition_3_1_direction(cc_cell1, cc_cell2)
+        return self._shared_verdict(
+            "condition_3_1",
+            (cc_cell1, cc_cell2),
+            self._condition_3_1_direction,
+            cc_cell1,
+            cc_cell2,
+        )
+
+    def _condition_3_1_direction(self, cc_cell1, cc_cell2):
         if cc_cell1 < cc_cell2:
             cc_face, cc_coface, face_sign = cc_cell1, cc_cell2, 1
         else:
@@ -356,15 +579,15 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         """
         cc = self.cubical_complex
         for cc_coface in cc:
-            if cc.rightfringe(cc_coface):
+            if self.rightfringe(cc_coface):
                 continue
-            coface_dim = cc.cell_dim(cc_coface)
+            coface_dim = self.cell_dim(cc_coface)
             if codim is not None and coface_dim != codim[1]:
                 continue
             for cc_face in cc.boundary({cc_coface}):
-                if cc.rightfringe(cc_face):
+                if self.rightfringe(cc_face):
                     continue
-                if codim is not None and cc.cell_dim(cc_face) != codim[0]:
+                if codim is not None and self.cell_dim(cc_face) != codim[0]:
                     continue
                 go_pair = self.gradient_opaque_pair(cc_face, cc_coface)
                 if not go_pair:
@@ -385,7 +608,7 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         cc = self.cubical_complex
         out = []
         for cell in cc(0):
-            if cc.rightfringe(cell):
+            if self.rightfringe(cell):
                 continue
             cycles = self.nontrivial_cycles(cell)
             if len(cycles) == 1 and len(cycles[0]) == 3:
@@ -397,10 +620,61 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
     # ------------------------------------------------------------------
 
     def compute_multivalued_map(self):
+        if self.workers > 1:
+            return self._compute_in_slabs()
         if self.spec.f3_composition == "cascade":
             return super().compute_multivalued_map()
         return self._compute_intersect_union()
 
+    def _compute_in_slabs(self):
+        """Build the map in parallel, one slab of blowup top cells per task.
+
+        Every decision about a pair ``(cell, right neighbour)`` depends only on
+        cells near the pair and on the labelling, and is taken once, by the
+        slab owning the left cell; a slab therefore also reads the first layer
+        of its right neighbour (its halo).  Likewise ``U(xi)`` is added by the
+        slab owning the blowup image of ``xi``.  Slabs are runs of consecutive
+        top-cell indices, i.e. slabs along the last blowup coordinate.
+
+        The edges of each slab are recorded in order and replayed into
+        ``self.digraph`` in the order the serial build adds them, so even the
+        iteration order of the adjacency sets -- and with it the numbering of
+        the Morse nodes -- is unchanged.
+        """
+        tables = self.blowup_tables
+        num_slabs = min(tables.num_positions, self.workers * self.SLABS_PER_WORKER)
+        bounds = np.linspace(0, tables.num_positions, num_slabs + 1).astype(int).tolist()
+        kwargs = dict(
+            labelling=list(self.labelling),
+            num_thresholds=list(self.num_thresholds),
+            spec=self.spec,
+            level=self.level,
+            strict_intersection=self.strict_intersection,
+            tables=self.tables is not None,
+        )
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_slab_worker, initargs=(kwargs,)
+        ) as pool:
+            slabs = list(pool.map(_slab_map, zip(bounds, bounds[1:])))
+
+        for slab in slabs:
+            for u, v in slab["edges"].tolist():
+                self.digraph.add_edge(u, v)
+        # U(xi) is added cell by cell in cubical order after all the pairs
+        unstable = np.concatenate([slab["unstable_edges"] for slab in slabs])
+        order = np.argsort(self.blowup2cubical_array(unstable[:, 0]), kind="stable")
+        for u, v in unstable[order].tolist():
+            self.digraph.add_edge(u, v)
+
+        for slab in slabs:
+            self.diagnostics.update(slab["diagnostics"])
+            self.conflicting_pairs.extend(slab["conflicting_pairs"])
+            self.out_of_range_pairs.extend(slab["out_of_range_pairs"])
+            self.back_wall_disagreements.extend(slab["back_wall_disagreements"])
+            self._multivalued_cells.update(slab["multivalued_cells"])
+        if self._multivalued_cells:
+            self.diagnostics["regulation_map_multivalued"] = len(self._multivalued_cells)
+
     def _compute_intersect_union(self):
         """``F_i`` as an intersection of refinements, then a union with ``U``.
 
@@ -414,16 +688,14 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
         use_decision_wall = self.level > 1
         use_cycles = self.level > 2
 
-        for cell1 in self.blowup_complex(self.dim):
-            cc_cell1 = self.blowup2cubical(cell1)
+        for cell1 in self._blowup_top_cells():
+            cc_cell1, pairs = self.cell_pairs(cell1)
 
             # Condition 1.1: the self-arrow survives only at equilibrium cells.
             if self.spec.self_edges and self.equilibrium_cell(cc_cell1):
                 self.digraph.add_edge(cell1, cell1)
 
-            for cell2 in self.parallel_neighbors(cell1):
-                fringe1 = self.blowup_complex.rightfringe(cell1)
-                fringe2 = self.blowup_complex.rightfringe(cell2)
+            for cell2, fringe1, fringe2, cc_cell2 in pairs:
                 if fringe1:
                     self.digraph.add_edge(cell1, cell2)
                 if fringe2:
@@ -431,8 +703,6 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
                 if fringe1 or fringe2:
                     continue
 
-                cc_cell2 = self.blowup2cubical(cell2)
-
                 flow = self.flow_direction(cc_cell1, cc_cell2)
                 verdicts = [flow]
                 # See CubicalBlowupGraph.compute_paper_multivalued_map: every
@@ -469,8 +739,8 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
 
     def _add_unstable_cells(self):
         """Union with ``U(xi)``, applied to every cell rather than per pair."""
-        for cc_cell in self.cubical_complex:
-            if self.cubical_complex.rightfringe(cc_cell):
+        for cc_cell in self._cubical_cells():
+            if self.rightfringe(cc_cell):
                 continue
             targets = self.unstable_targets(cc_cell)
             if not targets:
@@ -479,3 +749,446 @@ class SpecCubicalBlowupGraph(CubicalBlowupGraph):
             for cc_target in targets:
                 self.digraph.add_edge(source, self.cubical2blowup(cc_target))
                 self.diagnostics["unstable_edge"] += 1
+
+
+class SharedCellData:
+    """What the graphs of one wall labelling have in common across specs.
+
+    None of the toggles in :mod:`rookfields.spec` touches the rook field, the
+    gradient, opaque and equilibrium data, the flow direction ``F_1`` of a
+    pair, its GO-pairs or the neighbours of a blowup cell; they only change
+    the regulation map (D1, D4) and how the verdicts are combined (D2, D3).
+    The first graph built with a ``SharedCellData`` fills it, every later one
+    reads from it.
+
+    Spec-dependent data is shared too, between the graphs that read it the
+    same way: regulation maps by the D1 toggles, and the pair verdicts of
+    Conditions 2.1/4.1 and 3.1 by the whole spec, across levels.  A level
+    sweep therefore evaluates each verdict once and the later levels only
+    reassemble the digraph.  The semi-opaque memo table stays per graph.
+    Recording the verdicts only pays off when a spec is built more than
+    once; ``record_verdicts=False`` skips it.
+    """
+
+    #: Memo tables of ``CubicalBlowupGraph`` that depend only on the cell and
+    #: the labelling.
+    CELL_CACHES = (
+        "_top_star_cache",
+        "_star_cache",
+        "_rook_component_cache",
+        "_gradient_cache",
+        "_opaque_cache",
+        "_equilibrium_cache",
+    )
+
+    def __init__(self, record_verdicts: bool = True):
+        self.record_verdicts = record_verdicts
+        self.key = None
+        self.rook_tables = None
+        self.cell_caches: dict[str, dict] = {}
+        #: ``flow_direction`` by ``(cc_cell1, cc_cell2)``.
+        self.flow: dict = {}
+        #: ``gradient_opaque_pair`` by ``(cc_face, cc_coface)``.
+        self.go_pairs: dict = {}
+        #: ``parallel_neighbors`` by blowup cell.
+        self.neighbors: dict = {}
+        #: ``unstable_cells`` by ``(cc_cell, cycles)``.
+        self.unstable: dict = {}
+        #: ``(regulation maps, multivalued cells)`` by the D1 toggles.
+        self.regulation: dict[tuple, tuple[dict, set]] = {}
+        #: Recorded pair verdicts by spec (name aside) and verdict kind.
+        self.verdicts: dict[Spec, dict[str, dict]] = {}
+
+    @staticmethod
+    def _key(graph) -> tuple:
+        return (tuple(graph.labelling), tuple(graph.num_thresholds), graph.tables is not None)
+
+    def capture(self, graph) -> None:
+        """Take over the freshly initialised cell data of the first graph."""
+        self.key = self._key(graph)
+        self.rook_tables = graph.rook_tables
+        self.cell_caches = {name: getattr(graph, name) for name in self.CELL_CACHES}
+
+    def regulation_for(self, spec: Spec) -> tuple[dict, set]:
+        key = (spec.regulation_domain, spec.regulation_codomain)
+        return self.regulation.setdefault(key, ({}, set()))
+
+    def verdicts_for(self, spec: Spec) -> dict[str, dict]:
+        key = dataclasses.replace(spec, name="")
+        return self.verdicts.setdefault(
+            key, {"decision_wall": {}, "condition_3_1": {}, "cyclic_extension": {}}
+        )
+
+    def attach(self, graph) -> bool:
+        """Point ``graph`` at the shared data; ``False`` if there is none yet."""
+        if self.key is None:
+            return False
+        if self._key(graph) != self.key:
+            raise ValueError("SharedCellData belongs to a different wall labelling")
+        graph.rook_tables = self.rook_tables
+        for name, cache in self.cell_caches.items():
+            setattr(graph, name, cache)
+        graph._reg_map_cache = {}
+        graph._semi_opaque_cache = {}
+        return True
+
+
+class GridGeometry:
+    """What the graphs of every wall labelling on one grid have in common.
+
+    The neighbours of each blowup top cell, and the pairs ``(cell, right
+    neighbour)`` the map is decided on with their fringe flags and cubical
+    cells (see :meth:`SpecCubicalBlowupGraph.cell_pairs`), depend only on
+    ``num_thresholds``.  The first graph built with a ``GridGeometry`` fills
+    it in, every later one reads from it.  The cell tables of ``tables=True``
+    are shared per grid already.
+    """
+
+    def __init__(self, num_thresholds):
+        self.num_thresholds = tuple(num_thresholds)
+        #: ``parallel_neighbors`` by blowup cell.
+        self.neighbors: dict = {}
+        #: ``cell_pairs`` by blowup cell.
+        self.pairs: dict = {}
+        self._flow_terms = None
+
+    def pair_flows(self, graph) -> dict:
+        """``flow_direction`` of every non-fringe pair of ``graph``, by
+        ``(cc_cell1, cc_cell2)``, evaluated at once from its wall labels.
+
+        ``F_1`` on a pair is decided, for each top cell ``mu`` over the
+        coface, by the labels of the walls of ``mu`` containing the face in
+        the extension directions.  Which walls those are is geometry, so it
+        is worked out once per grid; a labelling only looks its labels up.
+        Needs ``tables=True``.
+        """
+        if self._flow_terms is None:
+            self._flow_terms = self._compile_flow_terms(graph)
+        keys, signs, pair_of_top, top_of_term, positions, directions, sides = self._flow_terms
+        labels = graph.rook_tables.wall_labels[positions, directions, (sides + 1) // 2]
+        exits = labels == sides
+        # Every extension direction is an exit (-1), an entrance (1), or neither
+        num_tops = len(pair_of_top)
+        not_exit = np.bincount(top_of_term, weights=~exits, minlength=num_tops) > 0
+        not_entrance = np.bincount(top_of_term, weights=exits, minlength=num_tops) > 0
+        top_flow = np.where(~not_exit, -1, np.where(~not_entrance, 1, 0))
+        num_pairs = len(keys)
+        not_exit = np.bincount(pair_of_top, weights=top_flow != -1, minlength=num_pairs) > 0
+        not_entrance = np.bincount(pair_of_top, weights=top_flow != 1, minlength=num_pairs) > 0
+        flows = np.where(~not_exit, -signs, np.where(~not_entrance, signs, 0))
+        return dict(zip(keys, flows.tolist()))
+
+    def _compile_flow_terms(self, graph) -> tuple:
+        """The walls :meth:`pair_flows` reads, as index arrays over the
+        pairs, the top cells over each coface, and their extension
+        directions (see ``CubicalBlowupGraph.flow_direction_top_cell``)."""
+        top_offset = graph.rook_tables.top_offset
+        keys, signs, pair_of_top, top_of_term, positions, directions, sides = ([] for _ in range(7))
+        for cell in graph.blowup_complex(graph.dim):
+            cc_cell, pairs = graph.cell_pairs(cell)
+            for _, fringe, fringe2, cc_cell2 in pairs:
+                if fringe or fringe2:
+                    continue
+                if cc_cell < cc_cell2:
+                    cc_face, cc_coface, sign = cc_cell, cc_cell2, 1
+                else:
+                    cc_face, cc_coface, sign = cc_cell2, cc_cell, -1
+                face_coords = graph.coordinates(cc_face)
+                for cc_top_cell in graph.top_star(cc_coface):
+                    top_coords = graph.coordinates(cc_top_cell)
+                    for n in graph.extension_directions(cc_face, cc_coface):
+                        top_of_term.append(len(pair_of_top))
+                        positions.append(cc_top_cell - top_offset)
+                        directions.append(n)
+                        sides.append(-1 if face_coords[n] == top_coords[n] else 1)
+                    pair_of_top.append(len(keys))
+                keys.append((cc_cell, cc_cell2))
+                signs.append(sign)
+        return (
+            keys,
+            np.array(signs, dtype=np.int64),
+            np.array(pair_of_top, dtype=np.int64),
+            np.array(top_of_term, dtype=np.int64),
+            np.array(positions, dtype=np.int64),
+            np.array(directions, dtype=np.int64),
+            np.array(sides, dtype=np.int64),
+        )
+
+
+def iter_spec_graphs(
+    specs,
+    parameter=None,
+    *,
+    labelling=None,
+    num_thresholds=None,
+    level: int = 4,
+    strict_intersection: bool = False,
+    tables: bool = False,
+    shared: SharedCellData | None = None,
+    geometry: GridGeometry | None = None,
+):
+    """Yield one ``SpecCubicalBlowupGraph`` per spec, in order, sharing the
+    spec-independent work (see :class:`SharedCellData`).
+
+    Each graph is the one ``SpecCubicalBlowupGraph`` builds on its own.  A
+    graph is only built when asked for, so a caller that is done with one
+    graph can let it go before the next is built.  Pass ``shared`` to keep
+    sharing with graphs built elsewhere for the same labelling, and
+    ``geometry`` to share with graphs of other labellings on the same grid.
+    """
+    return _iter_graphs(
+        [(spec, level) for spec in specs],
+        parameter,
+        labelling=labelling,
+        num_thresholds=num_thresholds,
+        strict_intersection=strict_intersection,
+        tables=tables,
+        shared=shared,
+        geometry=geometry,
+    )
+
+
+def iter_level_graphs(
+    levels=(1, 2, 3, 4),
+    parameter=None,
+    *,
+    spec: Spec = PAPER,
+    labelling=None,
+    num_thresholds=None,
+    strict_intersection: bool = False,
+    tables: bool = False,
+    shared: SharedCellData | None = None,
+    geometry: GridGeometry | None = None,
+):
+    """Yield the graph of ``F_level`` for each level, in order, for one spec.
+
+    ``F_1`` is computed once: the flow direction of every pair, and every
+    Condition 2.1, 4.1 and 3.1 verdict, is evaluated by the first level that
+    needs it and read back by the later ones (see :class:`SharedCellData`).
+    Each graph is the one ``SpecCubicalBlowupGraph`` builds on its own.
+    """
+    return _iter_graphs(
+        [(spec, level) for level in levels],
+        parameter,
+        labelling=labelling,
+        num_thresholds=num_thresholds,
+        strict_intersection=strict_intersection,
+        tables=tables,
+        shared=shared,
+        geometry=geometry,
+    )
+
+
+def _iter_graphs(
+    configs, parameter, *, labelling, num_thresholds, strict_intersection, tables, shared, geometry
+):
+    # A single graph has nothing to share, and the verdicts of a spec are
+    # only read back by a later graph of the same spec
+    if shared is None and len(configs) > 1:
+        verdict_keys = {dataclasses.replace(spec, name="") for spec, _ in configs}
+        shared = SharedCellData(record_verdicts=len(verdict_keys) < len(configs))
+    for spec, level in configs:
+        graph = SpecCubicalBlowupGraph(
+            parameter,
+            spec=spec,
+            labelling=labelling,
+            num_thresholds=num_thresholds,
+            level=level,
+            strict_intersection=strict_intersection,
+            tables=tables,
+            shared=shared,
+            geometry=geometry,
+        )
+        # The parameter is converted to a labelling once
+        parameter, labelling, num_thresholds = None, graph.labelling, graph.num_thresholds
+        yield graph
+
+
+def build_spec_graphs(specs, parameter=None, **kwargs) -> list[SpecCubicalBlowupGraph]:
+    """The graphs of :func:`iter_spec_graphs` as a list."""
+    return list(iter_spec_graphs(specs, parameter, **kwargs))
+
+
+def build_level_graphs(levels=(1, 2, 3, 4), parameter=None, **kwargs) -> dict[int, SpecCubicalBlowupGraph]:
+    """The graphs of :func:`iter_level_graphs`, by level."""
+    levels = list(levels)
+    return dict(zip(levels, iter_level_graphs(levels, parameter, **kwargs)))
+
+
+def iter_labelling_graphs(
+    labellings: Iterable,
+    num_thresholds,
+    specs=(PAPER,),
+    *,
+    level: int = 4,
+    strict_intersection: bool = False,
+    tables: bool = True,
+    geometry: GridGeometry | None = None,
+) -> Iterator[list[SpecCubicalBlowupGraph]]:
+    """Yield the graphs of :func:`build_spec_graphs` for each wall labelling
+    on the grid ``num_thresholds``, in order.
+
+    The geometry of the grid is computed by the first labelling and shared by
+    the rest (see :class:`GridGeometry`), as are the cell tables with
+    ``tables=True``, the default here.  A labelling's graphs are built when
+    asked for, so a sweep over many labellings holds one list at a time.
+    """
+    if geometry is None:
+        geometry = GridGeometry(num_thresholds)
+    for labelling in labellings:
+        yield build_spec_graphs(
+            specs,
+            labelling=list(labelling),
+            num_thresholds=list(num_thresholds),
+            level=level,
+            strict_intersection=strict_intersection,
+            tables=tables,
+            geometry=geometry,
+        )
+
+
+def map_labellings(
+    predicate: Callable[[list[SpecCubicalBlowupGraph]], object],
+    labellings: Iterable,
+    num_thresholds,
+    specs=(PAPER,),
+    *,
+    workers: int = 1,
+    chunk_size: int = 256,
+    max_pending: int | None = None,
+    **kwargs,
+) -> Iterator:
+    """Yield ``predicate(graphs)`` for each labelling, in order, with the
+    graphs of :func:`iter_labelling_graphs`.
+
+    Only what ``predicate`` returns is kept, so it can be a check such as
+    "has a double edge" over tens of thousands of labellings.  A serial call
+    shares one :class:`GridGeometry` across its labellings and drops it when
+    done.  With ``workers > 1`` chunks of ``chunk_size`` labellings go to a
+    process pool, each worker keeping the geometry of the last few grids it
+    saw; ``predicate`` must then be picklable.  Labellings are drawn a chunk
+    at a time with at most ``max_pending`` chunks (default twice the
+    workers) in flight, as in :func:`rookfields.sweeps.sweep`.  Other keyword
+    arguments are those of :func:`iter_labelling_graphs`.
+    """
+    if workers <= 1:
+        for graphs in iter_labelling_graphs(labellings, num_thresholds, specs, **kwargs):
+            yield predicate(graphs)
+        return
+    from .sweeps import _pipelined
+
+    run = functools.partial(_map_chunk, predicate, list(num_thresholds), tuple(specs), kwargs)
+    iterator = iter(labellings)
+    chunks = iter(lambda: [list(x) for x in itertools.islice(iterator, chunk_size)], [])
+    pending: deque = deque()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for _, results in _pipelined(pool, run, chunks, pending, max(1, max_pending or 2 * workers)):
+            yield from results
+    finally:
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+@functools.lru_cache(maxsize=4)
+def _worker_geometry(num_thresholds: tuple[int, ...]) -> GridGeometry:
+    """The geometry of a grid, kept across the chunks a worker runs."""
+    return GridGeometry(num_thresholds)
+
+
+def _map_chunk(predicate, num_thresholds, specs, kwargs, chunk) -> list:
+    """``predicate`` over the graphs of one chunk; runs in the worker."""
+    if kwargs.get("geometry") is None:
+        kwargs = {**kwargs, "geometry": _worker_geometry(tuple(num_thresholds))}
+    graphs = iter_labelling_graphs(chunk, num_thresholds, specs, **kwargs)
+    return [predicate(g) for g in graphs]
+
+
+class _EdgeRecorder:
+    """Stands in for the ``pychomp.DiGraph`` of a slab: records edges in order.
+
+    Phase 0 holds the edges of the pairwise pass, phase 1 the ``U(xi)`` edges
+    added after it.
+    """
+
+    def __init__(self):
+        self.edges = ([], [])
+        self.phase = 0
+
+    def add_edge(self, u, v):
+        self.edges[self.phase].append((u, v))
+
+
+class _SlabGraph(SpecCubicalBlowupGraph):
+    """The part of the map owned by the blowup top cells ``slab = (lo, hi)``
+    (positions within the top-cell block).
+
+    A worker builds one graph with no slab and computes every slab it is
+    handed on it (:meth:`compute_slab`), so the cell data and the per-cell
+    memos (wall labels, regulation maps, semi-opaque cells) are built once per
+    worker rather than once per slab.
+    """
+
+    def __init__(self, slab=None, **kwargs):
+        self.slab = slab
+        super().__init__(**kwargs)
+
+    def compute_multivalued_map(self):
+        self.digraph = _EdgeRecorder()
+        if self.slab is None:
+            return None
+        return super().compute_multivalued_map()
+
+    def compute_slab(self, slab):
+        """Compute the map on ``slab``, dropping what earlier slabs recorded."""
+        self.slab = slab
+        self.diagnostics = Counter()
+        self.conflicting_pairs = []
+        self.out_of_range_pairs = []
+        self.back_wall_disagreements = []
+        self._multivalued_cells = set()
+        self.compute_multivalued_map()
+
+    def _blowup_top_cells(self):
+        lo, hi = self.slab
+        return range(self.blowup_tables.top_offset + lo, self.blowup_tables.top_offset + hi)
+
+    def _cubical_cells(self):
+        lo, hi = self.slab
+        positions = self.blowup_tables.cubical2blowup - self.blowup_tables.top_offset
+        return np.flatnonzero((positions >= lo) & (positions < hi)).tolist()
+
+    def add_unstable_cells(self):
+        self.digraph.phase = 1
+        return super().add_unstable_cells()
+
+    def _add_unstable_cells(self):
+        self.digraph.phase = 1
+        return super()._add_unstable_cells()
+
+
+# The graph slabs are computed on, one per worker process; see _init_slab_worker
+_slab_graph: _SlabGraph | None = None
+
+
+def _init_slab_worker(kwargs):
+    """Pool initializer for :meth:`SpecCubicalBlowupGraph._compute_in_slabs`."""
+    global _slab_graph
+    _slab_graph = _SlabGraph(**kwargs)
+
+
+def _slab_map(slab):
+    """Worker for :meth:`SpecCubicalBlowupGraph._compute_in_slabs`."""
+    graph = _slab_graph
+    graph.compute_slab(slab)
+    edges, unstable_edges = graph.digraph.edges
+    return {
+        "edges": np.array(edges, dtype=np.int64).reshape(-1, 2),
+        "unstable_edges": np.array(unstable_edges, dtype=np.int64).reshape(-1, 2),
+        "diagnostics": graph.diagnostics,
+        "conflicting_pairs": graph.conflicting_pairs,
+        "out_of_range_pairs": graph.out_of_range_pairs,
+        "back_wall_disagreements": graph.back_wall_disagreements,
+        "multivalued_cells": graph._multivalued_cells,
+    }
@@ -0,0 +1,275 @@
+"""Persistent cache of pipeline results, keyed by what determines them.
+
+A :class:`ResultCache` is a directory of compressed ``.npz`` files, one per
+result.  The file name is a content address: a BLAKE2b hash of the wall
+labelling, the number of thresholds, every toggle of the :class:`Spec` (not its
+name), the level, the package version, a hash of the code that computes the
+result (:func:`code_digest`) and :data:`FORMAT`.  Anything that can change the
+result changes the key, so a stale entry is never read -- an edit to the
+algorithms invalidates the cache without a version bump; bump :data:`FORMAT`
+when the stored arrays change meaning.  An entry that cannot be read (a
+truncated or corrupt file) counts as a miss and is removed.
+
+An entry holds the Morse graph (node gradings, cell counts, Conley indices and
+edges), the grading of every blowup top cell, the diagnostics and, unless the
+cache was opened with ``edges=False``, the STG edges and pair lists.  On a hit
+:meth:`ResultCache.load` returns a :class:`MorseResult` whose Morse graph,
+grading index and diagnostics are read from the file.  The STG and the pychomp
+complexes are rebuilt on first access only: from the stored edges without
+recomputing the map when they were kept, by rerunning the build otherwise.
+
+Pass a cache to ``pipeline.conley_morse_graph(..., cache=...)``; the example
+runner uses one by default (``python -m rookfields.examples --no-cache``).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import DSGRN_utils
+import numpy as np
+import pychomp
+from DSGRN_utils.GradingIndex import GradingIndex
+
+from .blowup import SpecCubicalBlowupGraph
+from .pipeline import MorseResult
+from .spec import Spec
+
+#: Layout version of the stored arrays; part of every key.
+FORMAT = 1
+
+#: Default cache location, next to ``reports/``.
+DEFAULT_DIR = Path(__file__).resolve().parents[2] / ".cache"
+
+#: Pair lists of ``SpecCubicalBlowupGraph`` kept with the STG edges.
+PAIR_LISTS = ("conflicting_pairs", "out_of_range_pairs", "back_wall_disagreements")
+
+
+#: The rookfields modules the stored results depend on (with all of DSGRN_utils).
+ALGORITHM_MODULES = ("blowup.py", "pipeline.py", "spec.py")
+
+
+@functools.lru_cache(maxsize=None)
+def code_digest() -> str:
+    """Hash of the sources that compute a result.
+
+    Every module of ``DSGRN_utils``, which builds the STG and the Morse graph,
+    and :data:`ALGORITHM_MODULES` of rookfields.
+    """
+    here = Path(__file__).resolve().parent
+    sources = sorted(Path(DSGRN_utils.__file__).resolve().parent.glob("*.py"))
+    sources += [here / name for name in ALGORITHM_MODULES]
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sources:
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def result_key(labelling, num_thresholds, spec: Spec, level: int) -> str:
+    """Content address of the result of one pipeline run."""
+    from . import __version__
+
+    payload = json.dumps(
+        {
+            "labelling": [int(x) for x in labelling],
+            "num_thresholds": [int(k) for k in num_thresholds],
+            # The name labels a spec; only the toggles determine the result.
+            "spec": dataclasses.asdict(dataclasses.replace(spec, name="")),
+            "level": int(level),
+            "version": __version__,
+            "code": code_digest(),
+            "format": FORMAT,
+        },
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """Directory of stored pipeline results (see the module docstring).
+
+    ``edges=False`` keeps entries small by leaving out the STG edges; the STG
+    of a hit is then rebuilt from scratch when first used.
+    """
+
+    def __init__(self, directory: str | os.PathLike = DEFAULT_DIR, *, edges: bool = True):
+        self.directory = Path(directory)
+        self.edges = edges
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.npz"
+
+    def load(self, labelling, num_thresholds, spec: Spec, level: int) -> MorseResult | None:
+        """The stored result for these inputs, or ``None``."""
+        path = self.path(result_key(labelling, num_thresholds, spec, level))
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            result = _StoredResult(arrays, labelling, num_thresholds, spec, level)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile, zlib.error):
+            # truncated or corrupt, or missing a member: recompute and rewrite
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def store(self, result: MorseResult) -> Path:
+        """Write ``result``; the file appears atomically."""
+        stg = result.stg
+        path = self.path(result_key(stg.labelling, stg.num_thresholds, result.spec, result.level))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = _arrays(result, self.edges)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez_compressed(handle, **arrays)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path
+
+
+def _pairs(pairs) -> np.ndarray:
+    return np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def _arrays(result: MorseResult, edges: bool) -> dict[str, np.ndarray]:
+    """The arrays of one cache entry."""
+    mg = result.morse_graph
+    index = result._index()
+    grades = index.node_grades
+    dim = result.stg.dim
+    labels = [mg.vertex_label(v) for v in grades]
+    arrays = {
+        "node_grades": np.asarray(grades, dtype=np.int64),
+        "num_cells": np.asarray([label[1] for label in labels], dtype=np.int64),
+        "conley": np.asarray([label[2] for label in labels], dtype=np.int64).reshape(-1, dim + 1),
+        "morse_edges": _pairs([(v, u) for v in grades for u in mg.adjacencies(v)]),
+        "grades": index.grades,
+        "top_offset": np.int64(index.top_offset),
+        "fringe_grade": np.int64(index.fringe_grade),
+        "diagnostics": np.array(json.dumps(dict(result.diagnostics), sort_keys=True)),
+        "seconds": np.float64(result.seconds),
+        "stg_size": np.asarray(result.stg_size, dtype=np.int64),
+    }
+    if edges:
+        digraph = result.stg.digraph
+        arrays["stg_edges"] = _pairs(
+            [(u, v) for u in digraph.vertices() for v in digraph.adjacencies(u)]
+        )
+        for name in PAIR_LISTS:
+            arrays[name] = _pairs(getattr(result.stg, name))
+    return arrays
+
+
+class _StoredResult(MorseResult):
+    """A :class:`MorseResult` read back from a :class:`ResultCache`.
+
+    The Morse graph, grading index and diagnostics come from the entry; the
+    STG and the pychomp complexes are rebuilt the first time they are used.
+    """
+
+    def __init__(self, arrays, labelling, num_thresholds, spec: Spec, level: int):
+        self._arrays = arrays
+        self._labelling = list(labelling)
+        self._num_thresholds = list(num_thresholds)
+        self.spec = spec
+        self.level = level
+        self.seconds = float(arrays["seconds"])
+        self.grading_index = GradingIndex.from_arrays(
+            arrays["grades"], arrays["top_offset"], arrays["fringe_grade"]
+        )
+        grades = arrays["node_grades"].tolist()
+        self.grading_index.set_morse_nodes(grades)
+        self.morse_graph = pychomp.DirectedAcyclicGraph()
+        for k, (v, num_cells, conley) in enumerate(
+            zip(grades, arrays["num_cells"].tolist(), arrays["conley"].tolist())
+        ):
+            self.morse_graph.add_vertex(v, label=[k, num_cells, tuple(conley)])
+        for v, u in arrays["morse_edges"].tolist():
+            self.morse_graph.add_edge(v, u)
+
+    @property
+    def diagnostics(self) -> Counter:
+        return Counter(json.loads(str(self._arrays["diagnostics"])))
+
+    @property
+    def num_thresholds(self) -> list[int]:
+        return self._num_thresholds
+
+    @property
+    def stg_size(self) -> tuple[int, int]:
+        vertices, edges = self._arrays["stg_size"].tolist()
+        return vertices, edges
+
+    @functools.cached_property
+    def stg(self) -> SpecCubicalBlowupGraph:
+        kwargs = dict(
+            labelling=self._labelling,
+            num_thresholds=self._num_thresholds,
+            spec=self.spec,
+            level=self.level,
+        )
+        if "stg_edges" in self._arrays:
+            return _StoredBlowupGraph(self._arrays, **kwargs)
+        return SpecCubicalBlowupGraph(**kwargs)
+
+    @functools.cached_property
+    def _flow_complex(self) -> tuple:
+        if "stg_edges" not in self._arrays:
+            return pychomp.FlowGradedComplex(self.stg.complex(), self.stg.adjacencies())
+        # The SCC numbering -- the grading stored with the entry -- follows the
+        # order the adjacency sets iterate in, which a replayed digraph does not
+        # keep.  Read the adjacencies in the order they were stored instead.
+        adjacency: dict[int, list[int]] = {}
+        for u, v in self._arrays["stg_edges"].tolist():
+            adjacency.setdefault(u, []).append(v)
+
+        def flow(cell):
+            return adjacency.get(cell, ())
+
+        return pychomp.FlowGradedComplex(self.stg.complex(), flow)
+
+    @functools.cached_property
+    def scc_dag(self):
+        return self._flow_complex[0]
+
+    @functools.cached_property
+    def graded_complex(self):
+        return self._flow_complex[1]
+
+    @functools.cached_property
+    def connection_matrix(self):
+        return pychomp.ConnectionMatrix(self.graded_complex)
+
+
+class _StoredBlowupGraph(SpecCubicalBlowupGraph):
+    """The STG of a cache entry: the map is read from the entry, not computed."""
+
+    def __init__(self, arrays, **kwargs):
+        self._arrays = arrays
+        super().__init__(**kwargs)
+
+    def compute_multivalued_map(self):
+        for u, v in self._arrays["stg_edges"].tolist():
+            self.digraph.add_edge(u, v)
+        self.diagnostics.update(json.loads(str(self._arrays["diagnostics"])))
+        for name in PAIR_LISTS:
+            setattr(self, name, [tuple(pair) for pair in self._arrays[name].tolist()])
@@ -0,0 +1,428 @@
+"""Spec-aware database export, one pipeline run per parameter.
+
+``DSGRN_utils.SaveDatabaseJSON_CubicalBlowup`` writes the database consumed by
+the web viewer.  :func:`save_database_json` and :func:`save_database_jsonl`
+write the same layout, but each parameter goes through
+:func:`rookfields.pipeline.conley_morse_graph` exactly once: the
+``MorseResult`` keeps the SCC DAG, graded complex, connection matrix and
+grading index, and the DSGRN_utils JSON helpers read them from it.  Any
+:class:`Spec` can be exported; under ``LEGACY`` the output is the one
+``DSGRN_utils`` writes with ``legacy=True``.
+
+:func:`save_columnar_database` writes a sweep as columns of ``.npy`` files
+instead, in shards of parameters (layout in :data:`COLUMNS`).
+:class:`ColumnarDatabase` memory-maps them: a query over a per-parameter
+column, such as ``db.parameters[db.column("num_stable") == 2]`` for the
+parameters with two attractors, reads that column only, and
+:meth:`ColumnarDatabase.record` pulls one parameter without touching the rest.
+
+Pass a :class:`rookfields.cache.ResultCache` to reuse stored results.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import DSGRN
+import numpy as np
+from DSGRN_utils.SaveDatabaseJSON_CubicalBlowup import (
+    database_header_json,
+    dynamics_json,
+    write_database_jsonl,
+)
+
+from .pipeline import MorseResult, conley_morse_graph
+from .spec import PAPER, Spec
+from .sweeps import sweep
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .cache import ResultCache
+
+
+def parameter_dynamics(
+    parameter_graph,
+    index: int,
+    *,
+    spec: Spec = PAPER,
+    level: int = 4,
+    cache: ResultCache | None = None,
+) -> dict:
+    """The ``dynamics_database`` entry of one parameter."""
+    result = conley_morse_graph(
+        parameter_graph.parameter(index), spec=spec, level=level, cache=cache
+    )
+    return dynamics_json(
+        index,
+        result.stg,
+        result.morse_graph,
+        result.connection_matrix,
+        result.graded_complex,
+        result.grading_index,
+    )
+
+
+def _setup(network, param_indices):
+    # The database describes the network without self-edge blowup, as in
+    # DSGRN_utils.save_morse_graph_database_json.
+    network = DSGRN.Network(network.specification(), edge_blowup="none")
+    parameter_graph = DSGRN.ParameterGraph(network)
+    if param_indices is None:
+        param_indices = range(parameter_graph.size())
+    return network, parameter_graph, param_indices
+
+
+def save_database_json(
+    network,
+    path,
+    param_indices=None,
+    *,
+    spec: Spec = PAPER,
+    level: int = 4,
+    verts_colors=None,
+    thres_type=None,
+    cache: ResultCache | None = None,
+) -> None:
+    """Write the database as one JSON object (every parameter held in memory)."""
+    network, parameter_graph, param_indices = _setup(network, param_indices)
+    database = _header(network, parameter_graph, param_indices, verts_colors, thres_type, spec)
+    database["dynamics_database"] = [
+        parameter_dynamics(parameter_graph, i, spec=spec, level=level, cache=cache)
+        for i in param_indices
+    ]
+    with open(path, "w") as outfile:
+        json.dump(database, outfile)
+
+
+def save_database_jsonl(
+    network,
+    path,
+    param_indices=None,
+    *,
+    spec: Spec = PAPER,
+    level: int = 4,
+    verts_colors=None,
+    thres_type=None,
+    resume: bool = True,
+    cache: ResultCache | None = None,
+) -> None:
+    """Write the database as JSON Lines, one parameter per line as it is done.
+
+    The layout and the resume rules are those of
+    ``DSGRN_utils.save_morse_graph_database_jsonl``.
+    """
+    network, parameter_graph, param_indices = _setup(network, param_indices)
+    write_database_jsonl(
+        path,
+        network,
+        param_indices,
+        lambda: _header(network, parameter_graph, param_indices, verts_colors, thres_type, spec),
+        lambda i: parameter_dynamics(parameter_graph, i, spec=spec, level=level, cache=cache),
+        resume=resume,
+        settings={"spec": dataclasses.asdict(spec), "level": level},
+    )
+
+
+def _header(network, parameter_graph, param_indices, verts_colors, thres_type, spec: Spec) -> dict:
+    # The blowup complex does not depend on the spec; only the legacy flag
+    # reaches the level-0 graph it is read from.
+    return database_header_json(
+        network,
+        parameter_graph,
+        param_indices,
+        verts_colors,
+        thres_type,
+        legacy=(spec.regulation_codomain == "all"),
+    )
+
+
+# ---------------------------------------------------------------------------
+# columnar format
+# ---------------------------------------------------------------------------
+
+#: Layout version of a columnar database, recorded in ``meta.json``.
+COLUMNAR_FORMAT = 1
+
+#: Columns of a shard, ``name: (shape, meaning)``.  Node and edge columns are
+#: ragged: ``node_ptr[k]:node_ptr[k + 1]`` are the Morse nodes of row ``k``,
+#: numbered as in its ``MorseResult``, and likewise ``edge_ptr`` for edges.
+COLUMNS = {
+    "parameter": ("(rows,)", "parameter index"),
+    "num_nodes": ("(rows,)", "Morse nodes"),
+    "num_stable": ("(rows,)", "Morse nodes with no outgoing edge (attractors)"),
+    "node_ptr": ("(rows + 1,)", "row -> slice of the node columns"),
+    "conley": ("(nodes, dim + 1)", "Conley index, Z_2 Betti numbers"),
+    "num_cells": ("(nodes,)", "top cells of the Morse set"),
+    "grade": ("(nodes,)", "SCC grading value of the Morse set"),
+    "stable": ("(nodes,)", "no outgoing edge"),
+    "edge_ptr": ("(rows + 1,)", "row -> slice of edges"),
+    "edges": ("(edges, 2)", "Morse graph edges as node numbers"),
+    "grades": ("(rows, positions)", "grading of every blowup top cell [grading=True]"),
+    "stg_ptr": ("(rows + 1,)", "row -> slice of stg_indices [stg=True]"),
+    "stg_indptr": ("(rows, positions + 1)", "CSR row pointers into the row's slice [stg=True]"),
+    "stg_indices": ("(stg edges,)", "STG targets as top-cell positions [stg=True]"),
+}
+
+
+def save_columnar_database(
+    network,
+    path,
+    param_indices=None,
+    *,
+    spec: Spec = PAPER,
+    level: int = 4,
+    shard_size: int = 4096,
+    grading: bool = True,
+    stg: bool = False,
+    resume: bool = True,
+    cache: ResultCache | None = None,
+    executor: str | Executor = "serial",
+    workers: int | None = None,
+) -> ColumnarDatabase:
+    """Write a sweep as a columnar database in the directory ``path``.
+
+    Parameters are written ``shard_size`` at a time, each shard to its own
+    directory, which appears only once complete; only the current shard is
+    held in memory.  With ``resume`` the parameters of the shards already on
+    disk are skipped, so an interrupted sweep is finished by rerunning the
+    same call.  ``grading`` stores the grading of every top cell and ``stg``
+    the STG as CSR adjacency over the top cells.  The rows come from
+    :func:`rookfields.sweeps.sweep`, computed by ``executor`` with ``workers``.
+    """
+    network, _, param_indices = _setup(network, param_indices)
+    path = Path(path)
+    meta = {
+        "format": COLUMNAR_FORMAT,
+        "network": network.specification(),
+        "spec": dataclasses.asdict(spec),
+        "level": level,
+        "grading": grading,
+        "stg": stg,
+    }
+    done: set[int] = set()
+    if resume and (path / "meta.json").exists():
+        stored = json.loads((path / "meta.json").read_text())
+        layout = {k: v for k, v in stored.items() if k in meta}
+        if layout != meta:
+            raise ValueError(f"{path} holds a database written with other settings")
+        meta = stored
+        done = set(ColumnarDatabase(path).parameters.tolist())
+        # Shards that were being written when the sweep stopped
+        for staging in path.glob(".staging-*"):
+            shutil.rmtree(staging)
+    else:
+        if path.exists() and any(path.iterdir()):
+            if not (path / "meta.json").exists():
+                raise ValueError(f"{path} is not empty and not a columnar database")
+            shutil.rmtree(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+    shard = _Shard(grading=grading, stg=stg)
+    rows = sweep(
+        network,
+        (index for index in param_indices if index not in done),
+        spec=spec,
+        level=level,
+        summarize=functools.partial(_columnar_row, grading=grading, stg=stg),
+        executor=executor,
+        workers=workers,
+        cache=cache,
+    )
+    for index, row in rows:
+        if "dim" not in meta:
+            meta["dim"] = row["dim"]
+            meta["positions"] = row["positions"]
+            meta["top_offset"] = row["top_offset"]
+            (path / "meta.json").write_text(json.dumps(meta, indent=2))
+        shard.add(index, row)
+        if len(shard) == shard_size:
+            shard.write(path)
+            shard = _Shard(grading=grading, stg=stg)
+    if len(shard):
+        shard.write(path)
+    if "dim" not in meta:
+        (path / "meta.json").write_text(json.dumps(meta, indent=2))
+    return ColumnarDatabase(path)
+
+
+class _Shard:
+    """Rows of one shard, buffered until written."""
+
+    def __init__(self, *, grading: bool, stg: bool):
+        self.grading = grading
+        self.stg = stg
+        self.rows: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, index: int, row: dict) -> None:
+        self.rows.append({"parameter": index, **row})
+
+    def columns(self) -> dict[str, np.ndarray]:
+        rows = self.rows
+        dim = rows[0]["dim"]
+        num_nodes = np.array([len(r["grade"]) for r in rows], dtype=np.int32)
+        num_edges = np.array([len(r["edges"]) for r in rows], dtype=np.int64)
+        stable = np.array([s for r in rows for s in r["stable"]], dtype=bool)
+        columns = {
+            "parameter": np.array([r["parameter"] for r in rows], dtype=np.int64),
+            "num_nodes": num_nodes,
+            "num_stable": np.array([sum(r["stable"]) for r in rows], dtype=np.int32),
+            "node_ptr": _offsets(num_nodes),
+            "conley": np.array(
+                [c for r in rows for c in r["conley"]], dtype=np.int32
+            ).reshape(-1, dim + 1),
+            "num_cells": np.array([c for r in rows for c in r["num_cells"]], dtype=np.int64),
+            "grade": np.array([g for r in rows for g in r["grade"]], dtype=np.int64),
+            "stable": stable,
+            "edge_ptr": _offsets(num_edges),
+            "edges": np.array([e for r in rows for e in r["edges"]], dtype=np.int32).reshape(-1, 2),
+        }
+        if self.grading:
+            columns["grades"] = np.stack([r["grades"] for r in rows])
+        if self.stg:
+            columns["stg_ptr"] = _offsets([len(r["stg_indices"]) for r in rows])
+            columns["stg_indptr"] = np.stack([r["stg_indptr"] for r in rows])
+            columns["stg_indices"] = np.concatenate([r["stg_indices"] for r in rows])
+        return columns
+
+    def write(self, path: Path) -> Path:
+        """Write the shard next to the others; it appears atomically."""
+        first = self.rows[0]["parameter"]
+        target = path / f"shard-{first:012d}-{len(self.rows):06d}"
+        staging = Path(tempfile.mkdtemp(dir=path, prefix=".staging-"))
+        try:
+            for name, array in self.columns().items():
+                np.save(staging / f"{name}.npy", array)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return target
+
+
+def _columnar_row(result: MorseResult, *, grading: bool, stg: bool) -> dict:
+    """The row of one result, without its parameter index; runs in the sweep's worker."""
+    labels = [result.morse_graph.vertex_label(v) for v in result.grading_index.node_grades]
+    stable = set(result.stable_nodes)
+    row = {
+        "conley": [label[2] for label in labels],
+        "num_cells": [label[1] for label in labels],
+        "grade": result.grading_index.node_grades,
+        "stable": [k in stable for k in range(len(labels))],
+        "edges": sorted(result.edges),
+        "dim": result.stg.dim,
+        "positions": result.stg.blowup_tables.num_positions,
+        "top_offset": result.stg.blowup_tables.top_offset,
+    }
+    if grading:
+        row["grades"] = result.grading_index.grades.astype(np.int32)
+    if stg:
+        tables = result.stg.blowup_tables
+        digraph = result.stg.digraph
+        targets = [
+            sorted(digraph.adjacencies(tables.top_offset + p))
+            for p in range(tables.num_positions)
+        ]
+        indptr = np.zeros(tables.num_positions + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in targets], out=indptr[1:])
+        row["stg_indptr"] = indptr
+        row["stg_indices"] = (
+            np.fromiter((v for t in targets for v in t), dtype=np.int64, count=int(indptr[-1]))
+            - tables.top_offset
+        ).astype(np.int32)
+    return row
+
+
+def _offsets(counts) -> np.ndarray:
+    ptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=ptr[1:])
+    return ptr
+
+
+class ColumnarDatabase:
+    """Read side of :func:`save_columnar_database`.
+
+    Every column is memory-mapped.  :meth:`column` concatenates a
+    per-parameter column over the shards (and keeps it); the ragged and
+    per-cell columns are only sliced, one parameter at a time, by
+    :meth:`record`.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self.shards = sorted(p for p in self.path.glob("shard-*") if p.is_dir())
+        self._columns: dict[str, np.ndarray] = {}
+        self._mapped: dict[tuple[int, str], np.ndarray] = {}
+        sizes = [len(self._shard_column(k, "parameter")) for k in range(len(self.shards))]
+        self._row_offset = _offsets(sizes)
+        self._row_of: dict[int, int] | None = None
+
+    def __len__(self) -> int:
+        return int(self._row_offset[-1])
+
+    def _shard_column(self, shard: int, name: str) -> np.ndarray:
+        key = (shard, name)
+        if key not in self._mapped:
+            self._mapped[key] = np.load(self.shards[shard] / f"{name}.npy", mmap_mode="r")
+        return self._mapped[key]
+
+    def column(self, name: str) -> np.ndarray:
+        """A per-parameter column (``parameter``, ``num_nodes``,
+        ``num_stable``) over every row, in row order."""
+        if name not in self._columns:
+            parts = [self._shard_column(k, name) for k in range(len(self.shards))]
+            self._columns[name] = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        return self._columns[name]
+
+    @property
+    def parameters(self) -> np.ndarray:
+        return self.column("parameter")
+
+    def row(self, parameter: int) -> int:
+        """Row number of a parameter index."""
+        if self._row_of is None:
+            self._row_of = {int(p): k for k, p in enumerate(self.parameters)}
+        try:
+            return self._row_of[parameter]
+        except KeyError:
+            raise KeyError(f"parameter {parameter} is not in {self.path}") from None
+
+    def record(self, parameter: int) -> dict:
+        """Every stored column of one parameter, nodes and edges cut to it."""
+        row = self.row(parameter)
+        shard = int(np.searchsorted(self._row_offset, row, side="right")) - 1
+        k = row - int(self._row_offset[shard])
+
+        def column(name):
+            return self._shard_column(shard, name)
+
+        lo, hi = column("node_ptr")[k : k + 2]
+        elo, ehi = column("edge_ptr")[k : k + 2]
+        record = {
+            "parameter": parameter,
+            "conley": [tuple(c) for c in column("conley")[lo:hi].tolist()],
+            "num_cells": column("num_cells")[lo:hi].tolist(),
+            "grade": column("grade")[lo:hi].tolist(),
+            "stable": np.flatnonzero(column("stable")[lo:hi]).tolist(),
+            "edges": {tuple(e) for e in column("edges")[elo:ehi].tolist()},
+        }
+        if self.meta["grading"]:
+            record["grades"] = np.asarray(column("grades")[k])
+        if self.meta["stg"]:
+            slo, shi = column("stg_ptr")[k : k + 2]
+            record["stg"] = (
+                np.asarray(column("stg_indptr")[k]),
+                np.asarray(column("stg_indices")[slo:shi]),
+            )
+        return record
@@ -8,6 +8,7 @@ import traceback
 from pathlib import Path
 
 from .. import networks
+from ..cache import DEFAULT_DIR, ResultCache
 from ..pipeline import conley_morse_graph
 from ..spec import LEGACY, PAPER, Spec
 from .catalog import EXAMPLES, Example
@@ -49,14 +50,20 @@ def _summary(result) -> dict:
         "stable_nodes": result.stable_nodes,
         "morse_edges": sorted(result.edges),
         "top_cell_counts": {str(k): v for k, v in sorted(result.top_cell_counts.items())},
-        "index_set": [k + 1 for k in result.stg.num_thresholds],
-        "stg_vertices": len(list(result.stg.digraph.vertices())),
-        "stg_edges": len(list(result.stg.digraph.edges())),
+        "index_set": [k + 1 for k in result.num_thresholds],
+        "stg_vertices": result.stg_size[0],
+        "stg_edges": result.stg_size[1],
         "diagnostics": dict(result.diagnostics),
     }
 
 
-def run_example(example: Example, spec: Spec = LEGACY) -> ExampleOutcome:
+def run_example(
+    example: Example,
+    spec: Spec = LEGACY,
+    *,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+) -> ExampleOutcome:
     try:
         if example.is_ramp:
             system = networks.RAMP_SYSTEMS[example.ramp_system]
@@ -66,12 +73,16 @@ def run_example(example: Example, spec: Spec = LEGACY) -> ExampleOutcome:
                 num_thresholds=num_thresholds,
                 spec=spec,
                 level=example.level,
+                workers=workers,
+                cache=cache,
             )
         else:
             result = conley_morse_graph(
                 networks.parameter(example.network, example.index),
                 spec=spec,
                 level=example.level,
+                workers=workers,
+                cache=cache,
             )
     except Exception:
         return ExampleOutcome(
@@ -109,6 +120,8 @@ def run_all(
     *,
     include_expensive: bool = True,
     only: list[str] | None = None,
+    workers: int = 1,
+    cache: ResultCache | None = None,
 ) -> list[ExampleOutcome]:
     outcomes: list[ExampleOutcome] = []
     for example in EXAMPLES:
@@ -119,7 +132,7 @@ def run_all(
             continue
         for spec in specs:
             print(f"[examples] {example.label} spec={spec.name} ...", flush=True)
-            outcome = run_example(example, spec)
+            outcome = run_example(example, spec, workers=workers, cache=cache)
             status = "ok" if outcome.ok else ("ERROR" if outcome.error else "MISMATCH")
             print(
                 f"           {status}  {outcome.seconds:.2f}s  "
@@ -208,13 +221,33 @@ def main(argv=None) -> int:
         action="store_true",
         help="skip the two 6-node EMT runs (about 2 minutes each, per spec)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for each STG build (default: 1, serial); "
+        "a parallel build uses more CPU in total, so only use idle cores",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=DEFAULT_DIR,
+        help="directory of stored results to reuse (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="recompute every result and store nothing"
+    )
     parser.add_argument("--out", type=Path, default=REPORTS / "examples.md")
     parser.add_argument("--json", type=Path, default=REPORTS / "examples.json")
     args = parser.parse_args(argv)
 
     specs = {"legacy": (LEGACY,), "paper": (PAPER,), "both": (LEGACY, PAPER)}[args.spec]
     outcomes = run_all(
-        specs=specs, include_expensive=not args.skip_expensive, only=args.only
+        specs=specs,
+        include_expensive=not args.skip_expensive,
+        only=args.only,
+        workers=args.jobs,
+        cache=None if args.no_cache else ResultCache(args.cache),
     )
 
     args.out.parent.mkdir(parents=True, exist_ok=True)
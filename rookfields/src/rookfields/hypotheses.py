@@ -26,7 +26,7 @@ import dataclasses
 import itertools
 import math
 
-from .blowup import SpecCubicalBlowupGraph
+from .blowup import SharedCellData, SpecCubicalBlowupGraph
 from .ramp import RampSystem
 from .spec import PAPER, Spec
 
@@ -151,7 +151,9 @@ def check_H1(system: RampSystem, *, strict: bool = True) -> Verdict:
                    None if margin is math.inf else margin, checked)
 
 
-def check_H2(system: RampSystem, *, spec: Spec = PAPER) -> Verdict:
+def check_H2(
+    system: RampSystem, *, spec: Spec = PAPER, shared: SharedCellData | None = None
+) -> Verdict:
     """``defn:H2``: the external GO crossing estimate.
 
     Quantified over ``(xi, xi') in D(Phi) cap (X^(N-2) x X^(N-1))`` with GO-pair
@@ -161,7 +163,11 @@ def check_H2(system: RampSystem, *, spec: Spec = PAPER) -> Verdict:
     """
     labelling, num_thresholds = system.wall_labelling()
     stg = SpecCubicalBlowupGraph(
-        labelling=labelling, num_thresholds=num_thresholds, spec=spec, level=2
+        labelling=labelling,
+        num_thresholds=num_thresholds,
+        spec=spec,
+        level=2,
+        shared=shared,
     )
     cc = stg.cubical_complex
     dim = stg.dim
@@ -208,7 +214,9 @@ def check_H2(system: RampSystem, *, spec: Spec = PAPER) -> Verdict:
     return verdict
 
 
-def check_H3(system: RampSystem, *, spec: Spec = PAPER) -> Verdict:
+def check_H3(
+    system: RampSystem, *, spec: Spec = PAPER, shared: SharedCellData | None = None
+) -> Verdict:
     """``defn:H3``: ``H_3 = H_1`` in dimension two; the 3-cycle product bound in three.
 
     The denominator is
@@ -232,7 +240,11 @@ def check_H3(system: RampSystem, *, spec: Spec = PAPER) -> Verdict:
 
     labelling, num_thresholds = system.wall_labelling()
     stg = SpecCubicalBlowupGraph(
-        labelling=labelling, num_thresholds=num_thresholds, spec=spec, level=3
+        labelling=labelling,
+        num_thresholds=num_thresholds,
+        spec=spec,
+        level=3,
+        shared=shared,
     )
     cc = stg.cubical_complex
     g = system.gamma
@@ -345,15 +357,19 @@ def uniform_width_bound(system: RampSystem, level: int) -> float:
 
 
 def report(system: RampSystem, *, spec: Spec = PAPER) -> list[Verdict]:
-    """Run every applicable check for one ramp system."""
+    """Run every applicable check for one ramp system.
+
+    ``F_2`` and ``F_3`` share their pair verdicts (``blowup.SharedCellData``).
+    """
     verdicts = [
         check_admissible_theta_h(system),
         check_lambda_R(system),
         check_H1(system),
     ]
-    verdicts.append(check_H2(system, spec=spec))
+    shared = SharedCellData()
+    verdicts.append(check_H2(system, spec=spec, shared=shared))
     if system.dim in (2, 3):
-        verdicts.append(check_H3(system, spec=spec))
+        verdicts.append(check_H3(system, spec=spec, shared=shared))
     return verdicts
 
 
@@ -15,13 +15,19 @@ from __future__ import annotations
 import dataclasses
 import time
 from collections import Counter
+from typing import TYPE_CHECKING
 
 import pychomp
+from DSGRN_utils.CubicalBlowupGraph import parameter_labelling
+from DSGRN_utils.GradingIndex import GradingIndex
 from DSGRN_utils.MorseGraph import MorseGraph
 
-from .blowup import SpecCubicalBlowupGraph
+from .blowup import SharedCellData, SpecCubicalBlowupGraph, iter_spec_graphs
 from .spec import PAPER, Spec
 
+if TYPE_CHECKING:
+    from .cache import ResultCache
+
 
 @dataclasses.dataclass
 class MorseResult:
@@ -35,6 +41,9 @@ class MorseResult:
     spec: Spec
     level: int
     seconds: float
+    #: Grading of every blowup top cell, read once and grouped by Morse node
+    #: (``DSGRN_utils.GradingIndex``); every cell-level accessor goes through it.
+    grading_index: GradingIndex | None = None
 
     # -- convenience accessors used by the example checks and the audit ----
 
@@ -78,25 +87,37 @@ class MorseResult:
             if not self.morse_graph.adjacencies(v)
         )
 
+    @property
+    def num_thresholds(self) -> list[int]:
+        """Thresholds per coordinate of the wall labelling."""
+        return self.stg.num_thresholds
+
+    @property
+    def stg_size(self) -> tuple[int, int]:
+        """``(vertices, edges)`` of the state transition graph."""
+        digraph = self.stg.digraph
+        return len(digraph.vertices()), sum(len(digraph.adjacencies(v)) for v in digraph.vertices())
+
     @property
     def trivial_index_nodes(self) -> list[int]:
         """Morse nodes whose Conley index vanishes in every degree."""
         return sorted(n for n, ci in self.conley_indices.items() if not any(ci))
 
+    def _index(self) -> GradingIndex:
+        """The grading index, built on first use for a hand-assembled result."""
+        if self.grading_index is None:
+            self.grading_index = GradingIndex(self.stg, self.graded_complex)
+        return self.grading_index
+
     def _cells_by_node(self) -> dict[int, set[int]]:
-        """Invert the grading once; the STG has O(10^5) vertices in six dimensions."""
+        """Morse sets as cell sets, cut from the grading index once."""
         cached = getattr(self, "_cells_by_node_cache", None)
         if cached is None:
-            grade_of_node = {
-                self.morse_graph.vertex_label(v)[0]: v
+            index = self._index()
+            cached = {
+                self.morse_graph.vertex_label(v)[0]: set(index.cells(v).tolist())
                 for v in self.morse_graph.vertices()
             }
-            node_of_grade = {v: n for n, v in grade_of_node.items()}
-            cached = {n: set() for n in grade_of_node}
-            for cell in self.stg.digraph.vertices():
-                node = node_of_grade.get(self.graded_complex.value(cell))
-                if node is not None:
-                    cached[node].add(cell)
             self._cells_by_node_cache = cached
         return cached
 
@@ -119,10 +140,10 @@ class MorseResult:
 
     def equilibrium_cells_in(self, node: int) -> set[int]:
         """Cells of Morse set ``node`` that are equilibrium cells (``def:eqcell``)."""
+        cells = list(self.morse_set_cells(node))
+        cc_cells = self.stg.blowup2cubical_array(cells).tolist()
         return {
-            cell
-            for cell in self.morse_set_cells(node)
-            if self.stg.equilibrium_cell(self.stg.blowup2cubical(cell))
+            cell for cell, cc_cell in zip(cells, cc_cells) if self.stg.equilibrium_cell(cc_cell)
         }
 
     @property
@@ -137,13 +158,31 @@ def conley_morse_graph(
     num_thresholds=None,
     spec: Spec = PAPER,
     level: int = 4,
+    tables: bool = False,
+    workers: int = 1,
+    cache: ResultCache | None = None,
 ) -> MorseResult:
-    """Run the full pipeline for one DSGRN parameter or one raw wall labelling."""
+    """Run the full pipeline for one DSGRN parameter or one raw wall labelling.
+
+    ``tables=True`` builds the STG from dense per-cell tables of the cubical
+    complex (``DSGRN_utils.CubicalTables``); ``workers > 1`` builds it in a
+    process pool, slab by slab.  Neither changes the result.  With a
+    ``cache`` (:class:`rookfields.cache.ResultCache`) a stored result is
+    returned when there is one, and a computed one is stored.
+    """
     if parameter is None and (labelling is None or num_thresholds is None):
         raise ValueError("provide either parameter, or labelling and num_thresholds")
     if parameter is not None and (labelling is not None or num_thresholds is not None):
         raise ValueError("provide parameter, or labelling and num_thresholds, not both")
 
+    if cache is not None:
+        if parameter is not None:
+            labelling, num_thresholds = parameter_labelling(parameter)
+            parameter = None
+        stored = cache.load(labelling, num_thresholds, spec, level)
+        if stored is not None:
+            return stored
+
     start = time.perf_counter()
     stg = SpecCubicalBlowupGraph(
         parameter=parameter,
@@ -151,11 +190,67 @@ def conley_morse_graph(
         num_thresholds=num_thresholds,
         spec=spec,
         level=level,
+        tables=tables,
+        workers=workers,
     )
+    result = _morse_result(stg, spec, level, start)
+    if cache is not None:
+        cache.store(result)
+    return result
+
+
+def conley_morse_graphs(
+    parameter=None,
+    *,
+    labelling=None,
+    num_thresholds=None,
+    specs=(PAPER,),
+    level: int = 4,
+    tables: bool = False,
+    shared: SharedCellData | None = None,
+) -> list[MorseResult]:
+    """:func:`conley_morse_graph` for several specs of one wall labelling.
+
+    The STGs are built together by ``blowup.iter_spec_graphs``, which computes
+    the spec-independent part once.  Returns one result per spec, in order; the
+    shared work is timed into the first.  Passing the same ``shared`` to calls
+    at several levels also shares the pair verdicts between levels.
+    """
+    if parameter is None and (labelling is None or num_thresholds is None):
+        raise ValueError("provide either parameter, or labelling and num_thresholds")
+    if parameter is not None and (labelling is not None or num_thresholds is not None):
+        raise ValueError("provide parameter, or labelling and num_thresholds, not both")
+
+    specs = list(specs)
+    graphs = iter_spec_graphs(
+        specs,
+        parameter,
+        labelling=labelling,
+        num_thresholds=num_thresholds,
+        level=level,
+        tables=tables,
+        shared=shared,
+    )
+    results = []
+    start = time.perf_counter()
+    for spec, stg in zip(specs, graphs):
+        results.append(_morse_result(stg, spec, level, start))
+        start = time.perf_counter()
+    return results
+
+
+def _morse_result(stg: SpecCubicalBlowupGraph, spec: Spec, level: int, start: float) -> MorseResult:
+    """Morse graph and Conley complex of a built STG; ``start`` is when its build began."""
     scc_dag, graded_complex = pychomp.FlowGradedComplex(stg.complex(), stg.adjacencies())
     connection_matrix = pychomp.ConnectionMatrix(graded_complex)
+    grading_index = GradingIndex(stg, graded_complex)
     morse_graph = MorseGraph(
-        stg, scc_dag, graded_complex, connection_matrix, prune_grad=spec.prune_grad
+        stg,
+        scc_dag,
+        graded_complex,
+        connection_matrix,
+        prune_grad=spec.prune_grad,
+        grading_index=grading_index,
     )
     elapsed = time.perf_counter() - start
 
@@ -168,6 +263,7 @@ def conley_morse_graph(
         spec=spec,
         level=level,
         seconds=elapsed,
+        grading_index=grading_index,
     )
 
 
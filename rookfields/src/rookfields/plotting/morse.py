@@ -70,6 +70,7 @@ def draw_morse_sets(result: MorseResult, ax, *, proj_dims=None, proj_slice=None,
         proj_dims=proj_dims,
         proj_slice=proj_slice,
         ax=ax,
+        grading_index=result.grading_index,
         **kw,
     )
     return ax
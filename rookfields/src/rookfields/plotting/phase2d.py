@@ -74,30 +74,23 @@ def plot_phase_portrait_2d(
 
     # -- Morse sets, drawn as the embedded blowup cells -------------------
     if show_cells:
-        vertex_index = {
-            v: result.morse_graph.vertex_label(v)[0]
-            for v in result.morse_graph.vertices()
-        }
-        for cell in stg.blowup_complex(stg.dim):
-            if stg.blowup_complex.rightfringe(cell):
-                continue
-            grade = result.graded_complex.value(cell)
-            if grade not in vertex_index:
-                continue
-            node = vertex_index[grade]
-            coords = stg.blowup_complex.coordinates(cell)
-            (x0, x1), (y0, y1) = geo.rectangle(list(coords), [1, 1])
-            ax.add_patch(
-                Rectangle(
-                    (x0, y0),
-                    x1 - x0,
-                    y1 - y0,
-                    facecolor=MORSE_COLOURS[node % len(MORSE_COLOURS)],
-                    edgecolor="none",
-                    alpha=0.55,
-                    zorder=1,
+        for node in result.nodes:
+            for cell in sorted(result.morse_set_cells(node)):
+                if stg.blowup_complex.rightfringe(cell):
+                    continue
+                coords = stg.blowup_complex.coordinates(cell)
+                (x0, x1), (y0, y1) = geo.rectangle(list(coords), [1, 1])
+                ax.add_patch(
+                    Rectangle(
+                        (x0, y0),
+                        x1 - x0,
+                        y1 - y0,
+                        facecolor=MORSE_COLOURS[node % len(MORSE_COLOURS)],
+                        edgecolor="none",
+                        alpha=0.55,
+                        zorder=1,
+                    )
                 )
-            )
 
     # -- the cell grid ----------------------------------------------------
     for n, axis_draw in ((0, ax.axvline), (1, ax.axhline)):
@@ -113,12 +106,8 @@ def plot_phase_portrait_2d(
         xs = np.linspace(xlim[0] + 0.02 * (xlim[1] - xlim[0]), 0.98 * xlim[1], field_grid)
         ys = np.linspace(ylim[0] + 0.02 * (ylim[1] - ylim[0]), 0.98 * ylim[1], field_grid)
         X, Y = np.meshgrid(xs, ys)
-        U = np.zeros_like(X)
-        V = np.zeros_like(Y)
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                f = system.vector_field([X[i, j], Y[i, j]])
-                U[i, j], V[i, j] = f[0], f[1]
+        f = system.vector_field(np.column_stack([X.ravel(), Y.ravel()]))
+        U, V = f[:, 0].reshape(X.shape), f[:, 1].reshape(X.shape)
         norm = np.hypot(U, V)
         norm[norm == 0] = 1.0
         ax.quiver(X, Y, U / norm, V / norm, color="0.35", alpha=0.5,
@@ -129,12 +118,8 @@ def plot_phase_portrait_2d(
         xs = np.linspace(xlim[0], xlim[1], 420)
         ys = np.linspace(ylim[0], ylim[1], 420)
         X, Y = np.meshgrid(xs, ys)
-        F0 = np.zeros_like(X)
-        F1 = np.zeros_like(X)
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                f = system.vector_field([X[i, j], Y[i, j]])
-                F0[i, j], F1[i, j] = f[0], f[1]
+        f = system.vector_field(np.column_stack([X.ravel(), Y.ravel()]))
+        F0, F1 = f[:, 0].reshape(X.shape), f[:, 1].reshape(X.shape)
         ax.contour(X, Y, F0, levels=[0.0], colors="#0b6fa4", linewidths=1.8, zorder=4)
         ax.contour(X, Y, F1, levels=[0.0], colors="#b03060", linewidths=1.8, zorder=4)
 
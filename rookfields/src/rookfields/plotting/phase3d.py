@@ -58,20 +58,17 @@ def plot_morse_sets_3d(
         fig = plt.figure(figsize=(8.5, 7.5))
         ax = fig.add_subplot(111, projection="3d")
 
-    vertex_index = {
-        v: result.morse_graph.vertex_label(v)[0]
-        for v in result.morse_graph.vertices()
-    }
+    # Morse set cells in cell order, which is the order the boxes are drawn in
+    drawn = sorted(
+        (cell, node)
+        for node in result.nodes
+        if morse_nodes is None or node in morse_nodes
+        for cell in result.morse_set_cells(node)
+    )
 
-    for cell in stg.blowup_complex(stg.dim):
+    for cell, node in drawn:
         if stg.blowup_complex.rightfringe(cell):
             continue
-        grade = result.graded_complex.value(cell)
-        if grade not in vertex_index:
-            continue
-        node = vertex_index[grade]
-        if morse_nodes is not None and node not in morse_nodes:
-            continue
         coords = stg.blowup_complex.coordinates(cell)
         intervals = geo.rectangle(list(coords), [1, 1, 1])
         colour = MORSE_COLOURS[node % len(MORSE_COLOURS)]
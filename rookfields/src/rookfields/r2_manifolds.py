@@ -42,7 +42,7 @@ import itertools
 import numpy as np
 from scipy.optimize import brentq
 
-from .blowup import SpecCubicalBlowupGraph
+from .blowup import SharedCellData, SpecCubicalBlowupGraph
 from .geometrization import RectangularGeometrization
 from .ramp import RampSystem
 from .spec import PAPER, Spec
@@ -158,12 +158,23 @@ def _is_codim_two(pair: GOPair, dim: int) -> bool:
 
 
 def go_pairs(
-    system: RampSystem, *, spec: Spec = PAPER, outer: str = "global_bound"
+    system: RampSystem,
+    *,
+    spec: Spec = PAPER,
+    outer: str = "global_bound",
+    shared: SharedCellData | None = None,
 ) -> tuple[list[GOPair], SpecCubicalBlowupGraph]:
-    """Every codimension-two indecisive-drift pair, with its pruning side."""
+    """Every codimension-two indecisive-drift pair, with its pruning side.
+
+    ``shared`` reuses the pair verdicts of other builds for the same system.
+    """
     labelling, num_thresholds = system.wall_labelling(outer=outer)
     stg = SpecCubicalBlowupGraph(
-        labelling=labelling, num_thresholds=num_thresholds, spec=spec, level=2
+        labelling=labelling,
+        num_thresholds=num_thresholds,
+        spec=spec,
+        level=2,
+        shared=shared,
     )
     cc = stg.cubical_complex
     dim = stg.dim
@@ -216,15 +227,19 @@ def go_pairs(
 
 
 def perturbed_field(system: RampSystem, pair: GOPair, epsilon: float):
-    """``eq:rampSysPerturbed``: a planar field in ``(n_o, n_g)``, frozen elsewhere."""
+    """``eq:rampSysPerturbed``: a planar field in ``(n_o, n_g)``, frozen elsewhere.
+
+    Like :meth:`RampSystem.vector_field`, the field takes one point or an
+    ``(m, N)`` batch.
+    """
     n_o, n_g, r = pair.n_opaque, pair.n_grad, pair.r_grad
 
     def F_eps(x):
         x = np.asarray(x, dtype=float)
         e = system.production(x)
         out = np.zeros_like(x)
-        out[n_o] = -system.gamma[n_o] * x[n_o] + e[n_o]
-        out[n_g] = (-system.gamma[n_g] - r * epsilon) * x[n_g] + e[n_g]
+        out[..., n_o] = -system.gamma[n_o] * x[..., n_o] + e[..., n_o]
+        out[..., n_g] = (-system.gamma[n_g] - r * epsilon) * x[..., n_g] + e[..., n_g]
         return out
 
     return F_eps
@@ -261,13 +276,11 @@ def max_admissible_epsilon(
             grids.append(list(np.linspace(lo, hi, samples)))
 
     n_g, r = pair.n_grad, pair.r_grad
-    best = float("inf")
-    for point in itertools.product(*grids):
-        x = np.array(point, dtype=float)
-        if x[n_g] <= 0:
-            continue
-        best = min(best, r * float(system.vector_field(x)[n_g]) / x[n_g])
-    return best
+    x = np.array(list(itertools.product(*grids)), dtype=float)
+    x = x[x[:, n_g] > 0]
+    if not len(x):
+        return float("inf")
+    return float(np.min(r * system.vector_field(x)[:, n_g] / x[:, n_g]))
 
 
 def directed_wall_value(system: RampSystem, pair: GOPair) -> float:
@@ -312,19 +325,23 @@ def nullcline_base(
             )
 
     lo_g, hi_g = Q[n_g]
+    fibres = np.zeros((int(np.prod([len(g) for g in grids])), system.dim))
+    fibres[:, n_o] = x_no
+    if free:
+        fibres[:, free] = np.array(list(itertools.product(*grids)), dtype=float)
+    # F_{n_o} at both ends of every fibre in one batch
+    ends = np.concatenate([fibres, fibres])
+    ends[: len(fibres), n_g], ends[len(fibres) :, n_g] = lo_g, hi_g
+    end_values = system.vector_field(ends)[:, n_o].reshape(2, -1)
+
     points = []
-    for combo in itertools.product(*grids) if free else [()]:
-        base = np.zeros(system.dim)
-        base[n_o] = x_no
-        for n, v in zip(free, combo):
-            base[n] = v
+    for base, a, b in zip(fibres, *end_values.tolist()):
 
         def f(t: float) -> float:
             y = base.copy()
             y[n_g] = t
             return float(-system.gamma[n_o] * y[n_o] + system.production(y)[n_o])
 
-        a, b = f(lo_g), f(hi_g)
         if a == 0.0:
             root = lo_g
         elif b == 0.0:
@@ -448,13 +465,15 @@ def crossing_sign(system: RampSystem, manifold: GOManifold) -> dict:
     residual_ng = 0.0
     checked = 0
     for traj in manifold.trajectories:
-        for x in traj[1:]:  # skip the base point itself
-            deviation = system.vector_field(x) - F_eps(x)
-            expected = r * manifold.epsilon * float(x[n_g])
-            residual_no = max(residual_no, abs(float(deviation[n_o])))
-            residual_ng = max(residual_ng, abs(float(deviation[n_g]) - expected))
-            worst = min(worst, r * float(deviation[n_g]))
-            checked += 1
+        x = np.asarray(traj, dtype=float)[1:]  # skip the base point itself
+        if not len(x):
+            continue
+        deviation = system.vector_field(x) - F_eps(x)
+        expected = r * manifold.epsilon * x[:, n_g]
+        residual_no = max(residual_no, float(np.max(np.abs(deviation[:, n_o]))))
+        residual_ng = max(residual_ng, float(np.max(np.abs(deviation[:, n_g] - expected))))
+        worst = min(worst, float(np.min(r * deviation[:, n_g])))
+        checked += len(x)
     return {
         "checked": checked,
         "min_signed_deviation": worst,
@@ -512,9 +531,7 @@ def base_is_on_nullcline(system: RampSystem, manifold: GOManifold) -> float:
     n_o = manifold.pair.n_opaque
     if manifold.base.size == 0:
         return 0.0
-    return float(
-        max(abs(float(system.vector_field(x)[n_o])) for x in manifold.base)
-    )
+    return float(np.max(np.abs(system.vector_field(manifold.base)[:, n_o])))
 
 
 def summarise(system: RampSystem, *, spec: Spec = PAPER, **kw) -> list[dict]:
@@ -23,6 +23,7 @@ box ``k`` has left wall ``theta_s[k-1]`` and right wall ``theta_s[k]``.
 
 from __future__ import annotations
 
+import bisect
 import dataclasses
 import itertools
 from functools import cached_property
@@ -85,12 +86,22 @@ class RampSystem:
 
     # -- the vector field -------------------------------------------------
 
+    @cached_property
+    def compiled(self) -> CompiledProduction:
+        """The ramp tables of :attr:`spec`, compiled once for batch evaluation."""
+        return CompiledProduction.from_spec(self.spec)
+
     def production(self, x) -> np.ndarray:
-        """``E(x)``, the interaction term (type-I, additive)."""
-        return np.asarray(self.spec.production(list(np.asarray(x, dtype=float))), dtype=float)
+        """``E(x)``, the interaction term.
+
+        ``x`` is one point of shape ``(N,)`` or a batch of shape ``(m, N)``;
+        the result has the same shape and agrees bit for bit with
+        ``RampSpec.production`` point by point.
+        """
+        return self.compiled(x)
 
     def vector_field(self, x) -> np.ndarray:
-        """``F(x) = -Gamma x + E(x)``."""
+        """``F(x) = -Gamma x + E(x)``, for one point or an ``(m, N)`` batch."""
         x = np.asarray(x, dtype=float)
         return -np.asarray(self.gamma, dtype=float) * x + self.production(x)
 
@@ -102,12 +113,9 @@ class RampSystem:
         claims) -- so a central difference is the honest tool here.
         """
         x = np.asarray(x, dtype=float)
-        out = np.zeros((self.dim, self.dim))
-        for j in range(self.dim):
-            e = np.zeros(self.dim)
-            e[j] = eps
-            out[:, j] = (self.vector_field(x + e) - self.vector_field(x - e)) / (2 * eps)
-        return out
+        step = eps * np.eye(self.dim)
+        f = self.vector_field(np.concatenate([x + step, x - step]))
+        return (f[: self.dim] - f[self.dim :]).T / (2 * eps)
 
     # -- global bound and box (eq:GAB, lem:global-bound) ------------------
 
@@ -306,6 +314,134 @@ class RampSystem:
         return labelling, list(K)
 
 
+@dataclasses.dataclass(frozen=True)
+class CompiledRamp:
+    """One ramp factor ``r_{k,n}`` as a piecewise-affine function of ``x_n``.
+
+    ``breaks`` interleaves the window endpoints ``theta_j -/+ h_j``; segment
+    ``s`` of ``x`` (``s = 0 .. 2J``) is a plateau for even ``s`` and the ramp
+    window ``j = (s - 1) / 2`` for odd ``s``, where the value is
+    ``slope[s] * x + intercept[s]`` -- the expression
+    ``DSGRN_utils.RampFunction.linear_function`` evaluates.  A point on a
+    window endpoint takes the plateau value, as ``ramp_function`` does.
+
+    Windows that overlap break that segment structure; such a ramp keeps its
+    tables in ``scalar`` and is evaluated with ``ramp_function`` instead.
+    """
+
+    source: int
+    breaks: tuple[float, ...]
+    slope: tuple[float, ...]
+    intercept: tuple[float, ...]
+    scalar: tuple | None = None
+
+    @classmethod
+    def from_table(cls, source: int, nu, theta, h) -> CompiledRamp:
+        nu, theta, h = list(nu), list(theta), list(h)
+        breaks, slope, intercept = [], [0.0], [float(nu[0])]
+        for j, (t, w) in enumerate(zip(theta, h)):
+            lo, hi = t - w, t + w
+            breaks += [lo, hi]
+            m = (nu[j + 1] - nu[j]) / (hi - lo) if hi > lo else 0.0
+            slope += [m, 0.0]
+            intercept += [nu[j] - m * lo, float(nu[j + 1])]
+        overlapping = any(a > b for a, b in zip(breaks, breaks[1:]))
+        return cls(source, tuple(breaks), tuple(slope), tuple(intercept),
+                   (nu, theta, h) if overlapping else None)
+
+    @cached_property
+    def _arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return np.asarray(self.breaks), np.asarray(self.slope), np.asarray(self.intercept)
+
+    def value(self, x: float) -> float:
+        """``r(x)`` at one point, without the array overhead."""
+        if self.scalar is not None:
+            return ramp_function(x, *self.scalar)
+        left, right = bisect.bisect_left(self.breaks, x), bisect.bisect_right(self.breaks, x)
+        s = left + 1 if left % 2 == 1 and right > left else left
+        return self.slope[s] * x + self.intercept[s]
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """``r(x)`` for a 1-d array of values of ``x_n``."""
+        if self.scalar is not None:
+            return np.array([ramp_function(v, *self.scalar) for v in x.tolist()], dtype=float)
+        breaks, slope, intercept = self._arrays
+        left = np.searchsorted(breaks, x, side="left")
+        right = np.searchsorted(breaks, x, side="right")
+        # on a breakpoint, the first plateau among the segments that meet there
+        segment = np.where((left % 2 == 1) & (right > left), left + 1, left)
+        return slope[segment] * x + intercept[segment]
+
+
+@dataclasses.dataclass(frozen=True)
+class CompiledProduction:
+    """``E(x)`` of a :class:`RampSpec`, evaluated over a batch of points.
+
+    ``RampSpec.production`` rebuilds its tables and calls the scalar
+    ``ramp_function`` once per ramp and point.  Here every ramp is compiled
+    once (:class:`CompiledRamp`) and evaluated over the whole batch with
+    ``np.searchsorted``; the factor sums and products are accumulated in the
+    order ``RampSpec.production`` uses, so the two agree exactly.
+
+    ``factors[k]`` lists the factors of ``E_k``, each a tuple of indices into
+    ``ramps``.
+    """
+
+    dim: int
+    ramps: tuple[CompiledRamp, ...]
+    factors: tuple[tuple[tuple[int, ...], ...], ...]
+
+    @classmethod
+    def from_spec(cls, spec: RampSpec) -> CompiledProduction:
+        nu, theta, h = spec._tables()
+        ramps: list[CompiledRamp] = []
+        index: dict[tuple[int, int], int] = {}
+        for k in range(spec.dim):
+            for n in range(spec.dim):
+                if theta[k][n]:
+                    index[k, n] = len(ramps)
+                    ramps.append(CompiledRamp.from_table(n, nu[k][n], theta[k][n], h[k][n]))
+        logic = spec.logic or tuple((tuple(range(spec.dim)),) for _ in range(spec.dim))
+        factors = tuple(
+            tuple(tuple(index[k, n] for n in factor if (k, n) in index) for factor in logic[k])
+            for k in range(spec.dim)
+        )
+        return cls(spec.dim, tuple(ramps), factors)
+
+    def __call__(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if x.shape[-1:] != (self.dim,) or x.ndim > 2:
+            raise ValueError(f"expected a point or points of dimension {self.dim}, got shape {x.shape}")
+        if x.ndim == 1:
+            return np.array(self.point(x.tolist()))
+        points = x
+        values = [ramp(points[:, ramp.source]) for ramp in self.ramps]
+        out = np.empty_like(points)
+        for k, factors in enumerate(self.factors):
+            product = np.ones(len(points))
+            for factor in factors:
+                total = np.zeros(len(points))
+                for i in factor:
+                    total += values[i]
+                product *= total
+            out[:, k] = product
+        return out
+
+    def point(self, x: list[float]) -> list[float]:
+        """``E(x)`` at one point, in plain floats."""
+        values = [ramp.value(x[ramp.source]) for ramp in self.ramps]
+        out = []
+        for factors in self.factors:
+            product = 1.0
+            for factor in factors:
+                total = 0.0
+                for i in factor:
+                    total += values[i]
+                product *= total
+            out.append(product)
+        return out
+
+
 def scalar_ramp(x: float, nu, theta, h) -> float:
     """One ramp factor ``r(x; nu, theta, h)`` (``defn:rampfunction``)."""
     return ramp_function(x, list(nu), list(theta), list(h))
@@ -0,0 +1,274 @@
+"""Lazy sweeps of the pipeline over a parameter graph.
+
+:func:`sweep` runs :func:`rookfields.pipeline.conley_morse_graph` over a
+parameter graph, or any iterable of its indices, and yields
+``(index, summary)`` pairs as a generator:
+
+* **bounded memory** -- indices are drawn from the iterable a chunk at a time
+  and at most ``max_pending`` chunks are in flight, so a sweep that is not
+  being consumed stops submitting work (backpressure).  A ``range`` over the
+  3.6M parameters of ``N3_B`` is never materialised;
+* **pluggable executors** -- ``"serial"`` runs in the calling process,
+  ``"thread"`` and ``"process"`` in a pool of ``workers``; any
+  ``concurrent.futures.Executor`` can be passed instead;
+* **deterministic order** -- pairs come out in the order of the indices,
+  whatever order the chunks finish in;
+* **resumable** -- a :class:`SweepCursor` records how many indices have been
+  consumed and a rerun with the same cursor starts there.
+
+The summary is :meth:`Summary.from_result` unless another ``summarize`` is
+given; it runs where the result is computed, so only what it returns crosses
+the process boundary.  :func:`stability_classes` and
+:func:`isomorphism_classes` are the spec-aware counterparts of
+``DSGRN_utils.StabilityQuery`` and ``IsomorphismQuery`` built on it, and
+:func:`rookfields.database.save_columnar_database` writes its shards from one.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import DSGRN
+from DSGRN_utils.MorseGraphQuery import network_edge_blowup
+
+from . import networks
+from .pipeline import MorseResult, conley_morse_graph
+from .spec import PAPER, Spec
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
+
+EXECUTORS = ("serial", "thread", "process")
+
+
+@dataclasses.dataclass(frozen=True)
+class Summary:
+    """The invariants of one result a sweep keeps: small and picklable.
+
+    Per-node tuples are in Morse-node order.  ``signature`` is the data
+    ``DSGRN_utils.morse_graph_signature`` compares.
+    """
+
+    conley: tuple[tuple[int, ...], ...]
+    num_cells: tuple[int, ...]
+    edges: tuple[tuple[int, int], ...]
+    stable: tuple[int, ...]
+    stg_size: tuple[int, int]
+    #: Wall time of the run; not compared.
+    seconds: float = dataclasses.field(compare=False)
+
+    @classmethod
+    def from_result(cls, result: MorseResult) -> Summary:
+        nodes = result.nodes
+        conley, cells = result.conley_indices, result.top_cell_counts
+        return cls(
+            conley=tuple(conley[n] for n in nodes),
+            num_cells=tuple(cells[n] for n in nodes),
+            edges=tuple(sorted(result.edges)),
+            stable=tuple(result.stable_nodes),
+            stg_size=result.stg_size,
+            seconds=result.seconds,
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.conley)
+
+    @property
+    def num_stable(self) -> int:
+        return len(self.stable)
+
+    @property
+    def signature(self) -> tuple:
+        return self.conley, self.edges
+
+
+@dataclasses.dataclass
+class SweepCursor:
+    """How far a sweep has got: the number of indices consumed.
+
+    ``key`` identifies the sweep (network, spec, level and, for a ``range``,
+    the indices); a cursor bound to one sweep refuses another.  With a
+    ``path`` the cursor is saved after every chunk and when the sweep is
+    closed, so :meth:`open` on the same path resumes it.  The pair being
+    handled when the sweep stopped is yielded again on resume.
+    """
+
+    path: Path | None = None
+    position: int = 0
+    key: str | None = None
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> SweepCursor:
+        """The cursor saved at ``path``, or a fresh one that will be saved there."""
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        stored = json.loads(path.read_text())
+        return cls(path, stored["position"], stored["key"])
+
+    def bind(self, key: str) -> None:
+        if self.key is None:
+            self.key = key
+        elif self.key != key:
+            raise ValueError(f"cursor {self.path} belongs to a different sweep")
+
+    def save(self) -> None:
+        """Write the cursor to its path, atomically; a no-op without one."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as handle:
+            json.dump({"position": self.position, "key": self.key}, handle)
+        os.replace(tmp, self.path)
+
+
+def sweep(
+    network,
+    indices: Iterable[int] | None = None,
+    *,
+    spec: Spec = PAPER,
+    level: int = 4,
+    summarize: Callable[[MorseResult], object] = Summary.from_result,
+    executor: str | Executor = "serial",
+    workers: int | None = None,
+    chunk_size: int = 64,
+    max_pending: int | None = None,
+    cursor: SweepCursor | None = None,
+    cache: ResultCache | None = None,
+) -> Iterator[tuple[int, object]]:
+    """Yield ``(index, summarize(result))`` for each index, in order.
+
+    ``network`` is a ``DSGRN.Network`` or a name in :mod:`rookfields.networks`;
+    ``indices`` defaults to the whole parameter graph.  ``executor`` is one of
+    :data:`EXECUTORS` or an executor the caller owns; ``max_pending`` (default
+    twice the workers) bounds the chunks in flight.  With ``"process"``,
+    ``summarize`` must be picklable: a module-level function, or a
+    ``functools.partial`` of one.
+    """
+    if isinstance(network, str):
+        network = networks.network(network)
+    net_spec, edge_blowup = network.specification(), network_edge_blowup(network)
+    if indices is None:
+        indices = range(_parameter_graph(net_spec, edge_blowup).size())
+    if cursor is not None:
+        cursor.bind(_sweep_key(net_spec, edge_blowup, spec, level, indices))
+        if isinstance(indices, range):
+            indices = indices[cursor.position :]
+        else:
+            indices = itertools.islice(indices, cursor.position, None)
+    run = functools.partial(_run_chunk, net_spec, edge_blowup, spec, level, cache, summarize)
+    chunks = _chunks(indices, chunk_size)
+
+    pool, owned = _executor(executor, workers)
+    if max_pending is None:
+        max_pending = 2 * getattr(pool, "_max_workers", 1)
+    pending: deque = deque()
+    try:
+        if pool is None:
+            outputs = ((chunk, run(chunk)) for chunk in chunks)
+        else:
+            outputs = _pipelined(pool, run, chunks, pending, max(1, max_pending))
+        for chunk, summaries in outputs:
+            for item in zip(chunk, summaries):
+                yield item
+                if cursor is not None:
+                    cursor.position += 1
+            if cursor is not None:
+                cursor.save()
+    finally:
+        for _, future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if cursor is not None:
+            cursor.save()
+
+
+def stability_classes(network, indices: Iterable[int] | None = None, **kwargs) -> defaultdict:
+    """``{number of attractors: set of indices}``, as ``DSGRN_utils.StabilityQuery``.
+
+    Keyword arguments are those of :func:`sweep` (``summarize`` excepted).
+    """
+    classes: defaultdict = defaultdict(set)
+    for index, summary in sweep(network, indices, **kwargs):
+        classes[summary.num_stable].add(index)
+    return classes
+
+
+def isomorphism_classes(network, indices: Iterable[int] | None = None, **kwargs) -> list[set[int]]:
+    """Sets of indices with the same Morse-graph signature, as
+    ``DSGRN_utils.IsomorphismQuery``, in order of first appearance."""
+    classes: defaultdict = defaultdict(set)
+    for index, summary in sweep(network, indices, **kwargs):
+        classes[summary.signature].add(index)
+    return list(classes.values())
+
+
+@functools.lru_cache(maxsize=None)
+def _parameter_graph(net_spec: str, edge_blowup: str):
+    return DSGRN.ParameterGraph(DSGRN.Network(net_spec, edge_blowup=edge_blowup))
+
+
+def _run_chunk(net_spec, edge_blowup, spec, level, cache, summarize, chunk) -> list:
+    """Summaries of one chunk; runs in the worker."""
+    parameter_graph = _parameter_graph(net_spec, edge_blowup)
+    return [
+        summarize(conley_morse_graph(parameter_graph.parameter(i), spec=spec, level=level, cache=cache))
+        for i in chunk
+    ]
+
+
+def _chunks(indices: Iterable[int], size: int) -> Iterator[list[int]]:
+    iterator = iter(indices)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _pipelined(pool: Executor, run, chunks, pending: deque, max_pending: int):
+    """``(chunk, summaries)`` in submission order, ``max_pending`` chunks ahead."""
+    for chunk in chunks:
+        pending.append((chunk, pool.submit(run, chunk)))
+        if len(pending) >= max_pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+    while pending:
+        chunk, future = pending.popleft()
+        yield chunk, future.result()
+
+
+def _executor(executor: str | Executor, workers: int | None) -> tuple[Executor | None, bool]:
+    """The pool to submit to and whether the sweep owns it."""
+    if isinstance(executor, Executor):
+        return executor, False
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS} or an Executor, not {executor!r}")
+    if executor == "serial":
+        return None, False
+    workers = workers or os.cpu_count() or 1
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers), True
+    return ProcessPoolExecutor(max_workers=workers), True
+
+
+def _sweep_key(net_spec: str, edge_blowup: str, spec: Spec, level: int, indices) -> str:
+    payload = {
+        "network": net_spec,
+        "edge_blowup": edge_blowup,
+        "spec": dataclasses.asdict(spec),
+        "level": level,
+        "indices": [indices.start, indices.stop, indices.step] if isinstance(indices, range) else None,
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode(), digest_size=16).hexdigest()
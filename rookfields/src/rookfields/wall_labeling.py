@@ -26,10 +26,14 @@ the right ``n``-wall is.
 
 from __future__ import annotations
 
+import dataclasses
 import itertools
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
 
+import numpy as np
 import pychomp
 
 
@@ -103,12 +107,21 @@ class WallLabeling:
 
     def _omega(self, wall, top) -> int:
         """``omega(xi, mu)`` for a codimension-one ``xi`` and ``mu`` above it."""
+        return self.label(*self._omega_term(wall, top))
+
+    def _omega_term(self, wall, top) -> tuple[int, int, int]:
+        """``(mu, n, side)`` with ``omega(xi, mu) = label(mu, n, side)``."""
         shape = self.complex.cell_shape(wall)
         n = next(k for k in range(self.dim) if not (shape & (1 << k)))
         wc = self.complex.coordinates(wall)
         tc = self.complex.coordinates(top)
         side = -1 if wc[n] == tc[n] else 1
-        return self.label(top, n, side)
+        return top, n, side
+
+    def slot(self, top_cell) -> int:
+        """Index of ``top_cell`` in ``labelling``."""
+        coords = self.complex.coordinates(top_cell)
+        return sum(c * self.pv[k] for k, c in enumerate(coords))
 
     def local_inducement_maps(self, sigma) -> list[dict[int, int]]:
         """Every ``o~_sigma`` compatible with this labeling at ``sigma``.
@@ -147,8 +160,12 @@ class WallLabeling:
         return True
 
     def is_valid(self) -> bool:
-        """``def:wall_labeling``: a local inducement map exists at every vertex."""
-        return all(self.local_inducement_maps(v) for v in self.vertices())
+        """``def:wall_labeling``: a local inducement map exists at every vertex.
+
+        Evaluated by :func:`labellings_valid`; :meth:`local_inducement_maps`
+        is the same condition, vertex by vertex.
+        """
+        return bool(labellings_valid([self.labelling], self.num_thresholds)[0])
 
     # -- defn:dissipativewall -------------------------------------------
 
@@ -188,6 +205,253 @@ def _dissipativity_mask(num_thresholds: list[int]) -> tuple[list[int], list[int]
     return forced_clear, num_boxes
 
 
+def _label_bit(dim: int, n: int, side: int) -> int:
+    """Bit of a label slot holding ``omega(mu^side_n, mu)``."""
+    return n + (dim if side == 1 else 0)
+
+
+def _compare(wl: WallLabeling, a: tuple, b: tuple) -> tuple[int, int, int, int, int]:
+    """``label(*a) == label(*b)`` as a comparison of two label bits.
+
+    ``label(mu, n, side)`` is ``side`` when the bit is set and ``-side``
+    otherwise, so the labels agree iff the bits agree (same sides) or differ
+    (opposite sides).  Returns ``(slot, bit, slot', bit', differ)``.
+    """
+    (mu, n, side), (mu_prime, n_prime, side_prime) = a, b
+    return (
+        wl.slot(mu),
+        _label_bit(wl.dim, n, side),
+        wl.slot(mu_prime),
+        _label_bit(wl.dim, n_prime, side_prime),
+        int(side != side_prime),
+    )
+
+
+@lru_cache(maxsize=None)
+def _vertex_constraints(num_thresholds: tuple[int, ...]) -> tuple:
+    """``def:wall_labeling`` at every vertex of ``X(I)``, compiled to bit comparisons.
+
+    One ``(slots, clauses)`` entry per vertex: ``clauses[n]`` holds a clause per
+    candidate ``o~_sigma(n)``, each a tuple of :func:`_compare` comparisons
+    (conditions (i) and (ii) of :meth:`WallLabeling._conditions_hold`), and
+    ``slots`` are the label slots they read.  The vertex condition holds iff
+    every ``clauses[n]`` has a clause whose comparisons all hold.
+    """
+    dim = len(num_thresholds)
+    wl = WallLabeling([0] * _num_slots(num_thresholds), list(num_thresholds))
+    vertices = []
+    for sigma in wl.vertices():
+        clauses = []
+        for n in range(dim):
+            per_candidate = []
+            for candidate in range(dim):
+                clause = set()
+                for mu, mu_prime in wl._adjacent_top_pairs(sigma, n):
+                    for k in range(dim):
+                        if k == n or k == candidate:
+                            continue
+                        for side in (-1, 1):
+                            clause.add(_compare(wl, (mu, k, side), (mu_prime, k, side)))
+                if n != candidate:
+                    for wall, (top, top_prime) in wl._n_walls_at(sigma, n):
+                        clause.add(
+                            _compare(wl, wl._omega_term(wall, top), wl._omega_term(wall, top_prime))
+                        )
+                per_candidate.append(tuple(sorted(clause)))
+            clauses.append(tuple(per_candidate))
+        slots = {c[i] for per_candidate in clauses for clause in per_candidate for c in clause for i in (0, 2)}
+        if slots:
+            vertices.append((tuple(sorted(slots)), tuple(clauses)))
+    return tuple(vertices)
+
+
+def _num_slots(num_thresholds) -> int:
+    total = 1
+    for k in num_thresholds:
+        total *= k + 1
+    return total
+
+
+@lru_cache(maxsize=None)
+def _validity_arrays(num_thresholds: tuple[int, ...]) -> tuple:
+    """:func:`_vertex_constraints` flattened to index arrays.
+
+    Returns ``(comparisons, terms, bounds)``: ``comparisons`` is an ``(m, 5)``
+    array of the distinct comparisons, clause ``c`` is made of the comparisons
+    ``terms[bounds[c]:bounds[c + 1]]``, and the clauses come ``dim`` at a time,
+    one per candidate, for every ``(vertex, n)``.
+    """
+    index: dict[tuple, int] = {}
+    terms: list[int] = []
+    bounds = [0]
+    for _, clauses in _vertex_constraints(num_thresholds):
+        for per_candidate in clauses:
+            for clause in per_candidate:
+                terms.extend(index.setdefault(c, len(index)) for c in clause)
+                bounds.append(len(terms))
+    comparisons = np.array(list(index), dtype=np.intp).reshape(-1, 5)
+    return comparisons, np.array(terms, dtype=np.intp), np.array(bounds, dtype=np.intp)
+
+
+def labellings_valid(labellings, num_thresholds: list[int]) -> np.ndarray:
+    """``def:wall_labeling`` for each row of a 2D array of labellings.
+
+    The conditions are compiled once per ``num_thresholds`` into bit
+    comparisons between label slots; a batch is checked with one XOR/AND per
+    comparison over all rows, a count of failed comparisons per clause, and
+    an any/all reduction over candidates and ``(vertex, n)``.  Returns a
+    boolean array with one entry per row.
+    """
+    labels = np.asarray(labellings, dtype=np.int64)
+    if labels.ndim != 2 or labels.shape[1] != _num_slots(num_thresholds):
+        raise ValueError(
+            f"expected labellings of {_num_slots(num_thresholds)} slots, got shape {labels.shape}"
+        )
+    dim = len(num_thresholds)
+    comparisons, terms, bounds = _validity_arrays(tuple(num_thresholds))
+    a, i, b, j, differ = comparisons.T
+    failed = (((labels[:, a] >> i) ^ (labels[:, b] >> j)) & 1) != differ
+    # Failed comparisons of each clause, as differences of running counts
+    counts = np.zeros((len(labels), len(terms) + 1), dtype=np.int32)
+    np.cumsum(failed[:, terms], axis=1, out=counts[:, 1:])
+    holds = counts[:, bounds[1:]] == counts[:, bounds[:-1]]
+    return holds.reshape(len(labels), -1, dim).any(axis=2).all(axis=1)
+
+
+def _vertex_holds(labelling: list[int], clauses: tuple) -> bool:
+    return all(
+        any(
+            all(((labelling[a] >> i) ^ (labelling[b] >> j)) & 1 == differ for a, i, b, j, differ in clause)
+            for clause in per_candidate
+        )
+        for per_candidate in clauses
+    )
+
+
+def _slot_values(num_thresholds: list[int], dissipative: bool) -> list[list[int]]:
+    """Every value of each label slot, in the order the free bits count up."""
+    dim = len(num_thresholds)
+    forced_clear, _ = _dissipativity_mask(num_thresholds)
+    values = []
+    for slot_mask in forced_clear:
+        free = [b for b in range(2 * dim) if not (dissipative and slot_mask & (1 << b))]
+        values.append(
+            [sum(1 << b for k, b in enumerate(free) if m & (1 << k)) for m in range(1 << len(free))]
+        )
+    return values
+
+
+def _valid_labellings(num_thresholds: list[int], dissipative: bool, rng=None):
+    """Backtracking search over the slots, pruned by the vertex conditions.
+
+    Slots are assigned from the last to the first, so labellings come out in
+    the order the free bits count up (slot 0 varies fastest).  A vertex is
+    checked as soon as the last of its slots is assigned; a failing vertex
+    discards every completion of the partial assignment.  With ``rng`` (a
+    ``numpy.random.Generator``) the values of each slot are tried in a random
+    order instead, drawn afresh every time the search reaches the slot.
+    """
+    values = _slot_values(num_thresholds, dissipative)
+    n_slots = len(values)
+    # Vertices completed by assigning each slot
+    checks: list[list[tuple]] = [[] for _ in range(n_slots)]
+    for slots, clauses in _vertex_constraints(tuple(num_thresholds)):
+        checks[slots[0]].append(clauses)
+    labelling = [0] * n_slots
+    choice = [0] * n_slots
+    depth = 0
+    if rng is not None:
+        rng.shuffle(values[n_slots - 1])
+    while depth >= 0:
+        slot = n_slots - 1 - depth
+        if choice[depth] == len(values[slot]):
+            choice[depth] = 0
+            depth -= 1
+            if depth >= 0:
+                choice[depth] += 1
+            continue
+        labelling[slot] = values[slot][choice[depth]]
+        if all(_vertex_holds(labelling, clauses) for clauses in checks[slot]):
+            if slot == 0:
+                yield list(labelling)
+                choice[depth] += 1
+            else:
+                depth += 1
+                if rng is not None:
+                    rng.shuffle(values[slot - 1])
+        else:
+            choice[depth] += 1
+
+
+def grid_symmetries(num_thresholds: list[int]) -> list[tuple[tuple[int, ...], tuple[int, ...]]]:
+    """The hyperoctahedral symmetries of the grid ``X(I)``, as label permutations.
+
+    Each symmetry reflects a subset of the coordinates (``c -> K(n) - c``) and
+    permutes coordinates with equal ``K(n)``.  It is returned as
+    ``(slot_map, value_map)``: the labelling ``L`` goes to ``L'`` with
+    ``L'[slot_map[s]] = value_map[L[s]]``.  Reflecting ``n`` swaps the left and
+    right ``n``-wall bits.  The identity comes first.
+    """
+    dim = len(num_thresholds)
+    num_boxes = [k + 1 for k in num_thresholds]
+    pv = [1]
+    for k in num_boxes:
+        pv.append(pv[-1] * k)
+    symmetries = []
+    for perm in itertools.permutations(range(dim)):
+        if any(num_thresholds[perm[n]] != num_thresholds[n] for n in range(dim)):
+            continue
+        for flips in itertools.product((False, True), repeat=dim):
+            slot_map = []
+            for coords in itertools.product(*[range(b) for b in reversed(num_boxes)]):
+                coords = coords[::-1]  # slot order: coordinate 0 fastest
+                image = [0] * dim
+                for n in range(dim):
+                    image[perm[n]] = num_thresholds[n] - coords[n] if flips[n] else coords[n]
+                slot_map.append(sum(c * pv[k] for k, c in enumerate(image)))
+            bit_map = [0] * (2 * dim)
+            for n in range(dim):
+                left, right = perm[n], perm[n] + dim
+                bit_map[n], bit_map[n + dim] = (right, left) if flips[n] else (left, right)
+            value_map = tuple(
+                sum(1 << bit_map[b] for b in range(2 * dim) if value & (1 << b))
+                for value in range(1 << (2 * dim))
+            )
+            symmetries.append((tuple(slot_map), value_map))
+    return symmetries
+
+
+def wall_labeling_orbits(num_thresholds: list[int], *, dissipative: bool = True, valid_only: bool = True):
+    """Yield ``(WallLabeling, orbit size)``, one per orbit of :func:`grid_symmetries`.
+
+    The representative of an orbit is its lexicographically smallest
+    labelling.  Validity and strong dissipativity are invariant under the
+    symmetries, so the orbit sizes add up to the number of labelings
+    :func:`enumerate_wall_labelings` yields with the same arguments.
+    """
+    symmetries = grid_symmetries(num_thresholds)
+    for labelling in _exhaustive(num_thresholds, dissipative, valid_only):
+        images = set()
+        for slot_map, value_map in symmetries:
+            image = [0] * len(labelling)
+            for s, value in enumerate(labelling):
+                image[slot_map[s]] = value_map[value]
+            images.add(tuple(image))
+        if min(images) == tuple(labelling):
+            yield WallLabeling(labelling, num_thresholds), len(images)
+
+
+#: Candidates drawn per batch by the seeded branch of :func:`enumerate_wall_labelings`.
+_SAMPLE_BATCH = 256
+
+
+def _exhaustive(num_thresholds: list[int], dissipative: bool, valid_only: bool):
+    if valid_only:
+        return _valid_labellings(num_thresholds, dissipative)
+    values = _slot_values(num_thresholds, dissipative)
+    return (list(reversed(choice)) for choice in itertools.product(*reversed(values)))
+
+
 def enumerate_wall_labelings(
     num_thresholds: list[int],
     *,
@@ -199,8 +463,20 @@ def enumerate_wall_labelings(
     """Yield ``WallLabeling`` objects on ``X(I)``.
 
     With ``seed`` the free bits are sampled uniformly at random (``limit``
-    samples); otherwise the free bits are enumerated exhaustively in order.
+    samples); otherwise the labelings are enumerated exhaustively, in the order
+    the free bits count up, by a backtracking search that prunes a partial
+    assignment as soon as one vertex fails ``def:wall_labeling``.  Strong
+    dissipativity needs no test: with ``dissipative`` the bits it forces are
+    never set.  :func:`wall_labeling_orbits` enumerates one labeling per
+    symmetry orbit instead, and :func:`sample_wall_labelings` samples in
+    parallel streams, or by MCMC where valid labelings are too rare to draw.
     """
+    if seed is None:
+        labellings = _exhaustive(num_thresholds, dissipative, valid_only)
+        for labelling in itertools.islice(labellings, limit):
+            yield WallLabeling(labelling, num_thresholds)
+        return
+
     dim = len(num_thresholds)
     forced_clear, num_boxes = _dissipativity_mask(num_thresholds)
     n_slots = len(forced_clear)
@@ -212,37 +488,219 @@ def enumerate_wall_labelings(
             if dissipative and (forced_clear[slot] & (1 << bit)):
                 continue
             free_bits.append((slot, bit))
-
-    def build(assignment: int) -> WallLabeling:
-        labelling = [0] * n_slots
-        for position, (slot, bit) in enumerate(free_bits):
-            if assignment & (1 << position):
-                labelling[slot] |= 1 << bit
-        return WallLabeling(labelling, num_thresholds)
+    # Row p adds bit p of an assignment to its slot
+    weights = np.zeros((len(free_bits), n_slots), dtype=np.int64)
+    for position, (slot, bit) in enumerate(free_bits):
+        weights[position, slot] = 1 << bit
+    num_bytes = max(1, (len(free_bits) + 7) // 8)
+
+    def build(assignments: list[int]) -> np.ndarray:
+        raw = b"".join(a.to_bytes(num_bytes, "little") for a in assignments)
+        bits = np.unpackbits(
+            np.frombuffer(raw, dtype=np.uint8).reshape(len(assignments), num_bytes),
+            axis=1,
+            bitorder="little",
+        )
+        return bits[:, : len(free_bits)].astype(np.int64) @ weights
 
     total = 1 << len(free_bits)
-    if seed is not None:
-        rng = random.Random(seed)
-        produced = 0
-        target = limit if limit is not None else 1000
-        while produced < target:
-            candidate = build(rng.randrange(total))
-            if valid_only and not candidate.is_valid():
-                continue
-            if dissipative and not candidate.is_strongly_dissipative():
-                continue
+    rng = random.Random(seed)
+    produced = 0
+    target = limit if limit is not None else 1000
+    while produced < target:
+        # Candidates are drawn and checked a batch at a time; the ones kept
+        # are yielded in the order drawn, so the stream does not depend on
+        # the batch size.
+        labellings = build([rng.randrange(total) for _ in range(_SAMPLE_BATCH)])
+        if valid_only:
+            labellings = labellings[labellings_valid(labellings, num_thresholds)]
+        for labelling in labellings[: target - produced].tolist():
             produced += 1
-            yield candidate
-        return
+            yield WallLabeling(labelling, num_thresholds)
 
-    produced = 0
-    for assignment in range(total):
-        candidate = build(assignment)
-        if valid_only and not candidate.is_valid():
-            continue
-        if dissipative and not candidate.is_strongly_dissipative():
-            continue
-        produced += 1
-        yield candidate
-        if limit is not None and produced >= limit:
-            return
+
+# -- sampling engine ----------------------------------------------------
+
+SAMPLING_METHODS = ("rejection", "mcmc")
+
+
+@dataclasses.dataclass
+class SamplerStats:
+    """What :func:`sample_wall_labelings` did to produce its sample.
+
+    For ``"rejection"`` a draw is a uniform candidate labelling and it is
+    accepted when valid; for ``"mcmc"`` a draw is a proposed move of the chain
+    and it is accepted when the labelling it leads to is valid.
+    """
+
+    method: str
+    samples: int
+    drawn: int
+    accepted: int
+    #: Wall time of the whole sample, workers included.
+    seconds: float
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.drawn if self.drawn else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Samples per second."""
+        return self.samples / self.seconds if self.seconds else float("inf")
+
+
+def sample_wall_labelings(
+    num_thresholds: list[int],
+    size: int,
+    *,
+    method: str = "rejection",
+    dissipative: bool = True,
+    seed: int = 0,
+    streams: int = 8,
+    workers: int = 1,
+    burn_in: int | None = None,
+    thin: int | None = None,
+) -> tuple[list[WallLabeling], SamplerStats]:
+    """Draw ``size`` ``def:wall_labeling``-valid labelings on ``X(I)``.
+
+    The sample is split over ``streams`` independent random streams spawned
+    from ``numpy.random.SeedSequence(seed)``, run in a pool of ``workers``
+    processes when ``workers > 1``; the labelings come out stream by stream,
+    so the sample depends on ``seed`` and ``streams`` but not on ``workers``.
+
+    ``method="rejection"`` draws uniform assignments of the free bits in
+    batches and keeps the valid ones (:func:`labellings_valid`): an exact
+    uniform sample, as slow as valid labelings are rare.  ``"mcmc"`` runs a
+    Metropolis chain per stream over the valid labelings instead.  A move
+    flips one free bit, or a random nonzero set of the free bits of the two
+    top cells of one wall, and is accepted when the vertices it touches stay
+    valid; the chain keeps one labeling every ``thin`` moves after
+    ``burn_in`` (both default to a multiple of the number of free bits).
+    Single-bit flips alone leave many valid labelings isolated, the zero
+    labeling among them; the wall moves connect all but a few of them on
+    the grids small enough to check, but not provably all, so the chain is
+    uniform on the labelings reachable from its start.  Each stream starts
+    from the first labeling of a backtracking search that tries the values
+    of every slot in a random order.
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"method must be one of {SAMPLING_METHODS}, not {method!r}")
+    start = time.perf_counter()
+    children = np.random.SeedSequence(seed).spawn(streams)
+    counts = [size // streams + (k < size % streams) for k in range(streams)]
+    tasks = [
+        (list(num_thresholds), method, dissipative, child, count, burn_in, thin)
+        for child, count in zip(children, counts)
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_sample_stream, *zip(*tasks)))
+    else:
+        results = [_sample_stream(*task) for task in tasks]
+    labelings = [
+        WallLabeling(labelling, num_thresholds) for labellings, _, _ in results for labelling in labellings
+    ]
+    stats = SamplerStats(
+        method=method,
+        samples=len(labelings),
+        drawn=sum(drawn for _, drawn, _ in results),
+        accepted=sum(accepted for _, _, accepted in results),
+        seconds=time.perf_counter() - start,
+    )
+    return labelings, stats
+
+
+def _sample_stream(num_thresholds, method, dissipative, seed_seq, count, burn_in, thin):
+    """``(labellings, drawn, accepted)`` of one stream; runs in the worker."""
+    rng = np.random.default_rng(seed_seq)
+    if method == "rejection":
+        return _rejection_stream(num_thresholds, dissipative, rng, count)
+    return _mcmc_stream(num_thresholds, dissipative, rng, count, burn_in, thin)
+
+
+def _free_bits(num_thresholds: list[int], dissipative: bool) -> list[tuple[int, int]]:
+    """``(slot, bit)`` of every bit strong dissipativity leaves free."""
+    forced_clear, _ = _dissipativity_mask(num_thresholds)
+    return [
+        (slot, bit)
+        for slot, mask in enumerate(forced_clear)
+        for bit in range(2 * len(num_thresholds))
+        if not (dissipative and mask & (1 << bit))
+    ]
+
+
+def _rejection_stream(num_thresholds, dissipative, rng, count):
+    free_bits = _free_bits(num_thresholds, dissipative)
+    weights = np.zeros((len(free_bits), _num_slots(num_thresholds)), dtype=np.int64)
+    for position, (slot, bit) in enumerate(free_bits):
+        weights[position, slot] = 1 << bit
+    kept: list[list[int]] = []
+    drawn = 0
+    while len(kept) < count:
+        labellings = rng.integers(0, 2, size=(_SAMPLE_BATCH, len(free_bits)), dtype=np.int64) @ weights
+        needed = count - len(kept)
+        rows = np.flatnonzero(labellings_valid(labellings, num_thresholds))[:needed]
+        kept.extend(labellings[rows].tolist())
+        # Draws past the last sample kept do not count
+        drawn += int(rows[-1]) + 1 if len(rows) == needed else _SAMPLE_BATCH
+    return kept, drawn, count
+
+
+def _mcmc_stream(num_thresholds, dissipative, rng, count, burn_in, thin):
+    free_bits = _free_bits(num_thresholds, dissipative)
+    free_mask = [0] * _num_slots(num_thresholds)
+    for slot, bit in free_bits:
+        free_mask[slot] |= 1 << bit
+    walls = _walls(num_thresholds)
+    # Vertex conditions reading each slot
+    constraints = _vertex_constraints(tuple(num_thresholds))
+    touching: list[list[int]] = [[] for _ in free_mask]
+    for v, (slots, _) in enumerate(constraints):
+        for slot in slots:
+            touching[slot].append(v)
+    if burn_in is None:
+        burn_in = 10 * len(free_bits)
+    if thin is None:
+        thin = max(1, len(free_bits))
+
+    labelling = next(_valid_labellings(num_thresholds, dissipative, rng))
+    kept: list[list[int]] = []
+    drawn = accepted = 0
+    if not free_bits:
+        return [list(labelling) for _ in range(count)], 0, 0
+    for step in range(burn_in + count * thin):
+        if not walls or rng.random() < 0.5:
+            slot, bit = free_bits[rng.integers(len(free_bits))]
+            move = {slot: 1 << bit}
+        else:
+            move = {}
+            while not any(move.values()):
+                move = {slot: int(rng.integers(1 << (2 * len(num_thresholds)))) & free_mask[slot]
+                        for slot in walls[rng.integers(len(walls))]}
+        drawn += 1
+        for slot, flip in move.items():
+            labelling[slot] ^= flip
+        checked = {v for slot in move for v in touching[slot]}
+        if all(_vertex_holds(labelling, constraints[v][1]) for v in checked):
+            accepted += 1
+        else:
+            for slot, flip in move.items():
+                labelling[slot] ^= flip
+        if step >= burn_in and (step - burn_in + 1) % thin == 0:
+            kept.append(list(labelling))
+    return kept, drawn, accepted
+
+
+def _walls(num_thresholds: list[int]) -> list[tuple[int, int]]:
+    """The two label slots of every interior wall: top cells ``n``-adjacent in ``X``."""
+    dim = len(num_thresholds)
+    pv = [1]
+    for k in num_thresholds:
+        pv.append(pv[-1] * (k + 1))
+    walls = []
+    for slot in range(pv[-1]):
+        for n in range(dim):
+            if (slot // pv[n]) % (num_thresholds[n] + 1) < num_thresholds[n]:
+                walls.append((slot, slot + pv[n]))
+    return walls
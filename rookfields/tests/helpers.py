@@ -0,0 +1,14 @@
+"""Helpers shared by the test modules."""
+
+from __future__ import annotations
+
+from rookfields import networks
+
+
+def sample(name, limit=25):
+    """At most ``limit`` parameter indices of ``name``, evenly spaced."""
+    total = networks.parameter_graph(name).size()
+    if total <= limit:
+        return list(range(total))
+    step = max(1, total // limit)
+    return list(range(0, total, step))[:limit]
@@ -0,0 +1,47 @@
+"""`rookfields.audit`: the pooled audit run and the edge digests."""
+
+from __future__ import annotations
+
+from rookfields import PAPER, SpecCubicalBlowupGraph
+from rookfields import networks
+
+from helpers import sample
+
+
+def test_parallel_audit_matches_serial_audit():
+    """`audit.run` folds chunked worker output into the rows a serial run gives.
+
+    An empty sample still reports a zero suppression row.
+    """
+    from rookfields import audit
+
+    kwargs = dict(families=[("N2_a", 12), ("cycle3", 0)], levels=(2, 3))
+    serial = audit.run(jobs=1, **kwargs)
+    parallel = audit.run(jobs=2, **kwargs)
+    assert parallel["rows"] == serial["rows"]
+    assert parallel["unstable_edge_suppression"] == serial["unstable_edge_suppression"]
+    empty = serial["unstable_edge_suppression"][-1]
+    assert empty["network"] == "cycle3"
+    assert empty["sampled"] == empty["missing_U_edges"] == empty["cells_with_nonempty_U"] == 0
+
+
+def test_edge_digest_tracks_the_edge_set():
+    """`edge_array` round-trips to `digraph.edges()`, and `edge_digest` is
+    equal for equal graphs and differs once an edge is added."""
+    from rookfields.audit import edge_array, edge_digest
+
+    for index in sample("N2_a", limit=4):
+        p = networks.parameter("N2_a", index)
+        stg = SpecCubicalBlowupGraph(p, spec=PAPER, level=3)
+        ncells = stg.complex().size()
+        decoded = {(int(u), int(v)) for u, v in zip(*divmod(edge_array(stg), ncells))}
+        assert decoded == set(stg.digraph.edges())
+
+        again = SpecCubicalBlowupGraph(p, spec=PAPER, level=3)
+        assert edge_digest(again) == edge_digest(stg)
+        u = next(iter(stg.digraph.vertices()))
+        v = next(w for w in stg.digraph.vertices() if w not in stg.digraph.adjacencies(u))
+        again.digraph.add_edge(u, v)
+        changed = edge_digest(again)
+        assert changed != edge_digest(stg)
+        assert changed.count == edge_digest(stg).count + 1
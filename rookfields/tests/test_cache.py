@@ -0,0 +1,55 @@
+"""`rookfields.cache.ResultCache`: stored results read back as computed."""
+
+from __future__ import annotations
+
+from rookfields import PAPER
+from rookfields import networks
+
+from helpers import sample
+
+
+def test_result_cache_round_trip(tmp_path):
+    """A result read back from the cache matches the computed one, including
+    the grading of the STG and complexes rebuilt from the entry."""
+    from rookfields import conley_morse_graph
+    from rookfields.cache import ResultCache
+
+    for edges in (True, False):
+        cache = ResultCache(tmp_path / str(edges), edges=edges)
+        for index in sample("N3_B", limit=2):
+            p = networks.parameter("N3_B", index)
+            computed = conley_morse_graph(p, spec=PAPER, level=4, cache=cache)
+            stored = conley_morse_graph(p, spec=PAPER, level=4, cache=cache)
+            assert stored is not computed
+            assert stored.conley_indices == computed.conley_indices
+            assert stored.edges == computed.edges
+            assert stored.top_cell_counts == computed.top_cell_counts
+            assert stored.diagnostics == computed.diagnostics
+            assert stored.stg_size == computed.stg_size
+            for node in computed.nodes:
+                assert stored.morse_set_cells(node) == computed.morse_set_cells(node)
+            assert set(stored.stg.digraph.edges()) == set(computed.stg.digraph.edges())
+            gc = stored.graded_complex
+            for cell in computed.stg.digraph.vertices():
+                assert gc.value(cell) == computed.graded_complex.value(cell)
+        assert cache.hits and cache.misses
+
+
+def test_result_cache_recovers_from_a_truncated_entry(tmp_path):
+    """A half-written entry is a miss: the result is recomputed and stored again."""
+    from rookfields import conley_morse_graph
+    from rookfields.cache import ResultCache, result_key
+
+    cache = ResultCache(tmp_path)
+    p = networks.parameter("N2_a", 122)
+    computed = conley_morse_graph(p, spec=PAPER, level=4, cache=cache)
+    stg = computed.stg
+    path = cache.path(result_key(stg.labelling, stg.num_thresholds, PAPER, 4))
+    path.write_bytes(path.read_bytes()[: path.stat().st_size // 2])
+
+    again = conley_morse_graph(p, spec=PAPER, level=4, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert again.edges == computed.edges
+    stored = conley_morse_graph(p, spec=PAPER, level=4, cache=cache)
+    assert cache.hits == 1
+    assert stored.conley_indices == computed.conley_indices
@@ -0,0 +1,85 @@
+"""Database exports: JSON, JSON Lines and columnar shards."""
+
+from __future__ import annotations
+
+import pytest
+
+from rookfields import LEGACY, PAPER
+from rookfields import networks
+
+from helpers import sample
+
+
+def test_jsonl_database_resumes_interrupted_export(tmp_path):
+    """The JSON Lines export reads back as the single-object export, and an
+    export cut off mid-record finishes to the same file when rerun."""
+    import json
+
+    import DSGRN_utils
+
+    net = networks.network("N2_a")
+    indices = sample("N2_a", limit=6)
+    DSGRN_utils.save_morse_graph_database_json(net, tmp_path / "db.json", indices)
+    DSGRN_utils.save_morse_graph_database_jsonl(net, tmp_path / "db.jsonl", indices)
+    full = (tmp_path / "db.jsonl").read_text()
+    assert DSGRN_utils.load_morse_graph_database_jsonl(tmp_path / "db.jsonl") == json.loads(
+        (tmp_path / "db.json").read_text()
+    )
+
+    lines = full.split("\n")
+    (tmp_path / "cut.jsonl").write_text("\n".join(lines[:3]) + "\n" + lines[3][:50])
+    DSGRN_utils.save_morse_graph_database_jsonl(net, tmp_path / "cut.jsonl", indices)
+    assert (tmp_path / "cut.jsonl").read_text() == full
+
+    # a resume with other settings or parameters is refused, not appended
+    for kwargs in ({"level": 3}, {"legacy": True}, {"param_indices": indices[:-1]}):
+        kwargs = {"param_indices": indices, **kwargs}
+        with pytest.raises(ValueError):
+            DSGRN_utils.save_morse_graph_database_jsonl(net, tmp_path / "cut.jsonl", **kwargs)
+    assert (tmp_path / "cut.jsonl").read_text() == full
+
+
+def test_database_export_matches_dsgrn_utils(tmp_path):
+    """The pipeline-based export writes what DSGRN_utils writes under LEGACY."""
+    import DSGRN_utils
+
+    from rookfields.database import save_database_json
+
+    net = networks.network("N2_a")
+    indices = sample("N2_a", limit=6)
+    DSGRN_utils.save_morse_graph_database_json(net, tmp_path / "a.json", indices, legacy=True)
+    save_database_json(net, tmp_path / "b.json", indices, spec=LEGACY)
+    assert (tmp_path / "a.json").read_text() == (tmp_path / "b.json").read_text()
+
+
+def test_columnar_database_round_trip(tmp_path):
+    """Records read back from the shards match the pipeline, and a sweep
+    resumed after losing a shard ends with every parameter once."""
+    import shutil
+
+    import numpy as np
+
+    from rookfields import conley_morse_graph
+    from rookfields.database import save_columnar_database
+
+    net = networks.network("N2_a")
+    indices = sample("N2_a", limit=12)
+    db = save_columnar_database(net, tmp_path / "db", indices, shard_size=5, stg=True)
+    assert sorted(db.parameters.tolist()) == sorted(indices)
+    for index in indices[:4]:
+        result = conley_morse_graph(networks.parameter("N2_a", index), spec=PAPER)
+        record = db.record(index)
+        assert record["conley"] == [result.conley_indices[n] for n in result.nodes]
+        assert record["edges"] == result.edges
+        assert record["stable"] == result.stable_nodes
+        assert np.array_equal(record["grades"], result.grading_index.grades)
+        indptr, targets = record["stg"]
+        offset = result.stg.blowup_tables.top_offset
+        assert {(offset + p, offset + int(t)) for p in range(len(indptr) - 1)
+                for t in targets[indptr[p]:indptr[p + 1]]} == set(result.stg.digraph.edges())
+    stable = dict(zip(db.parameters.tolist(), db.column("num_stable").tolist()))
+
+    shutil.rmtree(db.shards[-1])
+    db = save_columnar_database(net, tmp_path / "db", indices, shard_size=5, stg=True)
+    assert sorted(db.parameters.tolist()) == sorted(indices)
+    assert dict(zip(db.parameters.tolist(), db.column("num_stable").tolist())) == stable
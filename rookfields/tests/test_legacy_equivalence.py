@@ -9,6 +9,10 @@ here:
   identical;
 * ``PAPER`` reproduces the new default, so ``rookfields`` and plain
   ``DSGRN_utils`` cannot drift apart.
+
+The faster ways of building the same graphs -- cell tables, parallel slabs,
+graphs shared between specs, levels and wall labellings -- are pinned to the
+plain build here too.
 """
 
 from __future__ import annotations
@@ -19,18 +23,12 @@ from DSGRN_utils.CubicalBlowupGraph import CubicalBlowupGraph
 from rookfields import LEGACY, PAPER, SpecCubicalBlowupGraph
 from rookfields import networks
 
+from helpers import sample
+
 FAMILIES = ["toggle", "repressilator", "cycle3", "cycle4"]
 LEVELS = [0, 1, 2, 3, 4]
 
 
-def sample(name, limit=25):
-    total = networks.parameter_graph(name).size()
-    if total <= limit:
-        return list(range(total))
-    step = max(1, total // limit)
-    return list(range(0, total, step))[:limit]
-
-
 @pytest.mark.parametrize("name", FAMILIES)
 @pytest.mark.parametrize("level", LEVELS)
 def test_legacy_matches_dsgrn_utils_legacy_mode(name, level):
@@ -68,3 +66,186 @@ def test_legacy_matches_on_vertices_too(name):
         )
         actual = set(SpecCubicalBlowupGraph(p, spec=LEGACY, level=4).digraph.vertices())
         assert actual == expected
+
+
+@pytest.mark.parametrize("name", ["repressilator", "cycle4"])
+@pytest.mark.parametrize("spec", [LEGACY, PAPER], ids=str)
+def test_table_mode_matches_pychomp_mode(name, spec):
+    """``tables=True`` only changes where cell geometry is read from."""
+    for index in sample(name, limit=5):
+        p = networks.parameter(name, index)
+        expected = SpecCubicalBlowupGraph(p, spec=spec, level=4)
+        actual = SpecCubicalBlowupGraph(p, spec=spec, level=4, tables=True)
+        assert actual.digraph.adjacency_lists == expected.digraph.adjacency_lists
+        assert actual.diagnostics == expected.diagnostics
+
+
+def test_cell_tables_match_pychomp():
+    """Coordinates, shapes, fringe flags and (ordered) top stars agree with pychomp."""
+    import pychomp
+    from DSGRN_utils.CubicalTables import CubicalTables
+
+    for boxes in ([3, 4], [3, 2, 4]):
+        cc = pychomp.CubicalComplex(boxes)
+        tables = CubicalTables(boxes)
+        assert tables.num_cells == len(cc)
+        for cell in cc:
+            assert tables.coords[cell].tolist() == list(cc.coordinates(cell))
+            assert tables.shape[cell] == cc.cell_shape(cell)
+            assert bool(tables.fringe[cell]) == bool(cc.rightfringe(cell))
+            top_star = [c for c in cc.topstar(cell) if not cc.rightfringe(c)]
+            assert tables.top_star(cell) == top_star
+            star = {c for c in cc.star({cell}) if not cc.rightfringe(c)}
+            assert sorted(tables.star(cell)) == sorted(star)
+
+
+@pytest.mark.parametrize("name", ["cycle3", "cycle4"])
+def test_rook_tables_match_scalar_evaluation(name):
+    """The batched rook field and its reductions agree with the per-cell code."""
+    for index in sample(name, limit=3):
+        p = networks.parameter(name, index)
+        scalar = CubicalBlowupGraph(p, level=0)
+        batched = CubicalBlowupGraph(p, level=0, tables=True)
+        for cell in scalar.cubical_complex:
+            assert batched.gradient_directions(cell) == scalar.gradient_directions(cell)
+            assert batched.opaque_directions(cell) == scalar.opaque_directions(cell)
+            assert batched.equilibrium_cell(cell) == scalar.equilibrium_cell(cell)
+            for top in scalar.top_star(cell):
+                assert batched.rook_field(cell, top) == scalar.rook_field(cell, top)
+            for n in scalar.inessential_directions(cell):
+                for k in range(scalar.dim):
+                    assert batched.active_regulation(cell, n, k) == scalar.active_regulation(cell, n, k)
+
+
+def test_blowup_translation_matches_cell_index():
+    """The translation tables agree with the coordinate rule u = 2v + w."""
+    import pychomp
+    from DSGRN_utils.CubicalTables import BlowupTables
+
+    for boxes in ([3, 4], [2, 3, 2]):
+        dim = len(boxes)
+        cc = pychomp.CubicalComplex(boxes)
+        blowup = pychomp.CubicalComplex([2 * k for k in boxes])
+        tables = BlowupTables(boxes)
+        for cell in blowup(dim):
+            coords = blowup.coordinates(cell)
+            shape = sum((u % 2) << n for n, u in enumerate(coords))
+            cc_cell = cc.cell_index([u // 2 for u in coords], shape)
+            assert tables.blowup2cubical[cell % tables.num_positions] == cc_cell
+            assert tables.cubical2blowup[cc_cell] == cell
+
+
+@pytest.mark.parametrize("boxes", [(4, 6), (6, 4, 6), (6, 6, 6, 4)])
+def test_fringe_tables_match_pychomp(boxes):
+    """The fringe masks equal the star/boundary walks they replace."""
+    import pychomp
+    from DSGRN_utils.CubicalTables import FringeTables
+
+    cc = pychomp.CubicalComplex(list(boxes))
+    tables = FringeTables(boxes)
+
+    def in_closure(cell):
+        return any(cc.rightfringe(s) for s in cc.star({cell}))
+
+    assert tables.num_cells == cc.size()
+    for cell in range(0, cc.size(), 5):
+        assert tables.fringe[cell] == cc.rightfringe(cell)
+        assert tables.fringe_closure[cell] == in_closure(cell)
+        near = in_closure(cell) or any(in_closure(b) for b in cc.boundary({cell}))
+        assert tables.near_fringe[cell] == near
+
+
+def _assert_same_graph(graph, alone):
+    """``graph`` has the edges of ``alone``, in the same adjacency order, and
+    reports the same diagnostics."""
+    for v in alone.digraph.vertices():
+        assert list(graph.digraph.adjacencies(v)) == list(alone.digraph.adjacencies(v))
+    assert graph.diagnostics == alone.diagnostics
+    assert graph.conflicting_pairs == alone.conflicting_pairs
+
+
+@pytest.mark.parametrize("spec", [LEGACY, PAPER], ids=str)
+def test_parallel_build_matches_serial_build(spec):
+    """Slabs are replayed in serial order: same adjacency order, same diagnostics."""
+    for index in sample("cycle3", limit=3):
+        p = networks.parameter("cycle3", index)
+        serial = SpecCubicalBlowupGraph(p, spec=spec, level=4)
+        parallel = SpecCubicalBlowupGraph(p, spec=spec, level=4, workers=2)
+        assert list(parallel.digraph.vertices()) == list(serial.digraph.vertices())
+        _assert_same_graph(parallel, serial)
+        assert parallel.out_of_range_pairs == serial.out_of_range_pairs
+
+
+@pytest.mark.parametrize("name", ["repressilator", "N3_B"])
+def test_grading_index_matches_graded_complex(name):
+    """Morse sets read from the grading index are the cells of each SCC."""
+    from rookfields import conley_morse_graph
+
+    for index in sample(name, limit=3):
+        result = conley_morse_graph(networks.parameter(name, index), spec=PAPER, level=4)
+        gc = result.graded_complex
+        grading_index = result.grading_index
+        for v in result.morse_graph.vertices():
+            node, num_cells, _ = result.morse_graph.vertex_label(v)
+            cells = {c for c in result.stg.digraph.vertices() if gc.value(c) == v}
+            assert grading_index.node_grades[node] == v
+            assert result.morse_set_cells(node) == cells
+            assert num_cells == len(cells) == gc.count()[v][-1]
+
+
+@pytest.mark.parametrize("tables", [False, True], ids=["pychomp", "tables"])
+def test_shared_spec_build_matches_separate_builds(tables):
+    """Graphs built together for every spec equal the graphs built one by one."""
+    from rookfields import ALL_SPECS
+    from rookfields.blowup import build_spec_graphs
+
+    specs = list(ALL_SPECS.values())
+    for index in sample("cycle3", limit=3):
+        p = networks.parameter("cycle3", index)
+        shared = build_spec_graphs(specs, p, level=4, tables=tables)
+        for spec, graph in zip(specs, shared):
+            alone = SpecCubicalBlowupGraph(p, spec=spec, level=4, tables=tables)
+            assert graph.spec is spec
+            _assert_same_graph(graph, alone)
+
+
+def test_level_sweep_matches_separate_builds():
+    """F_1 .. F_4 built level by level equal the graphs built one by one."""
+    from rookfields import ALL_SPECS
+    from rookfields.blowup import SharedCellData, build_level_graphs
+
+    for index in sample("cycle3", limit=2):
+        p = networks.parameter("cycle3", index)
+        shared = SharedCellData()
+        for spec in ALL_SPECS.values():
+            graphs = build_level_graphs((1, 2, 3, 4), p, spec=spec, shared=shared)
+            for level, graph in graphs.items():
+                alone = SpecCubicalBlowupGraph(p, spec=spec, level=level)
+                _assert_same_graph(graph, alone)
+
+
+def _edge_counts(graphs):
+    return [len(list(graph.digraph.edges())) for graph in graphs]
+
+
+def test_labelling_batch_matches_separate_builds():
+    """Graphs of many labellings built on one GridGeometry equal the graphs
+    built one by one, serially and in a process pool."""
+    from rookfields import ALL_SPECS
+    from rookfields.blowup import _worker_geometry, iter_labelling_graphs, map_labellings
+
+    specs = list(ALL_SPECS.values())
+    parameters = [networks.parameter("cycle3", index) for index in sample("cycle3", limit=4)]
+    labellings = [SpecCubicalBlowupGraph(p, level=0).labelling for p in parameters]
+    num_thresholds = SpecCubicalBlowupGraph(parameters[0], level=0).num_thresholds
+    batch = iter_labelling_graphs(labellings, num_thresholds, specs, level=4)
+    for labelling, graphs in zip(labellings, batch):
+        for spec, graph in zip(specs, graphs):
+            alone = SpecCubicalBlowupGraph(
+                labelling=labelling, num_thresholds=num_thresholds, spec=spec, level=4, tables=True
+            )
+            _assert_same_graph(graph, alone)
+    serial = list(map_labellings(_edge_counts, labellings, num_thresholds, specs, level=4))
+    assert _worker_geometry.cache_info().currsize == 0  # nothing kept in this process
+    pooled = map_labellings(_edge_counts, labellings, num_thresholds, specs, level=4, workers=2, chunk_size=1)
+    assert list(pooled) == serial
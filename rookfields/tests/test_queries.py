@@ -0,0 +1,147 @@
+"""The `DSGRN_utils` queries and parameter-graph helpers against direct
+computation."""
+
+from __future__ import annotations
+
+import pytest
+
+from rookfields import networks
+
+from helpers import sample
+
+
+def test_queries_share_a_resumable_cache(tmp_path):
+    """Chunked, pooled queries answer as the serial loop does, and a cache
+    file cut off mid-record is finished by the next query."""
+    from collections import defaultdict
+
+    import DSGRN_utils
+
+    net = networks.network("N2_a")
+    indices = sample("N2_a", limit=12)
+    stability, classes = defaultdict(set), defaultdict(set)
+    for index in indices:
+        morse_graph = DSGRN_utils.ConleyMorseGraph(networks.parameter("N2_a", index))[0]
+        stability[len([v for v in morse_graph.vertices() if not morse_graph.adjacencies(v)])].add(index)
+        classes[DSGRN_utils.morse_graph_signature(morse_graph)].add(index)
+
+    # indices may be any iterable, read once
+    assert DSGRN_utils.StabilityQuery(net, (i for i in indices), chunk_size=5) == stability
+    assert DSGRN_utils.StabilityQuery(net, iter(indices), fast=True, workers=2) == stability
+    assert DSGRN_utils.IsomorphismQuery(net, iter(indices), workers=2, chunk_size=3) == list(classes.values())
+
+    fname = tmp_path / "query.jsonl"
+    cache = DSGRN_utils.QueryCache(fname)
+    assert DSGRN_utils.StabilityQuery(net, indices, workers=2, chunk_size=5, cache=cache) == stability
+    assert len(cache) == len(indices)
+    assert DSGRN_utils.IsomorphismQuery(net, indices, cache=cache) == list(classes.values())
+
+    text = fname.read_text()
+    fname.write_text(text[: len(text) // 2])
+    cache = DSGRN_utils.QueryCache(fname)
+    assert 0 < len(cache) < len(indices)
+    assert DSGRN_utils.IsomorphismQuery(net, indices, chunk_size=5, cache=cache) == list(classes.values())
+    assert fname.read_text().count("\n") == len(indices) + 1
+    with pytest.raises(ValueError):
+        DSGRN_utils.StabilityQuery(net, indices, level=3, cache=cache)
+
+
+@pytest.mark.parametrize("name", ["N2_a", "repressilator", "cycle4"])
+@pytest.mark.parametrize("prune_grad", [True, False])
+def test_attractor_count_matches_morse_graph(name, prune_grad):
+    """Counting attractors from the SCCs alone agrees with the Morse graph."""
+    import DSGRN_utils
+
+    for index in sample(name, limit=12):
+        morse_graph, stg, _ = DSGRN_utils.ConleyMorseGraph(
+            networks.parameter(name, index), prune_grad=prune_grad
+        )
+        attractors = [v for v in morse_graph.vertices() if not morse_graph.adjacencies(v)]
+        assert DSGRN_utils.NumberOfAttractors(stg, prune_grad) == len(attractors)
+    if prune_grad:  # the rule StabilityQuery uses
+        net, indices = networks.network(name), sample(name, limit=12)
+        fast = DSGRN_utils.StabilityQuery(net, indices, fast=True)
+        assert fast == DSGRN_utils.StabilityQuery(net, indices)
+
+
+#: N2_a parameters whose Morse graphs have 2 to 10 nodes and up to 13 edges.
+DEEP_N2_A = [2, 47, 49, 121, 122, 124, 126, 146, 147, 306, 307]
+
+
+@pytest.mark.parametrize("index", [0, *DEEP_N2_A])
+def test_morse_graph_matches_transitive_closure(index):
+    """`MorseGraph`'s one-sweep reachability and ranks against the definitions.
+
+    The reference takes each Morse node's descendants from
+    `scc_dag.descendants`, ranks by recursion, and reduces the closure by hand.
+    """
+    import DSGRN_utils
+    import pychomp
+
+    stg = DSGRN_utils.CubicalBlowupGraph(parameter=networks.parameter("N2_a", index))
+    scc_dag, graded_complex = pychomp.FlowGradedComplex(stg.complex(), stg.adjacencies())
+    connection_matrix = pychomp.ConnectionMatrix(graded_complex)
+    morse_graph = DSGRN_utils.MorseGraph(stg, scc_dag, graded_complex, connection_matrix)
+
+    verts = set(morse_graph.vertices())
+    below = {v: {u for u in scc_dag.descendants(v) if u in verts and u != v} for v in verts}
+    ranks = {}
+
+    def rank(v):
+        if v not in ranks:
+            ranks[v] = max((rank(u) + 1 for u in below[v]), default=0)
+        return ranks[v]
+
+    order = sorted(sorted(verts), key=rank)
+    assert [morse_graph.vertex_label(v)[0] for v in order] == list(range(len(order)))
+    reduced = {
+        (v, u)
+        for v in verts
+        for u in below[v]
+        if not any(u in below[w] for w in below[v])
+    }
+    edges = {(v, u) for v in verts for u in morse_graph.adjacencies(v)}
+    assert edges == reduced
+
+
+@pytest.mark.parametrize("name", ["N2_a", "cycle4"])
+def test_active_edge_weights_match_parameters(name):
+    """The weight table decodes parameter indices as DSGRN does."""
+    import DSGRN_utils
+
+    pg = networks.parameter_graph(name)
+    weights = DSGRN_utils.ActiveEdgeWeights(pg)
+    table = weights.array()
+    assert len(table) == pg.size()
+    for index in sample(name, limit=60):
+        assert DSGRN_utils.number_active_edges(index, pg) == weights(index) == table[index]
+    starts = [index for index in sample(name, limit=60) if table[index] <= 1][:6]
+    assert DSGRN_utils.get_all_paths(starts, pg) == {
+        start: DSGRN_utils.paths_from_node(start, pg) for start in starts
+    }
+
+
+def test_continuation_paths_match_morse_components():
+    """The batched check agrees with comparing MorseComponent cell sets."""
+    import DSGRN_utils
+
+    pg = networks.parameter_graph("N2_a")
+    table = DSGRN_utils.ActiveEdgeWeights(pg).array()
+    starts = [int(index) for index in (table == table.min()).nonzero()[0][:8]]
+    paths = [path for found in DSGRN_utils.get_all_paths(starts, pg, max_weight=int(table.min()) + 2).values()
+             for path in found][:25]
+
+    def stable_sets(index):
+        morse_graph, stg, graded_complex = DSGRN_utils.ConleyMorseGraph(pg.parameter(index), level=3)
+        return [
+            set(DSGRN_utils.MorseComponent(morse_graph, stg, graded_complex,
+                                           morse_graph.vertex_label(v)[0])[0])
+            for v in morse_graph.vertices() if not morse_graph.adjacencies(v)
+        ], len(morse_graph.vertices())
+
+    expected = []
+    for path in paths:
+        initial, num_nodes = stable_sets(path[0])
+        expected.append(num_nodes == 1 and all(initial[0] in stable_sets(n)[0] for n in path[1:]))
+    assert any(expected) and not all(expected)
+    assert DSGRN_utils.continuation_paths(paths, pg, workers=2, chunk_size=4) == expected
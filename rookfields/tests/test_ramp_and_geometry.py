@@ -33,6 +33,38 @@ def test_index_set_matches_the_text(spec):
     assert spec.index_set == spec.claimed_index_set
 
 
+# ---------------------------------------------------------------------------
+# the compiled field agrees with the scalar ramp functions
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("spec", SYSTEMS, ids=IDS)
+@pytest.mark.parametrize("h", [None, ADMISSIBLE_WIDTH, 2.0])
+def test_compiled_production_matches_ramp_function(spec, h):
+    """`RampSystem.production` over a batch is `RampSpec.production` point by point.
+
+    The batch includes every window endpoint, where `ramp_function` takes the
+    plateau value; `h = 2` makes windows overlap, which the compiled ramps
+    hand back to `ramp_function`.
+    """
+    spec = spec if h is None else spec.with_uniform_width(h)
+    system = RampSystem(spec)
+    rng = np.random.default_rng(0)
+    points = [rng.uniform(0.0, system.global_bound, size=(200, system.dim))]
+    for ramp in system.compiled.ramps:
+        on_break = rng.uniform(0.0, system.global_bound, size=(len(ramp.breaks), system.dim))
+        on_break[:, ramp.source] = ramp.breaks
+        points.append(on_break)
+    points = np.concatenate(points)
+
+    expected = np.array([spec.production(list(p)) for p in points])
+    assert np.array_equal(system.production(points), expected)
+    assert np.array_equal(np.array([system.production(p) for p in points]), expected)
+    assert np.array_equal(
+        system.vector_field(points), np.array([spec.vector_field(list(p)) for p in points])
+    )
+
+
 # ---------------------------------------------------------------------------
 # defn:ramp-wall-labeling
 # ---------------------------------------------------------------------------
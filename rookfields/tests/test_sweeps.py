@@ -0,0 +1,35 @@
+"""`rookfields.sweeps`: ordered, pooled and resumable parameter sweeps."""
+
+from __future__ import annotations
+
+import pytest
+
+from rookfields import networks
+
+
+def test_sweep_is_ordered_and_resumable(tmp_path):
+    """Every executor yields the serial sweep, the classes match the
+    DSGRN_utils queries, and a cursor resumes a sweep that was stopped."""
+    import itertools
+
+    import DSGRN_utils
+
+    from rookfields import SweepCursor, sweep
+    from rookfields.sweeps import isomorphism_classes, stability_classes
+
+    net = networks.network("N2_a")
+    indices = range(0, 1600, 64)
+    serial = list(sweep(net, indices, chunk_size=4))
+    assert [index for index, _ in serial] == list(indices)
+    for executor in ("thread", "process"):
+        assert list(sweep(net, indices, executor=executor, workers=2, chunk_size=3)) == serial
+    assert stability_classes(net, indices) == DSGRN_utils.StabilityQuery(net, indices)
+    assert isomorphism_classes(net, indices) == DSGRN_utils.IsomorphismQuery(net, indices)
+
+    cursor = SweepCursor.open(tmp_path / "cursor.json")
+    head = list(itertools.islice(sweep(net, indices, chunk_size=4, cursor=cursor), 10))
+    cursor = SweepCursor.open(tmp_path / "cursor.json")
+    assert cursor.position == 9  # the tenth pair was handed out, not finished
+    assert head[:9] + list(sweep(net, indices, chunk_size=4, cursor=cursor)) == serial
+    with pytest.raises(ValueError):
+        list(sweep(net, indices, level=3, cursor=cursor))
@@ -10,7 +10,15 @@ import pytest
 
 from rookfields import LEGACY, PAPER, SpecCubicalBlowupGraph, conley_morse_graph
 from rookfields import networks
-from rookfields.wall_labeling import enumerate_wall_labelings
+from rookfields.blowup import map_labellings
+from rookfields.wall_labeling import (
+    WallLabeling,
+    enumerate_wall_labelings,
+    grid_symmetries,
+    labellings_valid,
+    sample_wall_labelings,
+    wall_labeling_orbits,
+)
 
 SPECS = [LEGACY, PAPER]
 
@@ -28,28 +36,82 @@ def _double_edges(stg):
     }
 
 
+def _spec_double_edges(graphs):
+    return [_double_edges(stg) for stg in graphs]
+
+
 # ---------------------------------------------------------------------------
 # thm:2dDone -- CombinatorialDynamics.tex:1135
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.parametrize("spec", SPECS, ids=lambda s: s.name)
-@pytest.mark.parametrize("num_thresholds", [[1, 1], [1, 2]])
-def test_2d_done_exhaustive(spec, num_thresholds):
+@pytest.mark.parametrize("num_thresholds", [[1, 1], [1, 2], [2, 2]])
+def test_2d_done_exhaustive(num_thresholds):
     """`F_3` has no double edges, for *every* abstract 2D wall labeling.
 
     The theorem is stated for an arbitrary wall labeling on a two-dimensional
     cubical complex, so it is tested against `def:wall_labeling`-valid,
     strongly dissipative labelings enumerated directly rather than against
-    DSGRN-derived ones only.
+    DSGRN-derived ones only.  The statement is invariant under the symmetries
+    of the grid, so one labeling per orbit is enough: 10,786 of the 83,248 on
+    `[2, 2]`.
     """
-    labelings = list(enumerate_wall_labelings(num_thresholds))
-    assert labelings, "enumerator produced nothing"
-    for wl in labelings:
-        stg = SpecCubicalBlowupGraph(
-            labelling=wl.labelling, num_thresholds=num_thresholds, spec=spec, level=3
-        )
-        assert not _double_edges(stg), f"double edge for labelling {wl.labelling}"
+    labellings = [wl.labelling for wl, _ in wall_labeling_orbits(num_thresholds)]
+    assert labellings, "enumerator produced nothing"
+    checks = map_labellings(_spec_double_edges, labellings, num_thresholds, SPECS, level=3)
+    for labelling, found in zip(labellings, checks):
+        for spec, edges in zip(SPECS, found):
+            assert not edges, f"double edge for labelling {labelling} ({spec.name})"
+
+
+def test_orbits_cover_the_exhaustive_enumeration():
+    """Orbit sizes add up to the labelings the enumerator yields, and every
+    image of a representative is among them."""
+    for num_thresholds in ([1, 2], [1, 1, 1]):
+        labellings = {tuple(wl.labelling) for wl in enumerate_wall_labelings(num_thresholds)}
+        orbits = list(wall_labeling_orbits(num_thresholds))
+        assert sum(size for _, size in orbits) == len(labellings)
+        for wl, _ in orbits:
+            for slot_map, value_map in grid_symmetries(num_thresholds):
+                image = [0] * len(wl.labelling)
+                for slot, value in enumerate(wl.labelling):
+                    image[slot_map[slot]] = value_map[value]
+                assert tuple(image) in labellings
+
+
+@pytest.mark.parametrize("num_thresholds", [[1, 2], [2, 2], [1, 1, 1]])
+def test_compiled_validity_matches_the_definition(num_thresholds):
+    """`labellings_valid` agrees with `def:wall_labeling` checked vertex by vertex,
+    on valid labelings and on every labeling one bit away from them."""
+    dim = len(num_thresholds)
+    batch = []
+    for wl in enumerate_wall_labelings(num_thresholds, dissipative=False, limit=8):
+        batch.append(wl.labelling)
+        for slot in range(len(wl.labelling)):
+            for bit in range(2 * dim):
+                flipped = list(wl.labelling)
+                flipped[slot] ^= 1 << bit
+                batch.append(flipped)
+    expected = []
+    for labelling in batch:
+        wl = WallLabeling(labelling, num_thresholds)
+        expected.append(all(wl.local_inducement_maps(v) for v in wl.vertices()))
+    assert any(expected) and not all(expected)
+    assert labellings_valid(batch, num_thresholds).tolist() == expected
+
+
+@pytest.mark.parametrize("method", ["rejection", "mcmc"])
+def test_sampler_streams_are_reproducible(method):
+    """Samples are valid, strongly dissipative, and fixed by the seed and the
+    streams whatever the number of worker processes."""
+    serial, stats = sample_wall_labelings([1, 1, 1], 24, method=method, seed=7, streams=4)
+    pooled, _ = sample_wall_labelings([1, 1, 1], 24, method=method, seed=7, streams=4, workers=2)
+    assert [wl.labelling for wl in serial] == [wl.labelling for wl in pooled]
+    assert labellings_valid([wl.labelling for wl in serial], [1, 1, 1]).all()
+    assert all(wl.is_strongly_dissipative() for wl in serial)
+    assert stats.samples == 24 and 0 < stats.accepted <= stats.drawn
+    if method == "rejection":
+        assert stats.accepted == stats.samples
 
 
 @pytest.mark.parametrize("spec", SPECS, ids=lambda s: s.name)
@@ -230,3 +292,18 @@ def test_condition_2_1_never_contradicts_F1(name):
         )
         fast = SpecCubicalBlowupGraph(p, spec=PAPER, level=2)
         assert set(strict.digraph.edges()) == set(fast.digraph.edges())
+
+
+@pytest.mark.parametrize("num_thresholds", [[1, 1, 1], [2, 1, 1], [1, 1, 1, 1]])
+def test_condition_2_1_never_contradicts_F1_sampled(num_thresholds):
+    """The same, for abstract wall labelings in three and four dimensions.
+
+    Valid labelings are too rare there to draw by rejection, so they are
+    sampled by MCMC.
+    """
+    labelings, _ = sample_wall_labelings(num_thresholds, 16, method="mcmc", seed=11)
+    for wl in labelings:
+        kwargs = dict(labelling=wl.labelling, num_thresholds=num_thresholds, spec=PAPER, level=2, tables=True)
+        strict = SpecCubicalBlowupGraph(strict_intersection=True, **kwargs)
+        fast = SpecCubicalBlowupGraph(**kwargs)
+        assert set(strict.digraph.edges()) == set(fast.digraph.edges()), wl.labelling